@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /__init__.py                                                                        #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:02:11 am                                              #
+# Modified   : Saturday October 17th 2026 09:02:11 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /bench_annotations.py                                                               #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:02:11 am                                              #
+# Modified   : Saturday October 17th 2026 09:02:11 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Times annotation table construction at increasing input sizes.
+
+Run from the project root:  python -m benchmarks.bench_annotations
+
+Time per annotation should stay roughly flat as the number of annotations grows.
+"""
+
+import logging
+import time
+
+from lcd.eda.data import LIDCData
+from lcd.utils.accumulator import ColumnAccumulator
+from lcd.eda import ANNOTATION_COLUMNS, SMALL_NODULE_COLUMNS
+from benchmarks.synthetic import make_scans
+
+# ------------------------------------------------------------------------------------------------ #
+SIZES = [500, 1000, 2000, 4000, 8000]
+
+
+def build_annotation_table(scans: list) -> float:
+    """Returns the seconds taken to build the annotation table from the scans."""
+    data = LIDCData()
+    data._non_nodule_cases = frozenset()
+    data._annotation_records = ColumnAccumulator(ANNOTATION_COLUMNS)
+    data._small_nodule_records = ColumnAccumulator(SMALL_NODULE_COLUMNS)
+    start = time.perf_counter()
+    for scan in scans:
+        data._create_nodule_annotations(scan, scan.cluster_annotations())
+    data._decode_semantic_features(data._annotation_records.to_frame())
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    logging.disable(logging.DEBUG)
+    print("{:>12} {:>12} {:>16}".format("annotations", "seconds", "us/annotation"))
+    for size in SIZES:
+        scans = make_scans(size)
+        n = sum(len(nodule) for scan in scans for nodule in scan.cluster_annotations())
+        seconds = build_annotation_table(scans)
+        print("{:>12} {:>12.4f} {:>16.2f}".format(n, seconds, seconds / n * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /bench_import.py                                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:41 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:41 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Times the import of the package's modules with python -X importtime.
+
+Run from the project root:  python -m benchmarks.bench_import [--budget-ms 150] [module ...]
+
+Each module is imported in a fresh interpreter, REPEATS times, and the least cumulative import
+time is reported together with its heaviest dependencies. The budget applies to the time added
+over a baseline import of pandas and pyarrow, measured in the same way, as these take most of
+the time and vary from machine to machine. The exit status is 1 if the import of any module
+exceeds the budget, so the benchmark can gate startup time in CI.
+"""
+
+import sys
+import argparse
+import subprocess
+
+# ------------------------------------------------------------------------------------------------ #
+MODULES = ["lcd", "lcd.eda.storage", "lcd.eda.analysis", "lcd.eda.data"]
+# The dependencies every table module imports, timed as the baseline.
+BASELINE = ["pandas", "pyarrow"]
+# Milliseconds the package may add to the import of the baseline.
+BUDGET_MS = 150
+REPEATS = 5
+TOP_N = 5
+
+
+def import_times(*modules: str) -> dict:
+    """Returns the cumulative import time in ms of each module imported by importing modules."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    baseline = min(
+        sum(run[module] for module in BASELINE)
+        for run in (import_times(*BASELINE) for _ in range(args.repeats))
+    )
+    print("Baseline import of {}: {:.1f} ms".format(", ".join(BASELINE), baseline))
+
+    over_budget = []
+    print(
+        "{:>20} {:>12} {:>10} {:>8}  {}".format(
+            "module", "import (ms)", "added (ms)", "budget", "heaviest imports"
+        )
+    )
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeats)]
+        times = min(runs, key=lambda run: run[module])
+        heaviest = sorted(
+            (name for name in times if name != module and "." not in name),
+            key=times.get,
+            reverse=True,
+        )[:TOP_N]
+        added = max(times[module] - baseline, 0)
+        within = added <= args.budget_ms
+        if not within:
+            over_budget.append(module)
+        print(
+            "{:>20} {:>12.1f} {:>10.1f} {:>8}  {}".format(
+                module,
+                times[module],
+                added,
+                "ok" if within else "OVER",
+                ", ".join("{} {:.0f}".format(name, times[name]) for name in heaviest),
+            )
+        )
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /bench_nodule_aggregation.py                                                        #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:52:20 am                                              #
+# Modified   : Saturday October 17th 2026 11:52:20 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Compares the vectorized nodule aggregation with the per-group lambda aggregation.
+
+Run from the project root:  python -m benchmarks.bench_nodule_aggregation
+"""
+
+import math
+import logging
+import time
+import numpy as np
+import pandas as pd
+
+from lcd.eda.data import LIDCData, NODULE_KEYS
+from lcd.eda.dtypes import expand
+from benchmarks.synthetic import make_annotation_data
+
+# ------------------------------------------------------------------------------------------------ #
+SIZES = [1000, 4000, 16000]
+
+ceil_median = lambda x: math.ceil(np.median(x))  # noqa: E731
+mode = lambda x: x.value_counts().index[0]  # noqa: E731
+LAMBDA_AGGREGATIONS = {
+    "annotation_no": "count",
+    "subtlety": ceil_median,
+    "internalStructure": mode,
+    "calcification": mode,
+    "sphericity": mode,
+    "margin": ceil_median,
+    "lobulation": ceil_median,
+    "spiculation": ceil_median,
+    "texture": mode,
+    "malignancy": ceil_median,
+    "diameter": "mean",
+    "volume": "mean",
+    "surface_area": "mean",
+    "diagnosis": mode,
+}
+
+
+def lambda_aggregation(annotation_data: pd.DataFrame) -> pd.DataFrame:
+    # On the default dtypes, as value_counts breaks ties by category order on a categorical.
+    return (
+        expand(annotation_data)
+        .groupby(NODULE_KEYS)
+        .agg(LAMBDA_AGGREGATIONS)
+        .rename(columns={"annotation_no": "n_readers"})
+        .reset_index()
+    )
+
+
+def main() -> None:
+    logging.disable(logging.DEBUG)
+    data = LIDCData()
+    print(
+        "{:>12} {:>12} {:>12} {:>10}".format("annotations", "lambda (s)", "vector (s)", "speedup")
+    )
+    for size in SIZES:
+        annotation_data = make_annotation_data(size)
+
+        start = time.perf_counter()
+        expected = lambda_aggregation(annotation_data)
+        lambda_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = data._extract_nodule_data(annotation_data)
+        vector_seconds = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(expand(result[expected.columns]), expected, check_dtype=False)
+        print(
+            "{:>12} {:>12.4f} {:>12.4f} {:>9.1f}x".format(
+                len(annotation_data),
+                lambda_seconds,
+                vector_seconds,
+                lambda_seconds / vector_seconds,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /bench_storage.py                                                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 01:20:36 pm                                              #
+# Modified   : Saturday October 17th 2026 01:20:36 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Compares file size and load time of the annotation table in each storage format.
+
+Run from the project root:  python -m benchmarks.bench_storage
+"""
+
+import os
+import logging
+import tempfile
+import time
+
+from lcd.eda.storage import STORAGE_FORMATS, ANNOTATION_SCHEMA
+from benchmarks.synthetic import make_annotation_data
+
+# ------------------------------------------------------------------------------------------------ #
+N_ANNOTATIONS = 50000
+REPEATS = 5
+
+
+def main() -> None:
+    logging.disable(logging.DEBUG)
+    annotation_data = make_annotation_data(N_ANNOTATIONS)
+    print("{} annotations".format(len(annotation_data)))
+    print("{:>10} {:>12} {:>12} {:>12}".format("format", "size (KB)", "write (s)", "load (s)"))
+    with tempfile.TemporaryDirectory() as folder:
+        for storage_format, storage_class in STORAGE_FORMATS.items():
+            storage = storage_class()
+            filepath = storage.filepath(os.path.join(folder, "annotations"))
+
+            start = time.perf_counter()
+            storage.write(annotation_data, filepath, ANNOTATION_SCHEMA)
+            write_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                storage.read(filepath)
+            load_seconds = (time.perf_counter() - start) / REPEATS
+
+            print(
+                "{:>10} {:>12.0f} {:>12.4f} {:>12.4f}".format(
+                    storage_format, os.path.getsize(filepath) / 1024, write_seconds, load_seconds
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /harness.py                                                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:59 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:59 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+
+"""Times the stages of the metadata pipeline on synthetic data and records a JSON history.
+
+Run from the project root:  python -m benchmarks.harness [--scale 1000 10000] [--repeats 5]
+
+Each benchmark builds its inputs from synthetic scans holding about --scale annotations, from
+100 to 100k, then times its stage --repeats times. Neither the LIDC database nor the DICOM
+files are read. The median and least seconds of each benchmark are appended to the history
+file with the git commit, and compared with the last run at the same scale. A benchmark whose
+median exceeds the previous median by more than --threshold is reported as a regression, and
+the exit status is 1.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import dataclasses
+from datetime import datetime
+
+# Progress bars are disabled before tqdm reads its environment on import.
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+import lcd.eda.data
+import lcd.utils.config
+from lcd.eda.analysis import LIDCExplorer
+from lcd.eda.data import LIDCData, query_scans
+from lcd.utils.config import DataConfig, PylidcConfig
+from benchmarks.synthetic import FakeQuery, make_database, make_scans
+
+# ------------------------------------------------------------------------------------------------ #
+SCALES = [1000]
+REPEATS = 5
+THRESHOLD = 0.2
+HISTORY_FILEPATH = "data/benchmarks/history.json"
+# Benchmarks by name. Each is a function of the scale and a scratch folder that prepares the
+# inputs and returns the function timed.
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Registers a benchmark under the name."""
+
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        BENCHMARKS                                                #
+# ------------------------------------------------------------------------------------------------ #
+@benchmark("config.load_cold_x100")
+def config_load_cold(scale: int, folder: str):
+    def run():
+        for _ in range(100):
+            lcd.utils.config._settings_cache.clear()
+            DataConfig()
+            PylidcConfig()
+
+    return run
+
+
+@benchmark("config.load_cached_x1000")
+def config_load_cached(scale: int, folder: str):
+    def run():
+        for _ in range(1000):
+            DataConfig()
+            PylidcConfig()
+
+    return run
+
+
+@benchmark("database.query_scans")
+def database_query_scans(scale: int, folder: str):
+    from sqlalchemy.orm import selectinload
+    import pylidc as pl
+
+    session = make_database(os.path.join(folder, "pylidc.sqlite"), make_scans(scale))
+
+    def run():
+        session.expunge_all()
+        scans = query_scans(session=session).options(selectinload(pl.Scan.annotations))
+        return sum(len(scan.annotations) for scan in scans)
+
+    return run
+
+
+@benchmark("data.build_annotation_data")
+def build_annotation_data(scale: int, folder: str):
+    scans = make_scans(scale)
+
+    def run():
+        data = make_lidc_data(folder, scans)
+        with clustered_by_fake_scans():
+            data._build_annotation_data()
+
+    return run
+
+
+@benchmark("data.extract_nodule_data")
+def extract_nodule_data(scale: int, folder: str):
+    data = make_lidc_data(folder, make_scans(scale))
+    with clustered_by_fake_scans():
+        data._build_annotation_data()
+    annotation_data = data._annotation_data
+
+    def run():
+        data._extract_nodule_data(annotation_data)
+
+    return run
+
+
+@benchmark("data.save_data")
+def save_data(scale: int, folder: str):
+    data = build(folder, make_scans(scale))
+    return data._save_data
+
+
+@benchmark("explorer.summaries")
+def explorer_summaries(scale: int, folder: str):
+    data = build(folder, make_scans(scale))
+    data._save_data()
+
+    def run():
+        explorer = LIDCExplorer()
+        explorer._annotation_filepath = data._annotations_filepath
+        explorer._nodule_filepath = data._nodules_filepath
+        explorer.nodule_summary()
+        explorer.malignancy_summary()
+        explorer.reader_agreement()
+        explorer.nodules_by_biomarker()
+
+    return run
+
+
+# ------------------------------------------------------------------------------------------------ #
+def make_lidc_data(folder: str, scans: list) -> LIDCData:
+    """Returns LIDCData over the fake scans, reading and writing only within the folder."""
+    data = LIDCData(use_checkpoints=False, timing=False)
+    data._non_nodule_cases = frozenset()
+    data._get_scans = lambda: FakeQuery(scans)
+    data._config = dataclasses.replace(
+        data._config,
+        interim_data_folder=os.path.join(folder, "interim"),
+        raw_lidc_data_folder=os.path.join(folder, "raw"),
+    )
+    for attribute in [
+        "_cases_filepath",
+        "_annotations_filepath",
+        "_nodules_filepath",
+        "_small_nodules_filepath",
+        "_non_nodules_filepath",
+    ]:
+        filepath = getattr(data, attribute)
+        setattr(data, attribute, os.path.join(folder, "metadata", os.path.basename(filepath)))
+    return data
+
+
+def build(folder: str, scans: list) -> LIDCData:
+    """Returns LIDCData over the fake scans with all tables built, but not saved."""
+    data = make_lidc_data(folder, scans)
+    with clustered_by_fake_scans():
+        data._build_annotation_data()
+    data._build_nodule_data()
+    data._build_case_data()
+    return data
+
+
+class clustered_by_fake_scans:
+    """Clusters annotations by the nodules of the fake scans while in the context."""
+
+    def __enter__(self):
+        self._cluster_annotations = lcd.eda.data.cluster_annotations
+        lcd.eda.data.cluster_annotations = lambda scan: scan.nodules
+        return self
+
+    def __exit__(self, *exc) -> None:
+        lcd.eda.data.cluster_annotations = self._cluster_annotations
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                          HARNESS                                                 #
+# ------------------------------------------------------------------------------------------------ #
+def run_benchmarks(scale: int, repeats: int = REPEATS, names: list = None) -> dict:
+    """Runs the benchmarks at a scale and returns the median and least seconds of each."""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        with tempfile.TemporaryDirectory() as folder:
+            run = setup(scale, folder)
+            seconds = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                run()
+                seconds.append(time.perf_counter() - start)
+        results[name] = {"median": statistics.median(seconds), "min": min(seconds)}
+    return results
+
+
+def read_history(filepath: str) -> list:
+    if not os.path.exists(filepath):
+        return []
+    with open(filepath, "r") as f:
+        return json.load(f)
+
+
+def append_history(filepath: str, record: dict) -> None:
+    history = read_history(filepath) + [record]
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath + ".tmp", "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(filepath + ".tmp", filepath)
+
+
+def previous_results(history: list, scale: int) -> dict:
+    """Returns the results of the last recorded run at the scale."""
+    for record in reversed(history):
+        if record["scale"] == scale:
+            return record["results"]
+    return {}
+
+
+def regressions(results: dict, previous: dict, threshold: float = THRESHOLD) -> list:
+    """Returns the benchmarks whose median exceeds the previous median by more than threshold."""
+    return [
+        name
+        for name, result in results.items()
+        if name in previous and result["median"] > previous[name]["median"] * (1 + threshold)
+    ]
+
+
+def git_commit() -> str:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--history", default=HISTORY_FILEPATH)
+    parser.add_argument("--benchmark", nargs="*", help="Names of the benchmarks to run.")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    regressed = []
+    for scale in args.scale:
+        previous = previous_results(read_history(args.history), scale)
+        results = run_benchmarks(scale, args.repeats, args.benchmark)
+        slower = regressions(results, previous, args.threshold)
+        regressed.extend(slower)
+        append_history(
+            args.history,
+            {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "scale": scale,
+                "repeats": args.repeats,
+                "results": results,
+            },
+        )
+
+        print("\n{} annotations".format(scale))
+        print("{:>28} {:>12} {:>12} {:>12}".format("benchmark", "median (s)", "min (s)", "change"))
+        for name, result in results.items():
+            change = (
+                "{:+.0%}".format(result["median"] / previous[name]["median"] - 1)
+                if name in previous
+                else ""
+            )
+            print(
+                "{:>28} {:>12.4f} {:>12.4f} {:>12}{}".format(
+                    name,
+                    result["median"],
+                    result["min"],
+                    change,
+                    "  REGRESSION" if name in slower else "",
+                )
+            )
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
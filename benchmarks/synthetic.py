@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /synthetic.py                                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:02:11 am                                              #
+# Modified   : Saturday October 17th 2026 09:02:11 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Synthetic stand-ins for pylidc Scan and Annotation objects used by the benchmarks."""
+
+import numpy as np
+
+# ------------------------------------------------------------------------------------------------ #
+FEATURE_BOUNDS = {
+    "subtlety": 5,
+    "internalStructure": 4,
+    "calcification": 6,
+    "sphericity": 5,
+    "margin": 5,
+    "lobulation": 5,
+    "spiculation": 5,
+    "texture": 5,
+    "malignancy": 5,
+}
+
+
+# ------------------------------------------------------------------------------------------------ #
+class FakeScan:
+    """Mimics the pylidc.Scan attributes read by LIDCData."""
+
+    def __init__(self, id: int, patient_id: str, rng: np.random.Generator) -> None:
+        self.id = id
+        self.patient_id = patient_id
+        self.slice_thickness = float(rng.choice([1.0, 1.25, 2.5]))
+        self.slice_spacing = self.slice_thickness
+        self.pixel_spacing = float(rng.uniform(0.5, 0.9))
+        self.nodules = []
+
+    def cluster_annotations(self, verbose: bool = False) -> list:
+        return self.nodules
+
+
+class FakeAnnotation:
+    """Mimics the pylidc.Annotation attributes read by LIDCData."""
+
+    def __init__(self, id: int, scan: FakeScan, rng: np.random.Generator) -> None:
+        self.id = id
+        self.scan = scan
+        for name, upper in FEATURE_BOUNDS.items():
+            setattr(self, name, int(rng.integers(1, upper + 1)))
+        self.diameter = float(rng.uniform(3, 40))
+        self.volume = float(rng.uniform(10, 5000))
+        self.surface_area = float(rng.uniform(10, 2000))
+
+    def feature_vals(self) -> np.ndarray:
+        return np.array([getattr(self, name) for name in FEATURE_BOUNDS])
+
+
+class FakeQuery:
+    """Mimics the pylidc scan query iterated by LIDCData.
+
+    Iterating yields the scans. with_entities returns the (id, patient_id) pairs of the scans,
+    whichever columns are requested, as LIDCData only requests those.
+    """
+
+    def __init__(self, scans: list) -> None:
+        self._scans = scans
+
+    def __iter__(self):
+        return iter(self._scans)
+
+    def count(self) -> int:
+        return len(self._scans)
+
+    def with_entities(self, *columns) -> list:
+        return [(scan.id, scan.patient_id) for scan in self._scans]
+
+
+# ------------------------------------------------------------------------------------------------ #
+def make_scans(n_annotations: int, seed: int = 0) -> list:
+    """Returns fake scans holding approximately n_annotations annotations in total.
+
+    Each scan has one to four nodules annotated by one to four readers, mirroring LIDC.
+
+    Args:
+        n_annotations (int): The target number of annotations.
+        seed (int): Seed for the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    scans = []
+    annotation_id = 0
+    while annotation_id < n_annotations:
+        scan_no = len(scans) + 1
+        scan = FakeScan(id=scan_no, patient_id="LIDC-IDRI-" + str(scan_no).zfill(4), rng=rng)
+        for _ in range(int(rng.integers(1, 5))):
+            nodule = []
+            for _ in range(int(rng.integers(1, 5))):
+                annotation_id += 1
+                nodule.append(FakeAnnotation(id=annotation_id, scan=scan, rng=rng))
+            scan.nodules.append(nodule)
+        scans.append(scan)
+    return scans
+
+
+def make_annotation_data(n_annotations: int, seed: int = 0):
+    """Returns a synthetic annotation table built by LIDCData from fake scans.
+
+    Args:
+        n_annotations (int): The target number of annotations.
+        seed (int): Seed for the random number generator.
+    """
+    from lcd.eda.data import LIDCData
+
+    data = LIDCData(use_checkpoints=False)
+    data._non_nodule_cases = frozenset()
+    for scan in make_scans(n_annotations, seed=seed):
+        data._create_nodule_annotations(scan, scan.cluster_annotations())
+    return data._decode_semantic_features(data._annotation_records.to_frame())
+
+
+def make_database(filepath: str, scans: list):
+    """Writes the fake scans and their annotations to an SQLite database with pylidc's schema.
+
+    Contours are not written, so geometric properties such as diameter cannot be computed from
+    the database, but the scans and annotations can be queried as in the LIDC database.
+
+    Args:
+        filepath (str): The SQLite file to create.
+        scans (list): Fake scans, e.g. from make_scans.
+
+    Returns:
+        A session bound to the database.
+    """
+    import pylidc as pl
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine("sqlite:///" + filepath)
+    tables = [pl.Scan.__table__, pl.Annotation.__table__, pl.Contour.__table__]
+    pl.Scan.metadata.create_all(engine, tables=tables)
+    scan_rows = [
+        {
+            "id": scan.id,
+            "study_instance_uid": "1.2.{}".format(scan.id),
+            "series_instance_uid": "1.2.{}.1".format(scan.id),
+            "patient_id": scan.patient_id,
+            "slice_thickness": scan.slice_thickness,
+            "pixel_spacing": scan.pixel_spacing,
+            "contrast_used": False,
+            "is_from_initial": True,
+            "sorted_dicom_file_names": "",
+        }
+        for scan in scans
+    ]
+    annotation_rows = [
+        dict(
+            {"id": annotation.id, "scan_id": scan.id, "_nodule_id": str(nodule_no)},
+            **{name: getattr(annotation, name) for name in FEATURE_BOUNDS},
+        )
+        for scan in scans
+        for nodule_no, nodule in enumerate(scan.nodules, start=1)
+        for annotation in nodule
+    ]
+    with engine.begin() as connection:
+        connection.execute(pl.Scan.__table__.insert(), scan_rows)
+        connection.execute(pl.Annotation.__table__.insert(), annotation_rows)
+    return sessionmaker(bind=engine)()
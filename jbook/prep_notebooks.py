@@ -15,71 +15,173 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+import os
+import re
+import json
+import hashlib
+import argparse
 import nbformat as nbf
 from glob import glob
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
 # ------------------------------------------------------------------------------------------------ #
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Userful tags
+# Two types of tags, hide and remove.
+#   Hide provides a button to reveal the cell contents
+#   Remove prevents the content from appearing in the HTML at all.
+# Hide Tags:
+#   "hide-input": Hides the cell but displays the output
+#   "hide-output": Hides the output from a cell, but provides a button to show
+#   "hide-cell": Hides both input and output
+# Remove Tags:
+#    "remove-input": Removes cell from HTML, but shows ouput. No botton available
+#    "remove-output": Removes cell output from HTML. No botton
+#    "remove-cell": Removes entire cell, input and output. No botton.
+#
+# remove-cell: remove entire cell
+#
 
-def prepare_notebooks():
+# Text to look for in adding tags
+TEXT_SEARCH_DICT = {
+    "# Imports": "hide-cell",  # Removes the 'module not found' error from output
+    "# FILEPATHS": "hide-cell",  # Removes the 'module not found' error from output
+    "# GLUE": "remove-cell",  # Removes the cell (input/output) which declares glue variables
+    "# HIDE-INPUT": "hide-input",  # Collapse input with toggle to display
+    "# Constants": "hide-input",  # Collapses input with toggle to display
+    "# HIDE-OUTPUT": "hide-output",  # Collapse output with toggle to display
+    "# HIDE-CELL": "hide-cell",  # Collapse input and output with toggle to display
+    "# REMOVE-INPUT": "remove-input",  # Removes input, no toggle option
+    "# REMOVE-OUTPUT": "remove-output",  # Removes output, no toggle option
+    "# REMOVE-CELL": "remove-cell",  # Removes input and output, no toggle option
+    "# %load": "hide-cell",  # Hides cells containing source loaded via ipython magic function.
+}
+# All markers in one pattern, so each cell's source is scanned once. Longer markers are tried
+# first so that no marker is shadowed by a marker it begins with.
+MARKER_PATTERN = re.compile(
+    "|".join(re.escape(key) for key in sorted(TEXT_SEARCH_DICT, key=len, reverse=True))
+)
+# Content hash of each notebook when last tagged, with the hash of the rules applied.
+MANIFEST_FILEPATH = "./jbook/_build/.notebook_tags.json"
+
+
+def prepare_notebooks(
+    folder: str = ".",
+    workers: int = None,
+    manifest_filepath: str = MANIFEST_FILEPATH,
+    force: bool = False,
+) -> list:
+    """Tags the cells of every notebook under the folder for display in the book.
+
+    Notebooks whose content hash and tagging rules match the manifest were tagged by an earlier
+    run and are skipped. The others are tagged across a process pool, and a notebook is only
+    written when its tags change.
+
+    Args:
+        folder (str): The folder searched for notebooks.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        manifest_filepath (str): JSON file recording the notebooks already tagged.
+        force (bool): If True, every notebook is tagged, whatever the manifest records.
+
+    Returns:
+        The paths of the notebooks written.
+    """
     # Collect a list of all notebooks in the designated folder
     logging.info("\tPreparing Notebook Metadata")
-    notebooks = glob("./**/*.ipynb", recursive=True)
-
-    # Userful tags
-    # Two types of tags, hide and remove.
-    #   Hide provides a button to reveal the cell contents
-    #   Remove prevents the content from appearing in the HTML at all.
-    # Hide Tags:
-    #   "hide-input": Hides the cell but displays the output
-    #   "hide-output": Hides the output from a cell, but provides a button to show
-    #   "hide-cell": Hides both input and output
-    # Remove Tags:
-    #    "remove-input": Removes cell from HTML, but shows ouput. No botton available
-    #    "remove-output": Removes cell output from HTML. No botton
-    #    "remove-cell": Removes entire cell, input and output. No botton.
-    #
-    # remove-cell: remove entire cell
-    #
-
-    # Text to look for in adding tags
-    text_search_dict = {
-        "# Imports": "hide-cell",  # Removes the 'module not found' error from output
-        "# FILEPATHS": "hide-cell",  # Removes the 'module not found' error from output
-        "# GLUE": "remove-cell",  # Removes the cell (input/output) which declares glue variables
-        "# HIDE-INPUT": "hide-input",  # Collapse input with toggle to display
-        "# Constants": "hide-input",  # Collapses input with toggle to display
-        "# HIDE-OUTPUT": "hide-output",  # Collapse output with toggle to display
-        "# HIDE-CELL": "hide-cell",  # Collapse input and output with toggle to display
-        "# REMOVE-INPUT": "remove-input",  # Removes input, no toggle option
-        "# REMOVE-OUTPUT": "remove-output",  # Removes output, no toggle option
-        "# REMOVE-CELL": "remove-cell",  # Removes input and output, no toggle option
-        "# %load": "hide-cell",  # Hides cells containing source loaded via ipython magic function.
-    }
+    notebooks = sorted(glob(os.path.join(folder, "**", "*.ipynb"), recursive=True))
+
+    rules = rules_hash()
+    manifest = {} if force else read_manifest(manifest_filepath)
+    pending = [
+        path
+        for path in notebooks
+        if manifest.get(path) != {"sha256": content_hash(path), "rules": rules}
+    ]
+    logging.info(
+        "\t\tTagging {} notebooks, {} unchanged".format(len(pending), len(notebooks) - len(pending))
+    )
 
     # Search through each notebook and look for the text, add a tag if necessary
-    i = 0
-    for ipath in notebooks:
-        i += 1
-        logging.info("\t\tProcessing Notebook {}".format(str(i)))
-        ntbk = nbf.read(ipath, nbf.NO_CONVERT)
+    if workers == 1 or len(pending) <= 1:
+        results = [tag_notebook(path) for path in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(tag_notebook, pending, chunksize=4))
+
+    written = []
+    for path, changed, sha256 in results:
+        if changed:
+            written.append(path)
+        manifest[path] = {"sha256": sha256, "rules": rules}
+
+    write_manifest(manifest_filepath, {path: manifest[path] for path in notebooks})
+    logging.info("\tNotebook Metadata Processed: {} notebooks written".format(len(written)))
+    return written
+
+
+def tag_notebook(path: str) -> tuple:
+    """Adds the tags for the markers found in each cell, writing the notebook only if changed.
+
+    Returns:
+        The path, whether the notebook was written, and the hash of its content.
+    """
+    ntbk = nbf.read(path, nbf.NO_CONVERT)
+
+    changed = False
+    for cell in ntbk.cells:
+        markers = set(MARKER_PATTERN.findall(cell["source"]))
+        if not markers:
+            continue
+        cell_tags = cell.setdefault("metadata", {}).setdefault("tags", [])
+        # Tags are added in the order of TEXT_SEARCH_DICT, as by a search for each marker.
+        for key, val in TEXT_SEARCH_DICT.items():
+            if key in markers and val not in cell_tags:
+                cell_tags.append(val)
+                changed = True
+
+    if changed:
+        nbf.write(ntbk, path)
+    return path, changed, content_hash(path)
+
+
+def content_hash(path: str) -> str:
+    """Returns the SHA-256 hash of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def rules_hash() -> str:
+    """Returns a hash of the tagging rules, so that changing them retags every notebook."""
+    return hashlib.sha256(json.dumps(TEXT_SEARCH_DICT).encode()).hexdigest()
+
 
-        for cell in ntbk.cells:
-            cell_tags = cell.get("metadata", {}).get("tags", [])
-            for key, val in text_search_dict.items():
-                if key in cell["source"]:
-                    if val not in cell_tags:
-                        cell_tags.append(val)
-            if len(cell_tags) > 0:
-                cell["metadata"]["tags"] = cell_tags
+def read_manifest(manifest_filepath: str) -> dict:
+    if manifest_filepath is None or not os.path.exists(manifest_filepath):
+        return {}
+    with open(manifest_filepath, "r") as f:
+        return json.load(f)
 
-        nbf.write(ntbk, ipath)
 
-    logging.info("\tNotebook Metadata Processed")
+def write_manifest(manifest_filepath: str, manifest: dict) -> None:
+    if manifest_filepath is None:
+        return
+    os.makedirs(os.path.dirname(manifest_filepath) or ".", exist_ok=True)
+    with open(manifest_filepath + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_filepath + ".tmp", manifest_filepath)
 
 
 if __name__ == "__main__":
-    prepare_notebooks()
+    parser = argparse.ArgumentParser(description="Tags notebook cells for the book.")
+    parser.add_argument("--folder", default=".")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--manifest", default=MANIFEST_FILEPATH)
+    parser.add_argument("--force", action="store_true", help="Tag notebooks found unchanged.")
+    args = parser.parse_args()
+    prepare_notebooks(args.folder, args.workers, args.manifest, args.force)
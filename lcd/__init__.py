@@ -18,19 +18,5 @@
 import logging
 
 # ------------------------------------------------------------------------------------------------ #
-#                                           LOGGING                                                #
-# ------------------------------------------------------------------------------------------------ #
-# Handlers
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
-file_handler = logging.handlers.TimedRotatingFileHandler(
-    filename="logs/lcd.log", when="D", interval=1, backupCount=3
-)
-file_handler.setLevel(logging.DEBUG)
-# ------------------------------------------------------------------------------------------------ #
-# Formatters
-format = "%(asctime)s %(levelname)s %(module)s %(funcName)s %(message)s"
-# ------------------------------------------------------------------------------------------------ #
-# Config
-logging.basicConfig(level=logging.DEBUG, format=format, handlers=[file_handler, console_handler])
-# ------------------------------------------------------------------------------------------------ #
+# Logging is configured by the application, e.g. with lcd.utils.log_config.configure_logging.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -119,6 +119,69 @@ SEMANTIC_FEATURE_COLUMNS = [
     "Malignancy",
 ]
 
+# Labels for each semantic feature score, indexed by score. Score 0 denotes a missing value.
+SEMANTIC_LABELS = {
+    "subtlety": [
+        "NA",
+        "Extremely Subtle",
+        "Moderately Subtle",
+        "Fairly Subtle",
+        "Moderately Obvious",
+        "Obvious",
+    ],
+    "internalStructure": ["NA", "Soft Tissue", "Fluid", "Fat", "Air"],
+    "calcification": [
+        "NA",
+        "Popcorn",
+        "Laminated",
+        "Solid",
+        "Non-central",
+        "Central",
+        "Absent",
+    ],
+    "sphericity": ["NA", "Linear", "Ovoid/Linear", "Ovoid", "Ovoid/Round", "Round"],
+    "margin": [
+        "NA",
+        "Poorly Defined",
+        "Near Poorly Defined",
+        "Medium Margin",
+        "Near Sharp",
+        "Sharp",
+    ],
+    "lobulation": [
+        "NA",
+        "No Lobulation",
+        "Nearly No Lobulation",
+        "Medium Lobulation",
+        "Near Marked Lobulation",
+        "Marked Lobulation",
+    ],
+    "spiculation": [
+        "NA",
+        "No Spiculation",
+        "Nearly No Spiculation",
+        "Medium Spiculation",
+        "Near Marked Spiculation",
+        "Marked Spiculation",
+    ],
+    "texture": [
+        "NA",
+        "Non-Solid/GGO",
+        "Non-Solid/Mixed",
+        "Part Solid/Mixed",
+        "Solid/Mixed",
+        "Solid",
+    ],
+    "malignancy": [
+        "NA",
+        "Highly Unlikely",
+        "Moderately Unlikely",
+        "Indeterminate",
+        "Moderately Suspicious",
+        "Highly Suspicious",
+    ],
+}
+
 CASE_COLUMNS = [
     "patient_id",
     "total_nodules",
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /aggregate.py                                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:52:20 am                                              #
+# Modified   : Saturday October 17th 2026 11:52:20 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Vectorized per-group statistics over integer group codes.
+
+Group codes are integers in [0, n_groups), as returned by DataFrameGroupBy.ngroup. Every group
+must contain at least one row.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ------------------------------------------------------------------------------------------------ #
+def group_ceil_median(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Returns the ceiling of the median of the values in each group.
+
+    Equivalent to applying math.ceil(np.median(x)) to each group.
+
+    Args:
+        codes (np.ndarray): Group code for each row.
+        values (np.ndarray): Numeric value for each row.
+        n_groups (int): The number of groups.
+    """
+    if n_groups == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    lower = sorted_values[starts + (counts - 1) // 2]
+    upper = sorted_values[starts + counts // 2]
+    return np.ceil((lower + upper) / 2).astype(np.int64)
+
+
+def group_mode(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Returns the most frequent value in each group.
+
+    Ties are broken in favour of the value that occurs first in the group, matching
+    x.value_counts().index[0].
+
+    Args:
+        codes (np.ndarray): Group code for each row.
+        values (np.ndarray): Value for each row. Any hashable dtype.
+        n_groups (int): The number of groups.
+    """
+    if n_groups == 0:
+        return np.asarray(values)[:0]
+    value_codes, uniques = pd.factorize(values)
+    n_rows = len(codes)
+
+    # Runs of equal (group, value) pairs. Stable sort keeps the first occurrence first in its run.
+    order = np.lexsort((value_codes, codes))
+    sorted_codes = codes[order]
+    sorted_values = value_codes[order]
+    run_start = np.ones(n_rows, dtype=bool)
+    run_start[1:] = (sorted_codes[1:] != sorted_codes[:-1]) | (
+        sorted_values[1:] != sorted_values[:-1]
+    )
+    starts = np.flatnonzero(run_start)
+    run_counts = np.diff(np.append(starts, n_rows))
+    run_codes = sorted_codes[starts]
+    run_values = sorted_values[starts]
+    run_first = order[starts]
+
+    # Within each group, the highest count wins, then the earliest first occurrence.
+    best = np.lexsort((run_first, -run_counts, run_codes))
+    first_in_group = np.ones(len(best), dtype=bool)
+    first_in_group[1:] = run_codes[best][1:] != run_codes[best][:-1]
+    winners = best[first_in_group]
+
+    result = np.empty(n_groups, dtype=np.intp)
+    result[run_codes[winners]] = run_values[winners]
+    return np.asarray(uniques)[result]
+
+
+def at_least_n_readers(
+    n_readers: np.ndarray, values: np.ndarray = None, counts: np.ndarray = None
+) -> np.ndarray:
+    """Returns nodule counts by the minimum number of readers and value, in a single pass.
+
+    Element [i, j] of the result is the number of nodules annotated by at least i + 1 readers
+    whose value is j. The counts for exactly k readers are tallied with one bincount over the
+    (readers, value) pairs and accumulated from the most readers down.
+
+    Args:
+        n_readers (np.ndarray): Number of readers for each nodule. Integers >= 1.
+        values (np.ndarray): Non-negative integer value for each nodule, e.g. a semantic feature
+            score. If None, every nodule has the value 0 and the result has a single column.
+        counts (np.ndarray): Optional number of nodules with each (readers, value) pair, when
+            the pairs are tallies such as the cells of a SummaryCube rather than single nodules.
+    """
+    n_readers = np.asarray(n_readers, dtype=np.int64)
+    values = np.zeros_like(n_readers) if values is None else np.asarray(values, dtype=np.int64)
+    if len(n_readers) == 0:
+        return np.zeros((0, 1), dtype=np.int64)
+    max_readers = int(n_readers.max())
+    n_values = int(values.max()) + 1
+    exactly = (
+        np.bincount(
+            (n_readers - 1) * n_values + values, weights=counts, minlength=max_readers * n_values
+        )
+        .astype(np.int64)
+        .reshape(max_readers, n_values)
+    )
+    return np.cumsum(exactly[::-1], axis=0)[::-1]
@@ -15,51 +15,145 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+import os
 import pandas as pd
 import numpy as np
 import logging
-import logging.config
-import seaborn as sns
-import matplotlib.pyplot as plt
+from typing import Union
 
+from lcd.eda import SEMANTIC_LABELS
 from lcd.utils.config import DataConfig
-from lcd.utils.log_config import LOG_CONFIG
+from lcd.eda.aggregate import at_least_n_readers
+from lcd.eda.cube import SummaryCube, cube_filepath, DESCRIBE_STATISTICS
+from lcd.eda.dtypes import compact, memory_report
+from lcd.eda.index import TableIndex, index_filepath
+from lcd.eda.storage import get_storage, FILTER_OPERATORS
+from lcd.utils.checkpoint import fingerprint
 
 # ------------------------------------------------------------------------------------------------ #
-logging.config.dictConfig(LOG_CONFIG)
 logger = logging.getLogger(__name__)
-sns.set_palette("Blues_d")
-sns.set_style("whitegrid")
 # ------------------------------------------------------------------------------------------------ #
 
 
 class LIDCExplorer:
-    """Class provides methods for graphical and non-graphical exploratory data analysis."""
+    """Class provides methods for graphical and non-graphical exploratory data analysis.
 
-    def __init__(self) -> None:
+    Nothing is read at construction. Each method reads only the columns it uses, and columns
+    read without filters are retained for subsequent calls. Columns are held in the compact
+    dtypes of lcd.eda.dtypes, with labels and ids as categoricals and scores as int8.
 
-        self._annotation_filepath = DataConfig().annotations_filepath
-        self._nodule_filepath = DataConfig().nodules_filepath
+    The reader agreement and diameter statistics are answered from the SummaryCube of each
+    table, persisted alongside it. The cube is rebuilt when the hash of the table's file no
+    longer matches the hash the cube was built from. The file is hashed only when its size or
+    modification time change. Diameter quantiles from the cube are estimated to within
+    SKETCH_ACCURACY. Other statistics are exact.
 
-        self._annotation_data = None
-        self._nodule_data = None
+    Args:
+        storage_format (str): File format of the metadata: 'parquet' (default), 'feather' or 'csv'.
+        use_cube (bool): If False, every statistic is computed from the rows of the tables.
+    """
 
-        self._load()
+    def __init__(self, storage_format: str = "parquet", use_cube: bool = True) -> None:
+
+        self._storage = get_storage(storage_format)
+        config = DataConfig().settings
+        self._annotation_filepath = self._storage.filepath(config.annotations_filepath)
+        self._nodule_filepath = self._storage.filepath(config.nodules_filepath)
+
+        # Columns loaded so far, and table indexes, by filepath.
+        self._loaded = {}
+        self._indexes = {}
+        # Summary cubes, with the size and modification time of the file they were checked
+        # against, by filepath.
+        self._use_cube = use_cube
+        self._cubes = {}
+
+    def annotations(
+        self,
+        columns: list = None,
+        min_readers: int = None,
+        diagnosis: Union[str, list] = None,
+        patient_id: str = None,
+        nodule_id: str = None,
+    ) -> pd.DataFrame:
+        """Returns annotation data, reading only the requested columns and rows.
+
+        Args:
+            columns (list): The columns to return. Defaults to all columns.
+            min_readers (int): If given, only nodules annotated by at least this many readers.
+            diagnosis (Union[str,list]): If given, only annotations with this diagnosis or
+                diagnoses, e.g. 'Malignant'.
+            patient_id (str): If given, only the patient's annotations, located by the index.
+            nodule_id (str): If given, only the nodule's annotations, located by the index.
+        """
+        keys = {"patient_id": patient_id, "nodule_id": nodule_id}
+        return self._get(self._annotation_filepath, columns, min_readers, diagnosis, keys)
+
+    def nodules(
+        self,
+        columns: list = None,
+        min_readers: int = None,
+        diagnosis: Union[str, list] = None,
+        patient_id: str = None,
+        nodule_id: str = None,
+    ) -> pd.DataFrame:
+        """Returns nodule data, reading only the requested columns and rows.
+
+        Args:
+            columns (list): The columns to return. Defaults to all columns.
+            min_readers (int): If given, only nodules annotated by at least this many readers.
+            diagnosis (Union[str,list]): If given, only nodules with this diagnosis or diagnoses.
+            patient_id (str): If given, only the patient's nodules, located by the index.
+            nodule_id (str): If given, only this nodule, located by the index.
+        """
+        keys = {"patient_id": patient_id, "nodule_id": nodule_id}
+        return self._get(self._nodule_filepath, columns, min_readers, diagnosis, keys)
+
+    def reader_agreement(self, biomarker: str = None) -> pd.DataFrame:
+        """Counts nodules by the minimum number of readers and, optionally, by biomarker level.
+
+        All counts are computed in a single pass over the nodules. See at_least_n_readers.
+
+        Args:
+            biomarker (str): A semantic feature, e.g. 'malignancy'. If given, the counts are
+                split by the levels of the feature, otherwise a single 'Nodules' column is
+                returned.
+
+        Returns:
+            DataFrame indexed by 'At Least N Readers', with a column per level of the biomarker.
+        """
+        counts = self._reader_counts(biomarker)
+        if biomarker is None:
+            labels = ["Nodules"]
+        else:
+            labels = SEMANTIC_LABELS[biomarker]
+            counts = self._pad(counts, len(labels))
+            # Level 0 denotes a missing value and is not reported.
+            counts, labels = counts[:, 1:], labels[1:]
+
+        index = pd.RangeIndex(1, counts.shape[0] + 1, name="At Least N Readers")
+        return pd.DataFrame(counts, index=index, columns=labels)
 
     def nodule_summary(self) -> pd.DataFrame:
         """Produces a 4x3 DataFrame of nodule counts by at least 1,2,3,4 readers"""
-        n_readers = self._nodule_data["n_readers"].max()
-        n_nodules = self._nodule_data.shape[0]
-        summary_data = np.zeros((n_readers, 3))
-        for i in range(n_readers):
-            summary_data[i, 0] = i + 1
-            summary_data[i, 1] = int(self._nodule_data[self._nodule_data["n_readers"] > i].shape[0])
-            summary_data[i, 2] = round(summary_data[i, 1] / n_nodules, 2)
+        counts = self.reader_agreement()
+        n_nodules = counts["Nodules"].iloc[0] if len(counts) else 0
+        summary_data = np.column_stack(
+            [counts.index, counts["Nodules"], np.round(counts["Nodules"] / n_nodules, 2)]
+        ).astype(float)
         df = pd.DataFrame(summary_data, columns=["At Least N Readers", "Nodules", "Ratio"])
         return df
 
-    def nodules_by_biomarker(self) -> pd.DataFrame:
-        """Produces a matrix of nodule counts by biomarker levels"""
+    def nodules_by_biomarker(self, min_readers: int = 1) -> pd.DataFrame:
+        """Produces a matrix of nodule counts by biomarker levels
+
+        Args:
+            min_readers (int): Only nodules annotated by at least this many readers are counted.
+
+        Returns:
+            DataFrame with a row per biomarker and a column per level 1 through 6. Levels a
+            biomarker does not define are counted as zero.
+        """
         biomarkers = [
             "subtlety",
             "internalStructure",
@@ -72,29 +166,22 @@ class LIDCExplorer:
         ]
         levels = range(1, 7)
 
-        for biomarker, level in zip(biomarkers, levels):
-            self._nodule_data[biomarker].groupby(biomarker).count()
-
-    def malignancy_summary(self) -> pd.DataFrame:
-        """Provides malignancy data for nodules by at least 1,2,3,4 readers
+        summary_data = np.zeros((len(biomarkers), len(levels)), dtype=np.int64)
+        for i, biomarker in enumerate(biomarkers):
+            counts = self._reader_counts(biomarker)
+            if min_readers <= counts.shape[0]:
+                summary_data[i] = self._pad(counts, len(levels) + 1)[min_readers - 1, 1:]
 
-        Args:
-            normalize (bool): If True, the counts are normalized to values in [0,1]
+        return pd.DataFrame(
+            summary_data,
+            index=pd.Index(biomarkers, name="Biomarker"),
+            columns=pd.Index(levels, name="Level"),
+        )
 
-        """
-        n_readers = self._nodule_data["n_readers"].max()
-        n_malignancy_values = self._nodule_data["malignancy"].max()
-
-        summary_data = np.zeros((n_readers, n_malignancy_values + 1))
-        for i in range(n_readers):
-            summary_data[i, 0] = i + 1
-            for j in range(1, n_malignancy_values + 1):  # +1 For n_readers column
-                summary_data[i, j] = len(
-                    self._nodule_data[
-                        (self._nodule_data["n_readers"] > i)
-                        & (self._nodule_data["malignancy"] == j)
-                    ]["nodule_id"]
-                )
+    def malignancy_summary(self) -> pd.DataFrame:
+        """Provides malignancy data for nodules by at least 1,2,3,4 readers"""
+        counts = self.reader_agreement("malignancy")
+        summary_data = np.column_stack([counts.index, counts.to_numpy()]).astype(float)
 
         df = pd.DataFrame(
             summary_data,
@@ -109,40 +196,206 @@ class LIDCExplorer:
         )
         return df
 
-    def diameter_stats(self) -> pd.DataFrame:
-        """Provides descriptive statistics of nodule diameter estimates."""
-        return self._annotation_data["diameter"].describe().to_frame().T
+    def diameter_stats(
+        self, min_readers: int = None, diagnosis: Union[str, list] = None
+    ) -> pd.DataFrame:
+        """Provides descriptive statistics of nodule diameter estimates.
 
-    def diameter_stats_by_malignancy(self) -> pd.DataFrame:
-        """Provides descriptive statistics of nodule diameter estimates by malignancy."""
-        return self._annotation_data[["malignancy", "diameter"]].groupby("malignancy").describe().T
+        Args:
+            min_readers (int): If given, only nodules annotated by at least this many readers.
+            diagnosis (Union[str,list]): If given, only annotations with this diagnosis.
+        """
+        if self._use_cube:
+            cube = self._cube(self._annotation_filepath)
+            return cube.describe(None, min_readers, self._diagnoses(diagnosis)).set_axis(
+                ["diameter"]
+            )
+        annotation_data = self.annotations(["diameter"], min_readers, diagnosis)
+        return annotation_data["diameter"].describe().to_frame().T
 
-    def diameter_stats_by_diagnosis(self) -> pd.DataFrame:
-        """Provides descriptive statistics of nodule diameter estimates by diagnosis."""
-        return self._annotation_data[["diagnosis", "diameter"]].groupby("diagnosis").describe().T
+    def diameter_stats_by_malignancy(
+        self, min_readers: int = None, diagnosis: Union[str, list] = None
+    ) -> pd.DataFrame:
+        """Provides descriptive statistics of nodule diameter estimates by malignancy.
+
+        Args:
+            min_readers (int): If given, only nodules annotated by at least this many readers.
+            diagnosis (Union[str,list]): If given, only annotations with this diagnosis.
+        """
+        if self._use_cube:
+            cube = self._cube(self._annotation_filepath)
+            return self._transpose(
+                cube.describe("malignancy", min_readers, self._diagnoses(diagnosis))
+            )
+        annotation_data = self.annotations(["malignancy", "diameter"], min_readers, diagnosis)
+        return annotation_data.groupby("malignancy").describe().T
+
+    def diameter_stats_by_diagnosis(self, min_readers: int = None) -> pd.DataFrame:
+        """Provides descriptive statistics of nodule diameter estimates by diagnosis.
+
+        Args:
+            min_readers (int): If given, only nodules annotated by at least this many readers.
+        """
+        if self._use_cube:
+            cube = self._cube(self._annotation_filepath)
+            return self._transpose(cube.describe("diagnosis", min_readers))
+        annotation_data = self.annotations(["diagnosis", "diameter"], min_readers)
+        return annotation_data.groupby("diagnosis", observed=True).describe().T
 
     def diameter_plot_by_malignancy(self) -> None:
+        plt, sns = _pyplot()
+        annotation_data = self.annotations(["malignancy", "diameter"])
         fig, axes = plt.subplots(figsize=(12, 8))
-        axes = sns.boxplot(
-            x=self._annotation_data["malignancy"], y=self._annotation_data["diameter"]
-        )
+        axes = sns.boxplot(x=annotation_data["malignancy"], y=annotation_data["diameter"])
         axes.set_title("Nodule Diameter by Malignancy")
         plt.show()
 
     def diameter_plot_by_diagnosis(self) -> None:
+        plt, sns = _pyplot()
+        nodule_data = self.nodules(["diagnosis", "diameter"])
         fig, axes = plt.subplots(figsize=(12, 8))
-        axes = sns.boxplot(x=self._nodule_data["diagnosis"], y=self._nodule_data["diameter"])
+        axes = sns.boxplot(x=nodule_data["diagnosis"], y=nodule_data["diameter"])
         axes.set_title("Nodule Diameter by Diagnosis")
         plt.show()
 
-    def _load(self) -> None:
-        self._annotation_data = self._read(self._annotation_filepath)
-        self._nodule_data = self._read(self._nodule_filepath)
+    def memory_report(self) -> pd.DataFrame:
+        """Reports the memory held by each column retained so far, as pandas would hold it by
+        default and in the compact dtypes in which the columns are held. See memory_report."""
+        tables = {"annotations": self._annotation_filepath, "nodules": self._nodule_filepath}
+        return pd.concat(
+            [
+                memory_report(self._loaded.get(filepath, pd.DataFrame())).assign(table=name)
+                for name, filepath in tables.items()
+            ],
+            ignore_index=True,
+        ).set_index(["table", "column"])
+
+    def _reader_counts(self, biomarker: str = None) -> np.ndarray:
+        """Returns the nodule counts by minimum number of readers and biomarker level."""
+        if self._use_cube:
+            cube = self._cube(self._nodule_filepath)
+            if biomarker is None or biomarker in cube.biomarkers:
+                return cube.reader_counts(biomarker)
+        columns = ["n_readers"] if biomarker is None else ["n_readers", biomarker]
+        nodule_data = self.nodules(columns)
+        return at_least_n_readers(
+            nodule_data["n_readers"].to_numpy(),
+            None if biomarker is None else nodule_data[biomarker].to_numpy(),
+        )
+
+    def _diagnoses(self, diagnosis: Union[str, list] = None) -> list:
+        return [diagnosis] if isinstance(diagnosis, str) else diagnosis
+
+    def _transpose(self, stats: pd.DataFrame) -> pd.DataFrame:
+        """Lays out statistics by group as DataFrameGroupBy.describe().T does."""
+        stats = stats.T
+        stats.index = pd.MultiIndex.from_product([["diameter"], DESCRIBE_STATISTICS])
+        return stats
+
+    def _pad(self, counts: np.ndarray, n_values: int) -> np.ndarray:
+        """Pads or truncates count columns to exactly n_values columns."""
+        padded = np.zeros((counts.shape[0], n_values), dtype=counts.dtype)
+        n = min(n_values, counts.shape[1])
+        padded[:, :n] = counts[:, :n]
+        return padded
+
+    def _get(
+        self,
+        filepath: str,
+        columns: list = None,
+        min_readers: int = None,
+        diagnosis: Union[str, list] = None,
+        keys: dict = {},
+    ) -> pd.DataFrame:
+        """Returns the requested columns, reading from file only what has not been loaded."""
+        filters = []
+        if min_readers is not None:
+            filters.append(("n_readers", ">=", min_readers))
+        if diagnosis is not None:
+            filters.append(
+                ("diagnosis", "in", [diagnosis] if isinstance(diagnosis, str) else diagnosis)
+            )
 
-    def _read(self, filepath: str) -> pd.DataFrame:
+        keys = {column: value for column, value in keys.items() if value is not None}
+        if keys:
+            return self._lookup(filepath, columns, filters, keys)
+
+        # Filtered reads are pushed down to the storage and not retained.
+        if filters or columns is None:
+            return self._read(filepath, columns, filters)
+
+        return self._load(filepath, columns)[columns].copy()
+
+    def _lookup(self, filepath: str, columns: list, filters: list, keys: dict) -> pd.DataFrame:
+        """Returns the rows matching the keys, located by the table's index, then filtered."""
+        index = self._index(filepath)
+        rows = None
+        for column, value in keys.items():
+            key_rows = index.rows(column, value)
+            rows = key_rows if rows is None else np.intersect1d(rows, key_rows)
+
+        if columns is None:
+            data = self._read(filepath).iloc[rows]
+        else:
+            filter_columns = [f[0] for f in filters if f[0] not in columns]
+            data = self._load(filepath, list(columns) + filter_columns).iloc[rows]
+
+        mask = np.ones(len(data), dtype=bool)
+        for column, op, value in filters:
+            mask &= FILTER_OPERATORS[op](data[column], value).to_numpy()
+        data = data[mask].reset_index(drop=True)
+        return data if columns is None else data[columns]
+
+    def _load(self, filepath: str, columns: list) -> pd.DataFrame:
+        """Returns the loaded columns of the file, reading only those not yet loaded."""
+        loaded = self._loaded.get(filepath)
+        missing = [column for column in columns if loaded is None or column not in loaded]
+        if missing:
+            data = self._read(filepath, missing)
+            loaded = data if loaded is None else pd.concat([loaded, data], axis=1)
+            self._loaded[filepath] = loaded
+        return loaded
+
+    def _index(self, filepath: str) -> TableIndex:
+        """Returns the index persisted alongside the file, read on first use."""
+        if filepath not in self._indexes:
+            self._indexes[filepath] = TableIndex.from_frame(self._read(index_filepath(filepath)))
+        return self._indexes[filepath]
+
+    def _cube(self, filepath: str) -> SummaryCube:
+        """Returns the summary cube of the file, rebuilt if the file's contents have changed."""
+        stat = os.stat(filepath)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        checked = self._cubes.get(filepath)
+        if checked is not None and checked[0] == signature:
+            return checked[1]
+
+        source_hash = fingerprint(filepath)
+        cube = None
+        if os.path.exists(cube_filepath(filepath)):
+            cube = SummaryCube.load(cube_filepath(filepath))
+        if cube is None or cube.source_hash != source_hash:
+            logger.info("Building the summary cube of {}.".format(filepath))
+            cube = SummaryCube.build(self._read(filepath), source_hash)
+            cube.save(cube_filepath(filepath))
+        self._cubes[filepath] = (signature, cube)
+        return cube
+
+    def _read(self, filepath: str, columns: list = None, filters: list = None) -> pd.DataFrame:
         """Loads existing metadata if it exists."""
         try:
-            return pd.read_csv(filepath, engine="pyarrow")
+            return compact(self._storage.read(filepath, columns=columns, filters=filters))
         except FileNotFoundError as e:
             logger.error("File {} not found.\n{}".format(filepath, e))
             raise
+
+
+# ------------------------------------------------------------------------------------------------ #
+def _pyplot() -> tuple:
+    """Imports pyplot and seaborn, styled for the package's plots, when first plotting."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_palette("Blues_d")
+    sns.set_style("whitegrid")
+    return plt, sns
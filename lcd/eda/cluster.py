@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /cluster.py                                                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:05:47 am                                              #
+# Modified   : Saturday October 17th 2026 11:05:47 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+from __future__ import annotations
+
+import os
+import json
+import logging
+from collections import OrderedDict
+
+from lcd.utils.config import DataConfig
+from lcd.utils.imports import lazy_import
+
+# ------------------------------------------------------------------------------------------------ #
+pl = lazy_import("pylidc")
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+# Maximum number of scans whose clusters are held in memory.
+CLUSTER_CACHE_SIZE = 128
+# Process-wide cache used by cluster_annotations, created on first use.
+_cluster_cache = None
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ClusterCache:
+    """Caches the nodule clusters for scans in memory and on disk.
+
+    Clusters are stored as lists of annotation ids, keyed by the scan id, the clustering
+    tolerance and the pylidc version. The consensus confidence level does not affect the
+    clusters, so is not part of the key. The in-memory tier evicts the least recently used
+    scans. The on-disk tier is shared across processes and sessions.
+
+    Args:
+        folder (str): Directory for the on-disk tier. If None, clusters are cached in memory only.
+        maxsize (int): Maximum number of scans held in memory.
+    """
+
+    def __init__(self, folder: str = None, maxsize: int = CLUSTER_CACHE_SIZE) -> None:
+        self._folder = folder
+        self._maxsize = maxsize
+        self._memory = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, scan: pl.Scan, tol: float = None) -> list:
+        """Returns the scan's annotations clustered by nodule, clustering only on a cache miss.
+
+        Args:
+            scan (pl.Scan): The scan whose annotations are clustered.
+            tol (float): Clustering tolerance in millimeters. None uses the scan pixel spacing.
+
+        Returns:
+            List of nodules, each a list of pl.Annotation objects.
+        """
+        key = self._key(scan, tol)
+        groups = self._memory.get(key)
+        if groups is not None:
+            self._memory.move_to_end(key)
+        else:
+            groups = self._read(key)
+        if groups is None:
+            self._misses += 1
+            nodules = scan.cluster_annotations(tol=tol, verbose=False)
+            groups = [[annotation.id for annotation in nodule] for nodule in nodules]
+            self._write(key, groups)
+        else:
+            self._hits += 1
+            annotations = {annotation.id: annotation for annotation in scan.annotations}
+            nodules = [[annotations[id] for id in group] for group in groups]
+
+        self._remember(key, groups)
+        return nodules
+
+    def clear(self) -> None:
+        """Empties the in-memory tier. The on-disk tier is left in place."""
+        self._memory.clear()
+
+    def _key(self, scan: pl.Scan, tol: float) -> str:
+        return "scan_{}_tol_{}_pylidc_{}".format(
+            scan.id, "auto" if tol is None else tol, pl.__version__
+        )
+
+    def _remember(self, key: str, groups: list) -> None:
+        self._memory[key] = groups
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._maxsize:
+            self._memory.popitem(last=False)
+
+    def _filepath(self, key: str) -> str:
+        return os.path.join(self._folder, key + ".json")
+
+    def _read(self, key: str) -> list:
+        if self._folder is None or not os.path.exists(self._filepath(key)):
+            return None
+        with open(self._filepath(key), "r") as f:
+            return json.load(f)
+
+    def _write(self, key: str, groups: list) -> None:
+        if self._folder is None:
+            return
+        os.makedirs(self._folder, exist_ok=True)
+        # Temporary file is private to the process so concurrent workers never share it.
+        tmp_filepath = "{}.{}.tmp".format(self._filepath(key), os.getpid())
+        with open(tmp_filepath, "w") as f:
+            json.dump(groups, f)
+        os.replace(tmp_filepath, self._filepath(key))
+
+
+# ------------------------------------------------------------------------------------------------ #
+def cluster_annotations(scan: pl.Scan, tol: float = None) -> list:
+    """Returns the scan's annotations clustered by nodule, using the process-wide cache.
+
+    Args:
+        scan (pl.Scan): The scan whose annotations are clustered.
+        tol (float): Clustering tolerance in millimeters. None uses the scan pixel spacing.
+    """
+    global _cluster_cache
+    if _cluster_cache is None:
+        _cluster_cache = ClusterCache(
+            folder=os.path.join(DataConfig().interim_data_folder, "clusters")
+        )
+    return _cluster_cache.get(scan, tol=tol)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /consensus.py                                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:12 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:12 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+from __future__ import annotations
+
+import logging
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from lcd.utils.config import PylidcConfig
+from lcd.utils.imports import lazy_import
+
+# ------------------------------------------------------------------------------------------------ #
+pl = lazy_import("pylidc")
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+CONSENSUS_VOLUME_COLUMNS = [
+    "patient_id",
+    "scan_id",
+    "nodule_id",
+    "annotation_id",
+    "mask_volume",
+    "consensus_volume",
+]
+# In-plane size of LIDC images, the limit of the bounding boxes when no volume shape is given.
+IMAGE_SIZE = 512
+
+
+# ------------------------------------------------------------------------------------------------ #
+@dataclass(frozen=True, slots=True, eq=False)
+class NoduleConsensus:
+    """The consensus of the annotations of a nodule.
+
+    Args:
+        bbox (tuple): Tuple of slices indexing the scan volume at the location of the mask.
+        mask (np.ndarray): Boolean consensus mask over the bounding box.
+        annotation_ids (tuple): The ids of the nodule's annotations.
+        mask_volumes (np.ndarray): Volume in cubic millimeters of each annotation's mask.
+        volume (float): Volume in cubic millimeters of the consensus mask.
+    """
+
+    bbox: tuple
+    mask: np.ndarray
+    annotation_ids: tuple
+    mask_volumes: np.ndarray
+    volume: float
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ConsensusEngine:
+    """Computes the consensus masks and bounding boxes of the nodules of a scan.
+
+    The result for each nodule matches pylidc.utils.consensus, but rather than rasterizing each
+    contour with a matplotlib path in a Python loop, the contours of all of a nodule's
+    annotations are filled together. Scanline crossings of all contour edges are accumulated
+    into one stacked array, from which the masks of all annotations follow by a cumulative XOR.
+    The agreement of the readers and the mask volumes are then NumPy reductions over the stack.
+
+    The masks are rasterized only over the extent of the nodule's contours, one nodule at a
+    time, so memory is bounded by the largest nodule rather than by the padded bounding box.
+    The consensus is zero outside the contours, so the padding is added as zeros.
+
+    As in pylidc, voxels enclosed by inclusion contours are included, those enclosed by
+    exclusion contours are excluded, and the contour points themselves are excluded.
+
+    Args:
+        confidence_level (float): Fraction of the annotations that must include a voxel.
+            Defaults to the value in the pylidc configuration.
+        padding (int): Padding of the bounding box in voxels. Defaults to the value in the
+            pylidc configuration.
+    """
+
+    def __init__(self, confidence_level: float = None, padding: int = None) -> None:
+        config = PylidcConfig().settings
+        self._confidence_level = (
+            config.confidence_level if confidence_level is None else confidence_level
+        )
+        self._padding = config.padding if padding is None else padding
+
+    def compute(self, scan: pl.Scan, nodules: list, shape: tuple = None) -> list:
+        """Returns the consensus of each nodule of the scan.
+
+        Args:
+            scan (pl.Scan): The scan annotated.
+            nodules (list): The annotations of each nodule, e.g. from cluster_annotations.
+            shape (tuple): Shape of the scan volume, which bounds the bounding boxes. Defaults
+                to 512 x 512 by the number of slices of the scan.
+
+        Returns:
+            List of NoduleConsensus, one per nodule, in the order of the nodules.
+        """
+        zvals = np.asarray(scan.slice_zvals, dtype=float)
+        shape = np.array(shape or (IMAGE_SIZE, IMAGE_SIZE, len(zvals)))
+        voxel_volume = scan.pixel_spacing**2 * scan.slice_spacing
+        return [
+            self._compute_nodule(annotations, zvals, shape, voxel_volume) for annotations in nodules
+        ]
+
+    def _compute_nodule(
+        self, annotations: list, zvals: np.ndarray, shape: np.ndarray, voxel_volume: float
+    ) -> NoduleConsensus:
+        """Returns the consensus of the annotations of a single nodule."""
+        # Flatten the contours of the nodule, recording the annotation and slice of each.
+        matrices, contour_annotation, contour_z, contour_inclusion = [], [], [], []
+        for annotation_no, annotation in enumerate(annotations):
+            for contour in annotation.contours:
+                matrices.append(contour_matrix(contour))
+                contour_annotation.append(annotation_no)
+                contour_z.append(contour.image_z_position)
+                contour_inclusion.append(contour.inclusion)
+        contour_annotation = np.array(contour_annotation)
+        contour_inclusion = np.array(contour_inclusion, dtype=bool)
+        contour_k = np.abs(zvals[None, :] - np.array(contour_z)[:, None]).argmin(axis=1)
+
+        point_contour = np.repeat(np.arange(len(matrices)), [len(m) for m in matrices])
+        points = np.c_[np.concatenate(matrices), contour_k[point_contour]]
+
+        # The extent of the contours, and the padded bounding box.
+        extent_lower = points.min(axis=0)
+        extent_upper = points.max(axis=0)
+        size = extent_upper - extent_lower + 1
+        lower = np.maximum(extent_lower - self._padding, 0)
+        upper = np.minimum(extent_upper + self._padding, shape - 1)
+
+        # Each annotation's mask over the extent, stacked as (annotation, slice, row, column).
+        local = points - extent_lower
+        interiors = fill_polygons(local[:, :2], point_contour, len(matrices), tuple(size[:2]))
+        slices = (contour_annotation, contour_k - extent_lower[2])
+        included = np.zeros((len(annotations), size[2]) + tuple(size[:2]), dtype=bool)
+        excluded = np.zeros_like(included)
+        np.logical_or.at(
+            included, tuple(s[contour_inclusion] for s in slices), interiors[contour_inclusion]
+        )
+        np.logical_or.at(
+            excluded, tuple(s[~contour_inclusion] for s in slices), interiors[~contour_inclusion]
+        )
+        excluded[contour_annotation[point_contour], local[:, 2], local[:, 0], local[:, 1]] = True
+        masks = included & ~excluded
+
+        # Agreement of the readers, as the fraction of the annotations including a voxel.
+        agreement = masks.sum(axis=0, dtype=np.int64)
+        consensus = agreement / len(annotations) >= self._confidence_level
+
+        # The consensus within the padded bounding box, zero beyond the extent.
+        mask = np.zeros(tuple(upper - lower + 1), dtype=bool)
+        offset = extent_lower - lower
+        mask[tuple(slice(o, o + n) for o, n in zip(offset, size))] = np.moveaxis(consensus, 0, -1)
+
+        return NoduleConsensus(
+            bbox=tuple(slice(lo, hi + 1) for lo, hi in zip(lower, upper)),
+            mask=mask,
+            annotation_ids=tuple(annotation.id for annotation in annotations),
+            mask_volumes=np.count_nonzero(masks.reshape(len(masks), -1), axis=1) * voxel_volume,
+            volume=float(np.count_nonzero(consensus) * voxel_volume),
+        )
+
+    def volumes(self, scan: pl.Scan, nodules: list, results: list = None) -> pd.DataFrame:
+        """Returns the mask volumes of each annotation and the consensus volume of its nodule.
+
+        The volumes are in cubic millimeters, one row per annotation, and may be joined on
+        annotation_id to the annotation data to be compared with the volume pylidc computes
+        from the contours.
+
+        Args:
+            scan (pl.Scan): The scan annotated.
+            nodules (list): The annotations of each nodule, e.g. from cluster_annotations.
+            results (list): The consensus of the nodules, if already computed.
+        """
+        results = self.compute(scan, nodules) if results is None else results
+        rows = [
+            (
+                scan.patient_id,
+                scan.id,
+                scan.patient_id + "_" + str(nodule_no),
+                annotation_id,
+                float(mask_volume),
+                result.volume,
+            )
+            for nodule_no, result in enumerate(results, start=1)
+            for annotation_id, mask_volume in zip(result.annotation_ids, result.mask_volumes)
+        ]
+        return pd.DataFrame(rows, columns=CONSENSUS_VOLUME_COLUMNS)
+
+
+# ------------------------------------------------------------------------------------------------ #
+def contour_matrix(contour: pl.Contour) -> np.ndarray:
+    """Returns the (i, j) index coordinates of a contour's points, as pl.Contour.to_matrix.
+
+    The coordinates are stored as 'x,y' lines, so are reversed.
+    """
+    xy = np.array(contour.coords.replace("\n", ",").split(","), dtype=np.int64)
+    return xy.reshape(-1, 2)[:, ::-1]
+
+
+def fill_polygons(
+    points: np.ndarray, point_polygon: np.ndarray, n: int, shape: tuple
+) -> np.ndarray:
+    """Returns a stacked boolean array of the pixels enclosed by each of a set of polygons.
+
+    A pixel is enclosed if a ray along its row crosses the polygon's edges an odd number of
+    times. The crossings of every edge with every row it spans are computed at once and
+    toggled into the stack, and the parity accumulated along the rows.
+
+    Args:
+        points (np.ndarray): The (i, j) coordinates of the vertices of all polygons, in order.
+            Each polygon is closed from its last vertex back to its first.
+        point_polygon (np.ndarray): The polygon to which each vertex belongs, in [0, n).
+            The vertices of a polygon are contiguous.
+        n (int): The number of polygons.
+        shape (tuple): The shape of each polygon's array, within which the points lie.
+
+    Returns:
+        Boolean array of shape (n,) + shape.
+    """
+    height, width = shape
+    following = np.arange(1, len(points) + 1)
+    ends = np.flatnonzero(np.r_[point_polygon[1:] != point_polygon[:-1], True])
+    following[ends] = np.r_[0, ends[:-1] + 1]
+
+    i0, j0 = points[:, 0], points[:, 1]
+    i1, j1 = points[following, 0], points[following, 1]
+    # Each edge crosses the rows from the lower of its ends up to, excluding, the upper.
+    n_rows = np.abs(i1 - i0)
+    edge = np.repeat(np.arange(len(points)), n_rows)
+    rows = (
+        np.minimum(i0, i1)[edge]
+        + np.arange(len(edge))
+        - np.repeat(np.cumsum(n_rows) - n_rows, n_rows)
+    )
+    crossings = j0[edge] + (rows - i0[edge]) * (j1 - j0)[edge] / (i1 - i0)[edge]
+    columns = np.clip(np.floor(crossings).astype(np.int64) + 1, 0, width)
+
+    toggles = np.zeros((n, height, width + 1), dtype=np.uint8)
+    np.bitwise_xor.at(toggles, (point_polygon[edge], rows, columns), 1)
+    return np.bitwise_xor.accumulate(toggles, axis=2)[:, :, :width].astype(bool)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /cube.py                                                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:52 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:52 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import numpy as np
+import pandas as pd
+
+from lcd.eda import FEATURE_COLUMNS
+from lcd.eda.aggregate import at_least_n_readers
+
+# ------------------------------------------------------------------------------------------------ #
+# Biomarker of the cells that tally every row by readers and diagnosis alone, at level 0.
+ALL = "all"
+CELL_COLUMNS = [
+    "biomarker",
+    "level",
+    "n_readers",
+    "diagnosis",
+    "count",
+    "sum",
+    "sumsq",
+    "min",
+    "max",
+]
+# Statistics reported for the diameters of a group, as by pandas describe.
+DESCRIBE_STATISTICS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+# Diameter quantiles are estimated to within this relative error, for diameters in the range.
+SKETCH_ACCURACY = 0.005
+SKETCH_RANGE = (0.01, 1000.0)
+_LOG_GAMMA = np.log((1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY))
+_FIRST_BIN = int(np.ceil(np.log(SKETCH_RANGE[0]) / _LOG_GAMMA))
+N_BINS = int(np.ceil(np.log(SKETCH_RANGE[1]) / _LOG_GAMMA)) - _FIRST_BIN + 1
+
+
+def cube_filepath(filepath: str) -> str:
+    """Returns the filepath of the summary cube persisted alongside a table."""
+    return os.path.splitext(filepath)[0] + "_cube.npz"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class SummaryCube:
+    """Pre-aggregated diameter statistics of a nodule or annotation table.
+
+    Rows are tallied into cells by number of readers, diagnosis and the level of each
+    biomarker, one biomarker at a time, plus the cells of biomarker 'all' which ignore the
+    biomarkers. Each cell holds the count, sum, sum of squares, minimum and maximum of the
+    diameters, and a quantile sketch: a histogram over logarithmic bins, each wider than the
+    last by SKETCH_ACCURACY, so quantiles are estimated to within that relative error.
+
+    Cells merge by addition, so any summary by readers, diagnosis or a biomarker is computed
+    from the few hundred cells rather than from the rows. The cube records the hash of the
+    table it was built from, so that a persisted cube can be checked against its source.
+
+    Args:
+        cells (pd.DataFrame): The cells, with columns CELL_COLUMNS.
+        sketches (np.ndarray): The sketch of each cell, of shape (len(cells), N_BINS).
+        source_hash (str): The hash of the table from which the cube was built.
+    """
+
+    def __init__(self, cells: pd.DataFrame, sketches: np.ndarray, source_hash: str = "") -> None:
+        self._cells = cells
+        # Columns as arrays, as indexing the DataFrame costs more than the query itself.
+        self._columns = {column: cells[column].to_numpy() for column in CELL_COLUMNS}
+        self._sketches = sketches
+        self._source_hash = source_hash
+
+    @property
+    def cells(self) -> pd.DataFrame:
+        return self._cells
+
+    @property
+    def source_hash(self) -> str:
+        return self._source_hash
+
+    @property
+    def biomarkers(self) -> list:
+        return [biomarker for biomarker in self._cells["biomarker"].unique() if biomarker != ALL]
+
+    @classmethod
+    def build(cls, data: pd.DataFrame, source_hash: str = "") -> "SummaryCube":
+        """Tallies the table into cells over each of the biomarkers it has.
+
+        Args:
+            data (pd.DataFrame): Table with n_readers, diagnosis and diameter columns, and any
+                of the biomarkers in FEATURE_COLUMNS.
+            source_hash (str): The hash of the file from which the table was read.
+        """
+        n_readers = data["n_readers"].to_numpy(dtype=np.int64)
+        diagnosis_codes, diagnoses = pd.factorize(data["diagnosis"].astype(str))
+        diameter = data["diameter"].to_numpy(dtype=float)
+        bins = sketch_bins(diameter)
+
+        frames, sketches = [], []
+        biomarkers = [column for column in FEATURE_COLUMNS if column in data.columns]
+        for biomarker in [ALL] + biomarkers:
+            levels = (
+                np.zeros(len(data), dtype=np.int64)
+                if biomarker == ALL
+                else data[biomarker].to_numpy(dtype=np.int64)
+            )
+            keys, cell = np.unique(
+                np.c_[levels, n_readers, diagnosis_codes], axis=0, return_inverse=True
+            )
+            cell = cell.reshape(-1)
+            n_cells = len(keys)
+            minimum = np.full(n_cells, np.inf)
+            maximum = np.full(n_cells, -np.inf)
+            np.minimum.at(minimum, cell, diameter)
+            np.maximum.at(maximum, cell, diameter)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "biomarker": biomarker,
+                        "level": keys[:, 0],
+                        "n_readers": keys[:, 1],
+                        "diagnosis": np.asarray(diagnoses, dtype=str)[keys[:, 2]],
+                        "count": np.bincount(cell, minlength=n_cells),
+                        "sum": np.bincount(cell, weights=diameter, minlength=n_cells),
+                        "sumsq": np.bincount(cell, weights=diameter**2, minlength=n_cells),
+                        "min": minimum,
+                        "max": maximum,
+                    }
+                )
+            )
+            sketches.append(
+                np.bincount(cell * N_BINS + bins, minlength=n_cells * N_BINS).reshape(
+                    n_cells, N_BINS
+                )
+            )
+        cells = pd.concat(frames, ignore_index=True)[CELL_COLUMNS]
+        return cls(cells, np.concatenate(sketches).astype(np.int32), source_hash)
+
+    def reader_counts(self, biomarker: str = None) -> np.ndarray:
+        """Returns the counts by minimum number of readers and biomarker level, as returned by
+        at_least_n_readers for the rows of the table.
+
+        Args:
+            biomarker (str): A biomarker of the cube. If None, the counts have a single column.
+        """
+        selected = self._columns["biomarker"] == (biomarker or ALL)
+        return at_least_n_readers(
+            self._columns["n_readers"][selected],
+            self._columns["level"][selected] if biomarker else None,
+            self._columns["count"][selected],
+        )
+
+    def describe(
+        self, by: str = None, min_readers: int = None, diagnosis: list = None
+    ) -> pd.DataFrame:
+        """Returns the statistics of the diameters of the rows selected, by group.
+
+        Args:
+            by (str): 'diagnosis' or a biomarker of the cube by whose levels the rows are
+                grouped. If None, the rows form a single group.
+            min_readers (int): If given, only rows with at least this many readers.
+            diagnosis (list): If given, only rows with these diagnoses.
+
+        Returns:
+            DataFrame with a row per group, indexed by the group values in sorted order, and the
+            columns DESCRIBE_STATISTICS.
+        """
+        columns = self._columns
+        selected = columns["biomarker"] == (ALL if by in (None, "diagnosis") else by)
+        if min_readers is not None:
+            selected &= columns["n_readers"] >= min_readers
+        if diagnosis is not None:
+            selected &= np.isin(columns["diagnosis"], diagnosis)
+        cells = {column: values[selected] for column, values in columns.items()}
+
+        if by is None:
+            groups, group = np.zeros(1, dtype=np.int64), np.zeros(selected.sum(), dtype=np.int64)
+        else:
+            groups, group = np.unique(
+                cells["diagnosis" if by == "diagnosis" else "level"], return_inverse=True
+            )
+        n_groups = len(groups)
+        count = np.bincount(group, weights=cells["count"], minlength=n_groups)
+        total = np.bincount(group, weights=cells["sum"], minlength=n_groups)
+        sumsq = np.bincount(group, weights=cells["sumsq"], minlength=n_groups)
+        minimum = np.full(n_groups, np.inf)
+        maximum = np.full(n_groups, -np.inf)
+        np.minimum.at(minimum, group, cells["min"])
+        np.maximum.at(maximum, group, cells["max"])
+        membership = (group[None, :] == np.arange(n_groups)[:, None]).astype(np.int64)
+        sketch = membership @ self._sketches[selected]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            std = np.sqrt(np.maximum(sumsq - total * mean, 0) / (count - 1))
+        std[count < 2] = np.nan
+        empty = count == 0
+        minimum[empty], maximum[empty], mean[empty] = np.nan, np.nan, np.nan
+        quantiles = sketch_quantiles(sketch, [0.25, 0.5, 0.75], minimum, maximum)
+
+        stats = np.column_stack([count, mean, std, minimum, quantiles, maximum])
+        index = pd.Index(groups, name=by) if by is not None else None
+        return pd.DataFrame(stats, index=index, columns=DESCRIBE_STATISTICS)
+
+    def save(self, filepath: str) -> None:
+        """Saves the cube through a temporary file and a rename."""
+        arrays = {column: self._cells[column].to_numpy() for column in CELL_COLUMNS}
+        arrays["biomarker"] = arrays["biomarker"].astype(str)
+        arrays["diagnosis"] = arrays["diagnosis"].astype(str)
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        with open(filepath + ".tmp", "wb") as f:
+            np.savez_compressed(
+                f, sketches=self._sketches, source_hash=np.array(self._source_hash), **arrays
+            )
+        os.replace(filepath + ".tmp", filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> "SummaryCube":
+        """Loads a cube saved by save."""
+        with np.load(filepath) as data:
+            cells = pd.DataFrame({column: data[column] for column in CELL_COLUMNS})
+            return cls(cells, data["sketches"], str(data["source_hash"]))
+
+
+# ------------------------------------------------------------------------------------------------ #
+def sketch_bins(values: np.ndarray) -> np.ndarray:
+    """Returns the bin of each value in a quantile sketch, clipped to the sketch's range."""
+    values = np.clip(values, *SKETCH_RANGE)
+    return np.ceil(np.log(values) / _LOG_GAMMA).astype(np.int64) - _FIRST_BIN
+
+
+def sketch_quantiles(
+    sketches: np.ndarray, quantiles: list, minimum: np.ndarray, maximum: np.ndarray
+) -> np.ndarray:
+    """Estimates quantiles from sketches, interpolating between ranks as pandas does.
+
+    Each rank is estimated by the midpoint of its bin, then clipped to the minimum and maximum,
+    which are exact.
+
+    Args:
+        sketches (np.ndarray): Sketches of shape (n, N_BINS).
+        quantiles (list): The quantiles to estimate, e.g. [0.25, 0.5, 0.75].
+        minimum (np.ndarray): The minimum value of each sketch.
+        maximum (np.ndarray): The maximum value of each sketch.
+
+    Returns:
+        Array of shape (n, len(quantiles)). Quantiles of empty sketches are NaN.
+    """
+    gamma = np.exp(_LOG_GAMMA)
+    midpoints = 2 * gamma ** (np.arange(N_BINS) + _FIRST_BIN) / (gamma + 1)
+    cumulative = np.cumsum(sketches, axis=1)
+    count = cumulative[:, -1] if len(cumulative) else np.zeros(0)
+    result = np.full((len(sketches), len(quantiles)), np.nan)
+    for i in np.flatnonzero(count):
+        ranks = np.asarray(quantiles) * (count[i] - 1)
+        lower = midpoints[np.searchsorted(cumulative[i], np.floor(ranks) + 1)]
+        upper = midpoints[np.searchsorted(cumulative[i], np.ceil(ranks) + 1)]
+        estimates = lower + (ranks - np.floor(ranks)) * (upper - lower)
+        result[i] = np.clip(estimates, minimum[i], maximum[i])
+    return result
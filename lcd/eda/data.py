@@ -15,32 +15,79 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+from __future__ import annotations
+
 import os
-import inspect
-import math
 import logging
-import logging.config
-import pylidc as pl
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from tqdm import tqdm
-from typing import Tuple
-
-
-from lcd.utils.config import DataConfig
+from typing import Iterator, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lcd.utils.config import DataConfig, PYLIDC_CONFIG, config_cache, install_config_cache
+from lcd.utils.accumulator import ColumnAccumulator
+from lcd.utils.checkpoint import CheckpointStore, fingerprint
+from lcd.utils.files import DirectoryStats
+from lcd.utils.imports import lazy_import
+from lcd.utils.timing import StageTimer, timed
+from lcd.eda.cluster import cluster_annotations
+from lcd.eda.index import TableIndex, index_filepath
+from lcd.eda.cube import SummaryCube, cube_filepath
+from lcd.eda.aggregate import group_ceil_median, group_mode
+from lcd.eda.dtypes import compact, memory_report, table_dtypes
+from lcd.eda.storage import (
+    get_storage,
+    ANNOTATION_SCHEMA,
+    CASE_SCHEMA,
+    NODULE_SCHEMA,
+    SMALL_NODULE_SCHEMA,
+)
 from lcd.eda import (
     ANNOTATION_COLUMNS,
     NODULE_COLUMNS,
     FEATURE_COLUMNS,
+    SEMANTIC_FEATURE_COLUMNS,
+    SEMANTIC_LABELS,
     SMALL_NODULE_COLUMNS,
     CASE_COLUMNS,
 )
-from lcd.utils.log_config import LOG_CONFIG
+from lcd.utils.log_config import configure_worker_logging, queue_logging
 
 # ------------------------------------------------------------------------------------------------ #
-logging.config.dictConfig(LOG_CONFIG)
+pl = lazy_import("pylidc")
 logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------------------------ #
+# Number of patient chunks queued per worker process. Smaller chunks balance load across workers
+# and advance the progress bar more smoothly.
+CHUNKS_PER_WORKER = 4
+# Version of the per-patient rows that are checkpointed. Increment it on any change to the
+# code producing the rows, so that checkpoints from an earlier version are discarded.
+CHECKPOINT_VERSION = "1"
+# Number of scans loaded from the database at a time when streaming batches.
+SCAN_PAGE_SIZE = 64
+# Database session private to a worker process, created by init_worker.
+_worker_session = None
+# Annotations are grouped into nodules by these keys and aggregated column by column.
+NODULE_KEYS = ["patient_id", "scan_id", "nodule_id", "nodule_classification"]
+NODULE_AGGREGATIONS = {
+    "annotation_no": "count",
+    "subtlety": "ceil_median",
+    "internalStructure": "mode",
+    "calcification": "mode",
+    "sphericity": "mode",
+    "margin": "ceil_median",
+    "lobulation": "ceil_median",
+    "spiculation": "ceil_median",
+    "texture": "mode",
+    "malignancy": "ceil_median",
+    "diameter": "mean",
+    "volume": "mean",
+    "surface_area": "mean",
+    "diagnosis": "mode",
+}
+# ------------------------------------------------------------------------------------------------ #
 
 
 class LIDCData:
@@ -51,6 +98,15 @@ class LIDCData:
         excluded_patients (dict): Dictionary containing the excluded patients and reason for exclusion.
         use_existing_data (bool): If True, the class loads existing annotation and nodule
             data if it exists. Otherwise, the build process proceeds as normal.
+        workers (int): Number of worker processes used to cluster and process scans. Default 1
+            processes the scans serially in the calling process.
+        use_checkpoints (bool): If True, each patient's results are checkpointed under the
+            interim data folder as they are produced, and patients checkpointed by an earlier,
+            possibly interrupted, build are not processed again.
+        storage_format (str): File format of the output metadata: 'parquet' (default),
+            'feather' or 'csv'. The extension of the configured filepaths follows the format.
+        timing (bool): If True, the duration of each stage is recorded and a summary is logged
+            at the end of the build. See timings.
     """
 
     def __init__(
@@ -58,23 +114,35 @@ class LIDCData:
         included_patients: list = [],
         excluded_patients: dict = {},
         use_existing_data: bool = False,
+        workers: int = 1,
+        use_checkpoints: bool = True,
+        storage_format: str = "parquet",
+        timing: bool = True,
     ) -> None:
         self._included_patients = included_patients
         self._excluded_patients = excluded_patients
         self._use_existing_data = use_existing_data
+        self._workers = workers
+        self._use_checkpoints = use_checkpoints
+        self._timer = StageTimer(enabled=timing)
+        self._config = DataConfig().settings
+        self._checkpoint_folder = os.path.join(
+            self._config.interim_data_folder, "checkpoints", "lidc_data"
+        )
 
         # Input: Reference data including non-nodule cases and metadata
         self._non_nodule_cases = None
-        self._non_nodule_cases_filepath = DataConfig().non_nodule_cases_filepath
+        self._non_nodule_cases_filepath = self._config.non_nodule_cases_filepath
         self._metadata = None
-        self._metadata_filepath = DataConfig().metadata_filepath
+        self._metadata_filepath = self._config.metadata_filepath
 
         # Output: Filepaths
-        self._cases_filepath = DataConfig().cases_filepath
-        self._annotations_filepath = DataConfig().annotations_filepath
-        self._nodules_filepath = DataConfig().nodules_filepath
-        self._small_nodules_filepath = DataConfig().small_nodules_filepath
-        self._non_nodules_filepath = DataConfig().non_nodules_filepath
+        self._storage = get_storage(storage_format)
+        self._cases_filepath = self._storage.filepath(self._config.cases_filepath)
+        self._annotations_filepath = self._storage.filepath(self._config.annotations_filepath)
+        self._nodules_filepath = self._storage.filepath(self._config.nodules_filepath)
+        self._small_nodules_filepath = self._storage.filepath(self._config.small_nodules_filepath)
+        self._non_nodules_filepath = self._storage.filepath(self._config.non_nodules_filepath)
 
         # Output: Datasets
         self._case_data = pd.DataFrame(index=[], columns=CASE_COLUMNS)
@@ -83,25 +151,124 @@ class LIDCData:
         self._non_nodule_data = pd.DataFrame(index=[], columns=NODULE_COLUMNS)
         self._small_nodule_data = pd.DataFrame(index=[], columns=SMALL_NODULE_COLUMNS)
 
+        # Row buffers from which the annotation and small nodule datasets are materialized.
+        self._annotation_records = ColumnAccumulator(
+            ANNOTATION_COLUMNS, table_dtypes(ANNOTATION_COLUMNS)
+        )
+        self._small_nodule_records = ColumnAccumulator(
+            SMALL_NODULE_COLUMNS, table_dtypes(SMALL_NODULE_COLUMNS)
+        )
+
     def build(self) -> None:
         """Builds the scan metadata to the annotation level."""
-        logger.debug("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
-        if self._use_existing_data and self._data_exists:
-            self._load_existing_data()
-
-        else:
+        self._timer.reset()
+        with self._timer.stage("LIDCData.build"):
+            if self._use_existing_data and self._data_exists():
+                self._load_existing_data()
+
+            else:
+                self._load_reference_data()
+                self._build_annotation_data()
+                self._build_nodule_data()
+                self._build_case_data()
+                self._save_data()
+
+        if self._timer.enabled:
+            logger.info("Build timings\n{}".format(self.timings.to_string(index=False)))
+
+    @property
+    def timings(self) -> pd.DataFrame:
+        """Returns the count, total, median and 99th percentile duration in milliseconds of
+        each stage of the last build. Scans processed by worker processes are not timed."""
+        return self._timer.summary()
+
+    def memory_report(self) -> pd.DataFrame:
+        """Reports the memory held by each column of each table, as pandas would hold it by
+        default and in the compact dtypes in which the tables are held. See memory_report."""
+        tables = {
+            "cases": self._case_data,
+            "annotations": self._annotation_data,
+            "nodules": self._nodule_data,
+            "small_nodules": self._small_nodule_data,
+            "non_nodules": self._non_nodule_data,
+        }
+        return pd.concat(
+            [memory_report(data).assign(table=name) for name, data in tables.items()],
+            ignore_index=True,
+        ).set_index(["table", "column"])
+
+    def iter_batches(self, batch_size: int = 1000, filepath: str = None) -> Iterator[pd.DataFrame]:
+        """Yields the annotation data in batches as the scans are processed.
+
+        Only the current batch and page of scans are held in memory, however many patients are
+        included. A scan's annotations are never split across batches, so a batch may exceed
+        batch_size by the annotations of one scan. Scans are processed serially and without
+        checkpoints. Small nodules are not included.
+
+        Args:
+            batch_size (int): Number of annotations after which a batch is yielded.
+            filepath (str): If given, each batch is also appended to this file in the storage
+                format of the instance. The file is complete once the iteration finishes.
+        """
+        if self._non_nodule_cases is None:
             self._load_reference_data()
-            self._build_annotation_data()
-            self._build_nodule_data()
-            # self._build_case_data()
-            self._save_data()
 
-        logger.debug("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        writer = None
+        if filepath is not None:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            writer = self._storage.writer(filepath, ANNOTATION_SCHEMA)
+
+        batch = ColumnAccumulator(ANNOTATION_COLUMNS, table_dtypes(ANNOTATION_COLUMNS))
+        try:
+            for scan in self._iter_scans():
+                annotations, _ = self._process_scan(scan)
+                batch.extend(annotations)
+                if len(batch) >= batch_size:
+                    yield self._flush_batch(batch, writer)
+            if len(batch) > 0:
+                yield self._flush_batch(batch, writer)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _iter_scans(self, page_size: int = SCAN_PAGE_SIZE) -> Iterator[pl.Scan]:
+        """Yields the scans in query order, loaded a page at a time in a private session.
+
+        Each page is loaded with its annotations and contours, and released from the session
+        once its scans have been yielded.
+        """
+        from sqlalchemy.orm import selectinload, sessionmaker
+
+        session = sessionmaker(bind=pl._session.get_bind())()
+        try:
+            scans = self._get_scans().with_session(session)
+            scan_ids = [scan_id for scan_id, in scans.with_entities(pl.Scan.id)]
+            for start in range(0, len(scan_ids), page_size):
+                page_ids = scan_ids[start : start + page_size]
+                page = {
+                    scan.id: scan
+                    for scan in scans.filter(pl.Scan.id.in_(page_ids)).options(
+                        selectinload(pl.Scan.annotations).selectinload(pl.Annotation.contours)
+                    )
+                }
+                for scan_id in page_ids:
+                    yield page[scan_id]
+                session.expunge_all()
+        finally:
+            session.close()
+
+    def _flush_batch(self, batch: ColumnAccumulator, writer=None) -> pd.DataFrame:
+        """Materializes and empties the batch, appending it to the writer if given."""
+        data = self._decode_semantic_features(batch.to_frame())
+        batch.clear()
+        if writer is not None:
+            writer.write(data)
+        return data
 
     def _data_exists(self) -> bool:
         return (
-            os.path.exists(self._annotations_filepath)
+            os.path.exists(self._cases_filepath)
+            and os.path.exists(self._annotations_filepath)
             and os.path.exists(self._nodules_filepath)
             and os.path.exists(self._small_nodules_filepath)
             and os.path.exists(self._non_nodules_filepath)
@@ -109,72 +276,187 @@ class LIDCData:
 
     def _load_existing_data(self) -> None:
         logger.info("Loading existing data...")
-        # self._case_data = pd.read_csv(self._cases_filepath)
-        self._annotation_data = pd.read_csv(self._annotations_filepath)
-        self._nodule_data = pd.read_csv(self._nodules_filepath)
-        self._small_nodule_data = pd.read_csv(self._small_nodules_filepath)
-        self._non_nodule_data = pd.read_csv(self._non_nodules_filepath)
+        self._case_data = self._read(self._cases_filepath)
+        self._annotation_data = self._read(self._annotations_filepath)
+        self._nodule_data = self._read(self._nodules_filepath)
+        self._small_nodule_data = self._read(self._small_nodules_filepath)
+        self._non_nodule_data = self._read(self._non_nodules_filepath)
 
+    @timed()
     def _load_reference_data(self) -> None:
         """Loads cases with non or small nodules."""
-        self._non_nodule_cases = list(
+        # Hashed for constant time membership tests, one per annotation.
+        self._non_nodule_cases = frozenset(
             pd.read_csv(self._non_nodule_cases_filepath)["patient_id"].values
         )
         self._metadata = pd.read_csv(self._metadata_filepath)
 
+    @timed()
     def _build_annotation_data(self) -> None:
         """Builds the annotation data."""
 
-        logger.debug("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
         scans = self._get_scans()
-        with tqdm(total=scans.count()) as pbar:
-            # Process clustered annotations by scan
-            for scan in scans:
+        scan_index = [
+            (scan_id, patient_id)
+            for scan_id, patient_id in scans.with_entities(pl.Scan.id, pl.Scan.patient_id)
+        ]
 
-                pbar.set_description("Processing patient {}".format(scan.patient_id))
-                logger.debug("Processing patient {}".format(scan.patient_id))
+        # Per-scan results, restored from checkpoints for patients processed in an earlier build.
+        results = {}
+        store = self._open_checkpoint_store() if self._use_checkpoints else None
+        completed = store.keys if store else set()
+        restored = {patient_id for _, patient_id in scan_index} & completed
+        for patient_id in restored:
+            results.update(store.load(patient_id))
+
+        pending = {}
+        for scan_id, patient_id in scan_index:
+            if patient_id not in completed:
+                pending.setdefault(patient_id, []).append(scan_id)
+        logger.info(
+            "Restored {} patients from checkpoints. Processing {} patients.".format(
+                len(restored), len(pending)
+            )
+        )
 
-                nodules = scan.cluster_annotations(verbose=False)
+        if self._workers > 1:
+            self._process_patients_in_parallel(pending, results, store)
+        else:
+            self._process_patients(scans, pending, results, store)
+
+        # Assemble the scans in query order, independent of the order in which they were processed.
+        self._annotation_records.clear()
+        self._small_nodule_records.clear()
+        for scan_id, _ in scan_index:
+            annotations, small_nodules = results[scan_id]
+            self._annotation_records.extend(annotations)
+            self._small_nodule_records.extend(small_nodules)
+
+        self._annotation_data = self._decode_semantic_features(self._annotation_records.to_frame())
+        self._small_nodule_data = self._small_nodule_records.to_frame()
+
+    def _open_checkpoint_store(self) -> CheckpointStore:
+        """Opens the checkpoint store, invalidated when the pylidc database, the configuration
+        or the version of the checkpointed rows change."""
+        return CheckpointStore(
+            folder=self._checkpoint_folder,
+            fingerprint=fingerprint(
+                pl._dbpath,
+                PYLIDC_CONFIG,
+                self._non_nodule_cases_filepath,
+                version=CHECKPOINT_VERSION,
+            ),
+        )
 
-                if len(nodules) == 0:
-                    self._create_small_nodule_annotation(scan)
-                else:
-                    self._create_nodule_annotations(scan, nodules)
+    def _process_patients(self, scans, pending: dict, results: dict, store=None) -> None:
+        """Processes the scans for the pending patients serially, checkpointing each patient.
+
+        Args:
+            scans (Query): The scans for the build.
+            pending (dict): Mapping of patient id to the ids of the patient's scans.
+            results (dict): Mapping of scan id to scan results, updated in place.
+            store (CheckpointStore): Optional store in which each patient's results are saved.
+        """
+        scans = {scan.id: scan for scan in scans if scan.patient_id in pending}
+
+        with tqdm(total=len(scans)) as pbar:
+            # Process clustered annotations by patient
+            for patient_id, scan_ids in pending.items():
+
+                pbar.set_description("Processing patient {}".format(patient_id))
+                logger.debug("Processing patient {}".format(patient_id))
+
+                patient_results = {}
+                for scan_id in scan_ids:
+                    patient_results[scan_id] = self._process_scan(scans[scan_id])
+                    pbar.update(1)
+
+                results.update(patient_results)
+                if store is not None:
+                    store.save(patient_id, patient_results)
+
+    def _process_patients_in_parallel(self, pending: dict, results: dict, store=None) -> None:
+        """Distributes the pending patients across a process pool.
+
+        Patients are split into chunks, each processed by a worker with its own database session.
+        Each patient is checkpointed by this process as soon as its chunk completes. Workers
+        log through a queue to a listener in this process, which alone writes the log file.
+
+        Args:
+            pending (dict): Mapping of patient id to the ids of the patient's scans.
+            results (dict): Mapping of scan id to scan results, updated in place.
+            store (CheckpointStore): Optional store in which each patient's results are saved.
+        """
+        patient_ids = list(pending)
+        n_chunks = min(len(patient_ids), self._workers * CHUNKS_PER_WORKER)
+        chunks = (
+            [list(chunk) for chunk in np.array_split(patient_ids, n_chunks)] if n_chunks else []
+        )
 
-                pbar.update(1)
+        with tqdm(total=sum(len(scan_ids) for scan_ids in pending.values())) as pbar:
+            pbar.set_description("Processing patients with {} workers".format(self._workers))
+            with queue_logging() as log_queue, ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=init_worker,
+                initargs=(log_queue, config_cache(), logging.getLogger().getEffectiveLevel()),
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        _process_scan_chunk,
+                        [scan_id for patient_id in chunk for scan_id in pending[patient_id]],
+                        self._non_nodule_cases,
+                    ): chunk
+                    for chunk in chunks
+                }
+                for future in as_completed(futures):
+                    chunk_results = future.result()
+                    results.update(chunk_results)
+                    for patient_id in futures[future]:
+                        scan_ids = pending[patient_id]
+                        if store is not None:
+                            store.save(
+                                patient_id,
+                                {scan_id: chunk_results[scan_id] for scan_id in scan_ids},
+                            )
+                        pbar.update(len(scan_ids))
+
+    @timed()
+    def _process_scan(self, scan: pl.Scan) -> Tuple[dict, dict]:
+        """Clusters the annotations for a scan and returns its annotation and small nodule rows."""
+        self._annotation_records.clear()
+        self._small_nodule_records.clear()
+
+        nodules = cluster_annotations(scan)
+
+        if len(nodules) == 0:
+            self._create_small_nodule_annotation(scan)
+        else:
+            self._create_nodule_annotations(scan, nodules)
 
-        logger.debug("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        return self._annotation_records.to_dict(), self._small_nodule_records.to_dict()
 
+    @timed()
     def _create_small_nodule_annotation(self, scan: pl.Scan) -> None:
         """Creates an annotation for a nodule designated to be less than 3mm in diameter."""
 
-        logger.debug("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
         features = SemanticFeatures()
-        df = pd.DataFrame(index=[], columns=ANNOTATION_COLUMNS)
-        df["patient_id"] = [scan.patient_id]
-        df["scan_id"] = [scan.id]
-        df["nodule_classification"] = ["small nodule"]
-        df["nodule_id"] = [scan.patient_id + "-" + str(0)]
-        df["malignancy"] = [1]
-        df["Malignancy"] = [str(1) + "-" + features.Malignancy(1)]
-        df["diameter"] = ["<3mm"]
-        df["diagnosis"] = ["Benign"]
-
-        self._small_nodule_data = pd.concat(
-            [self._small_nodule_data, df], axis=0, ignore_index=True
+        self._small_nodule_records.append(
+            {
+                "patient_id": scan.patient_id,
+                "scan_id": scan.id,
+                "nodule_classification": "small nodule",
+                "nodule_id": scan.patient_id + "-" + str(0),
+                "malignancy": 1,
+                "Malignancy": str(1) + "-" + features.Malignancy(1),
+                "diameter": "<3mm",
+                "diagnosis": "Benign",
+            }
         )
 
-        logger.debug("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
+    @timed()
     def _create_nodule_annotations(self, scan: pl.Scan, nodules: list) -> None:
         """Creates annotations for each nodule"""
 
-        logger.debug("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
-        features = SemanticFeatures()
-
         for nodule_no, nodule in enumerate(nodules, start=1):
             nodule_id = scan.patient_id + "_" + str(nodule_no)
 
@@ -182,61 +464,37 @@ class LIDCData:
 
                 classification, diagnosis = self._get_nodule_designation(annotation)
 
-                df = pd.DataFrame(columns=ANNOTATION_COLUMNS)
-                df["patient_id"] = [scan.patient_id]
-                df["scan_id"] = [scan.id]
-                df["nodule_classification"] = [classification]
-                df["nodule_id"] = [nodule_id]
-                df["annotation_no"] = [annotation_no]
-                df["annotation_id"] = [annotation.id]
-                df["n_readers"] = [len(nodule)]
-                df["diameter"] = [annotation.diameter]
-                df["volume"] = [annotation.volume]
-                df["surface_area"] = [annotation.surface_area]
-                df["diagnosis"] = [diagnosis]
-                df["slice_thickness"] = [annotation.scan.slice_thickness]
-                df["slice_spacing"] = [annotation.scan.slice_spacing]
-                df["pixel_spacing"] = [annotation.scan.pixel_spacing]
-
-                df["Subtlety"] = [
-                    str(annotation.subtlety) + "-" + features.Subtlety(annotation.subtlety)
-                ]
-
-                df["InternalStructure"] = [
-                    str(annotation.internalStructure)
-                    + "-"
-                    + features.InternalStructure(annotation.internalStructure)
-                ]
-                df["Calcification"] = [
-                    str(annotation.calcification)
-                    + "-"
-                    + features.Calcification(annotation.calcification)
-                ]
-                df["Sphericity"] = [
-                    str(annotation.sphericity) + "-" + features.Sphericity(annotation.sphericity)
-                ]
-                df["Margin"] = [str(annotation.margin) + "-" + features.Margin(annotation.margin)]
-                df["Lobulation"] = [
-                    str(annotation.lobulation) + "-" + features.Lobulation(annotation.lobulation)
-                ]
-                df["Spiculation"] = [
-                    str(annotation.spiculation) + "-" + features.Spiculation(annotation.spiculation)
-                ]
-                df["Texture"] = [
-                    str(annotation.texture) + "-" + features.Texture(annotation.texture)
-                ]
-                df["Malignancy"] = [
-                    str(annotation.malignancy) + "-" + features.Malignancy(annotation.malignancy)
-                ]
+                row = {
+                    "patient_id": scan.patient_id,
+                    "scan_id": scan.id,
+                    "nodule_classification": classification,
+                    "nodule_id": nodule_id,
+                    "annotation_no": annotation_no,
+                    "annotation_id": annotation.id,
+                    "n_readers": len(nodule),
+                    "diameter": annotation.diameter,
+                    "volume": annotation.volume,
+                    "surface_area": annotation.surface_area,
+                    "diagnosis": diagnosis,
+                    "slice_thickness": annotation.scan.slice_thickness,
+                    "slice_spacing": annotation.scan.slice_spacing,
+                    "pixel_spacing": annotation.scan.pixel_spacing,
+                }
 
                 for name, value in zip(FEATURE_COLUMNS, annotation.feature_vals()):
-                    df[name] = [value]
+                    row[name] = value
 
-                self._annotation_data = pd.concat(
-                    [self._annotation_data, df], axis=0, ignore_index=True
-                )
+                self._annotation_records.append(row)
 
-        logger.debug("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+    @timed()
+    def _decode_semantic_features(self, annotation_data: pd.DataFrame) -> pd.DataFrame:
+        """Adds the score-prefixed semantic labels, e.g. '3-Indeterminate', for each feature."""
+        features = SemanticFeatures()
+        for feature, semantic_feature in zip(FEATURE_COLUMNS, SEMANTIC_FEATURE_COLUMNS):
+            annotation_data[semantic_feature] = features.categorical(
+                feature, annotation_data[feature], with_score=True
+            )
+        return annotation_data
 
     def _get_nodule_designation(self, annotation: pl.Annotation) -> Tuple[str, str]:
         """Returns the nodule classification and diagnosis"""
@@ -249,10 +507,8 @@ class LIDCData:
 
         return classification, diagnosis
 
+    @timed()
     def _build_nodule_data(self) -> None:
-
-        logger.debug("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
         self._nodule_data = self._extract_nodule_data(
             self._annotation_data[self._annotation_data["nodule_classification"] == "nodule"]
         )
@@ -260,253 +516,311 @@ class LIDCData:
             self._annotation_data[self._annotation_data["nodule_classification"] == "non_nodule"]
         )
 
-        logger.debug("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
+    @timed()
     def _extract_nodule_data(self, annotation_data: pd.DataFrame) -> pd.DataFrame:
         """Extracts and aggregates nodule and non-nodule data from the annotation data frame."""
 
-        logger.debug("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        groups = annotation_data.groupby(NODULE_KEYS, observed=True)
+        codes = groups.ngroup().to_numpy()
+
+        nodule_data = groups.agg(
+            {
+                column: aggregation
+                for column, aggregation in NODULE_AGGREGATIONS.items()
+                if aggregation in ("count", "mean")
+            }
+        )
+        for column, aggregation in NODULE_AGGREGATIONS.items():
+            if aggregation == "ceil_median":
+                nodule_data[column] = group_ceil_median(
+                    codes, annotation_data[column].to_numpy(), groups.ngroups
+                )
+            elif aggregation == "mode":
+                nodule_data[column] = group_mode(
+                    codes, annotation_data[column].to_numpy(), groups.ngroups
+                )
 
         nodule_data = (
-            annotation_data.groupby(["patient_id", "scan_id", "nodule_id", "nodule_classification"])
-            .agg(
-                {
-                    "annotation_no": "count",
-                    "subtlety": lambda x: math.ceil(np.median(x)),
-                    "internalStructure": lambda x: x.value_counts().index[0],
-                    "calcification": lambda x: x.value_counts().index[0],
-                    "sphericity": lambda x: x.value_counts().index[0],
-                    "margin": lambda x: math.ceil(np.median(x)),
-                    "lobulation": lambda x: math.ceil(np.median(x)),
-                    "spiculation": lambda x: math.ceil(np.median(x)),
-                    "texture": lambda x: x.value_counts().index[0],
-                    "malignancy": lambda x: math.ceil(np.median(x)),
-                    "diameter": "mean",
-                    "volume": "mean",
-                    "surface_area": "mean",
-                    "diagnosis": lambda x: x.value_counts().index[0],
-                }
-            )
+            nodule_data[list(NODULE_AGGREGATIONS)]
             .rename(columns={"annotation_no": "n_readers"})
             .reset_index()
         )
         features = SemanticFeatures()
-        nodule_data["Subtlety"] = [features.Subtlety(x) for x in nodule_data["subtlety"]]
-        nodule_data["InternalStructure"] = [
-            features.InternalStructure(x) for x in nodule_data["internalStructure"]
-        ]
-
-        nodule_data["Calcification"] = [
-            features.Calcification(x) for x in nodule_data["calcification"]
-        ]
+        for feature, semantic_feature in zip(FEATURE_COLUMNS, SEMANTIC_FEATURE_COLUMNS):
+            nodule_data[semantic_feature] = features.categorical(feature, nodule_data[feature])
 
-        nodule_data["Sphericity"] = [features.Sphericity(x) for x in nodule_data["sphericity"]]
-        nodule_data["Margin"] = [features.Margin(x) for x in nodule_data["margin"]]
-        nodule_data["Lobulation"] = [features.Lobulation(x) for x in nodule_data["lobulation"]]
-        nodule_data["Spiculation"] = [features.Spiculation(x) for x in nodule_data["spiculation"]]
-        nodule_data["Texture"] = [features.Texture(x) for x in nodule_data["texture"]]
-        nodule_data["Malignancy"] = [features.Malignancy(x) for x in nodule_data["malignancy"]]
-
-        logger.debug("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
-
-        return nodule_data
+        return compact(nodule_data)
 
+    @timed()
     def _build_case_data(self) -> None:
-        pass
+        """Rolls the nodule tables up to one row per patient, with the patient's DICOM file stats."""
+
+        # Nodules of any size, each diagnosed benign or malignant.
+        diagnoses = pd.concat(
+            [
+                self._small_nodule_data[["patient_id", "diagnosis"]],
+                self._nodule_data[["patient_id", "diagnosis"]],
+            ]
+        ).astype(str)
+        diagnosis_counts = (
+            diagnoses.groupby(["patient_id", "diagnosis"], observed=True)
+            .size()
+            .unstack()
+            .reindex(columns=["Benign", "Malignant"])
+            .rename(columns={"Benign": "n_nodules_benign", "Malignant": "n_nodules_malignant"})
+        )
+        counts = pd.concat(
+            [
+                self._small_nodule_data.groupby("patient_id", observed=True)
+                .size()
+                .rename("n_nodules_lt_3mm"),
+                self._nodule_data.groupby("patient_id", observed=True)
+                .size()
+                .rename("n_nodules_ge_3mm"),
+                self._non_nodule_data.groupby("patient_id", observed=True)
+                .size()
+                .rename("n_non_nodules_ge_3mm"),
+                diagnosis_counts,
+            ],
+            axis=1,
+        )
+        case_data = counts.fillna(0).astype(np.int64).sort_index()
+        case_data.index = case_data.index.astype(str).rename("patient_id")
+        case_data["total_nodules"] = case_data["n_nodules_lt_3mm"] + case_data["n_nodules_ge_3mm"]
+
+        raw_folder = self._config.raw_lidc_data_folder
+        file_stats = DirectoryStats(
+            folder=raw_folder,
+            cache_filepath=os.path.join(self._config.interim_data_folder, "file_stats.json"),
+            extension=".dcm",
+        ).compute(list(case_data.index))
+        case_data["filepath"] = [os.path.join(raw_folder, name) for name in file_stats["name"]]
+        case_data["n_images"] = file_stats["n_files"].to_numpy()
+        case_data["total_file_size"] = file_stats["total_size"].to_numpy()
+
+        self._case_data = compact(case_data.reset_index()[CASE_COLUMNS])
 
     def _get_scans(self) -> list:
-        if len(self._included_patients) > 0 and len(self._excluded_patients) > 0:
-            scans = pl.query(pl.Scan).filter(
-                pl.Scan.patient_id.not_in(self._excluded_patients),
-                pl.Scan.patient_id.in_(self._included_patients),
-            )
-        elif len(self._included_patients) > 0:
-            scans = pl.query(pl.Scan).filter(pl.Scan.patient_id.in_(self._included_patients))
-        elif len(self._excluded_patients) > 0:
-            scans = pl.query(pl.Scan).filter(pl.Scan.patient_id.not_in(self._excluded_patients))
-        else:
-            scans = pl.query(pl.Scan)
-        return scans
+        return query_scans(self._included_patients, self._excluded_patients)
 
+    @timed()
     def _save_data(self) -> None:
-        # self._write(self._case_data, self._cases_filepath)
-        self._write(self._annotation_data, self._annotations_filepath)
-        self._write(self._nodule_data, self._nodules_filepath)
-        self._write(self._small_nodule_data, self._small_nodules_filepath)
-        self._write(self._non_nodule_data, self._non_nodules_filepath)
+        """Saves each table together with its index on patient_id, scan_id and nodule_id, and
+        the summary cubes of the annotation and nodule tables from which LIDCExplorer answers."""
+        tables = [
+            (self._case_data, self._cases_filepath, CASE_SCHEMA),
+            (self._annotation_data, self._annotations_filepath, ANNOTATION_SCHEMA),
+            (self._nodule_data, self._nodules_filepath, NODULE_SCHEMA),
+            (self._small_nodule_data, self._small_nodules_filepath, SMALL_NODULE_SCHEMA),
+            (self._non_nodule_data, self._non_nodules_filepath, NODULE_SCHEMA),
+        ]
+        for data, filepath, schema in tables:
+            self._write(data, filepath, schema)
+            self._write(TableIndex.build(data).to_frame(), index_filepath(filepath))
+        for data, filepath in [
+            (self._annotation_data, self._annotations_filepath),
+            (self._nodule_data, self._nodules_filepath),
+        ]:
+            SummaryCube.build(data, fingerprint(filepath)).save(cube_filepath(filepath))
 
     def _read(self, filepath: str) -> pd.DataFrame:
         """Loads existing metadata if it exists."""
         try:
-            return pd.read_csv(filepath, engine="pyarrow")
+            return compact(self._storage.read(filepath))
         except FileNotFoundError as e:
             logger.error("File {} does not exist.\n{}".format(filepath, e))
             raise
 
-    def _write(self, data: pd.DataFrame, filepath: str) -> None:
+    def _write(self, data: pd.DataFrame, filepath: str, schema: pa.Schema = None) -> None:
         """Saves the metadata to the filepath designated at instantiation."""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        data.to_csv(filepath, header=True, index=False)
+        self._storage.write(data, filepath, schema)
 
     def _exists(self, filepath) -> bool:
         """Returns True if metadata already exists, either in memory or on file."""
         return os.path.exists(filepath)
 
 
+# ------------------------------------------------------------------------------------------------ #
+def query_scans(included_patients: list = [], excluded_patients: dict = {}, session=None):
+    """Returns the query for the scans of the included patients, less the excluded patients.
+
+    Args:
+        included_patients (list): Patient ids to include. If empty, all patients are included.
+        excluded_patients (dict): Patient ids to exclude, mapped to the reason for exclusion.
+        session (Session): Database session for the query. Defaults to the pylidc session.
+    """
+    query = pl.query(pl.Scan) if session is None else session.query(pl.Scan)
+    if len(included_patients) > 0 and len(excluded_patients) > 0:
+        scans = query.filter(
+            pl.Scan.patient_id.not_in(excluded_patients),
+            pl.Scan.patient_id.in_(included_patients),
+        )
+    elif len(included_patients) > 0:
+        scans = query.filter(pl.Scan.patient_id.in_(included_patients))
+    elif len(excluded_patients) > 0:
+        scans = query.filter(pl.Scan.patient_id.not_in(excluded_patients))
+    else:
+        scans = query
+    return scans
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                   PARALLEL WORKERS                                               #
+# ------------------------------------------------------------------------------------------------ #
+def init_worker(log_queue=None, config: dict = None, log_level: int = logging.WARNING) -> None:
+    """Opens a database session private to the worker process, logging through the log queue.
+
+    The initializer of the process pools of LIDCData and ROIExtractor. The session inherited
+    from the parent process must not be shared across processes. The configuration parsed by
+    the parent process is installed rather than parsed again.
+
+    Args:
+        log_queue: The queue yielded by queue_logging in the parent process.
+        config (dict): The configuration cache of the parent process.
+        log_level (int): The effective level of the parent process's root logger.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    global _worker_session
+    if log_queue is not None:
+        configure_worker_logging(log_queue, log_level)
+    if config is not None:
+        install_config_cache(config)
+    engine = create_engine("sqlite:///" + pl._dbpath)
+    _worker_session = sessionmaker(bind=engine)()
+
+
+def worker_session():
+    """Returns the database session of the worker process, opened by init_worker."""
+    return _worker_session
+
+
+def _process_scan_chunk(scan_ids: list, non_nodule_cases: frozenset) -> dict:
+    """Processes a chunk of scans in a worker process.
+
+    Args:
+        scan_ids (list): The ids of the scans to process.
+        non_nodule_cases (frozenset): Patient ids of the non-nodule cases.
+
+    Returns:
+        Dictionary mapping scan id to the scan's annotation and small nodule column buffers.
+    """
+    data = LIDCData(timing=False)
+    data._non_nodule_cases = non_nodule_cases
+
+    results = {}
+    for scan in _worker_session.query(pl.Scan).filter(pl.Scan.id.in_(scan_ids)):
+        logger.debug("Processing patient {}".format(scan.patient_id))
+        results[scan.id] = data._process_scan(scan)
+    return results
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                  SEMANTIC FEATURES                                               #
 # ------------------------------------------------------------------------------------------------ #
 class SemanticFeatures:
+    """Decodes semantic feature scores into their labels.
+
+    Each feature method decodes a single score. The decode and categorical methods decode
+    a whole column of scores with a single array lookup.
+    """
+
+    _labels = {
+        feature: np.array(labels, dtype=object) for feature, labels in SEMANTIC_LABELS.items()
+    }
+    # Labels prefixed with their score, e.g. "3-Indeterminate", as used in the annotation data.
+    _coded_labels = {
+        feature: np.array(
+            [str(score) + "-" + label for score, label in enumerate(labels)], dtype=object
+        )
+        for feature, labels in SEMANTIC_LABELS.items()
+    }
+
+    def decode(self, feature: str, scores, with_score: bool = False) -> np.ndarray:
+        """Decodes an array of scores into labels.
+
+        Args:
+            feature (str): The feature name, e.g. 'subtlety'. See SEMANTIC_LABELS.
+            scores (array-like): Integer scores.
+            with_score (bool): If True, labels are prefixed with the score, e.g. '3-Indeterminate'.
+
+        Raises:
+            ValueError: If any score is out of bounds. All offending rows are reported.
+        """
+        codes = self._validate(feature, scores)
+        labels = self._coded_labels[feature] if with_score else self._labels[feature]
+        return labels.take(codes)
+
+    def categorical(self, feature: str, scores, with_score: bool = False) -> pd.Categorical:
+        """Decodes an array of scores into a categorical ordered by score.
+
+        Args:
+            feature (str): The feature name, e.g. 'subtlety'. See SEMANTIC_LABELS.
+            scores (array-like): Integer scores.
+            with_score (bool): If True, labels are prefixed with the score, e.g. '3-Indeterminate'.
+
+        Raises:
+            ValueError: If any score is out of bounds. All offending rows are reported.
+        """
+        codes = self._validate(feature, scores)
+        labels = self._coded_labels[feature] if with_score else SEMANTIC_LABELS[feature]
+        return pd.Categorical.from_codes(codes, categories=list(labels), ordered=True)
+
     def Subtlety(self, s: int):
         """Semantic interpretation of `subtlety` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-
-            assert s in range(1, 6), "Subtlety score {} out of bounds.".format(str(s))
-            if s == 1:
-                return "Extremely Subtle"
-            elif s == 2:
-                return "Moderately Subtle"
-            elif s == 3:
-                return "Fairly Subtle"
-            elif s == 4:
-                return "Moderately Obvious"
-            elif s == 5:
-                return "Obvious"
+        return self._label("subtlety", s)
 
     def InternalStructure(self, s: int):
         """Semantic interpretation of `internalStructure` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 5), "Internal structure score out of bounds."
-            if s == 1:
-                return "Soft Tissue"
-            elif s == 2:
-                return "Fluid"
-            elif s == 3:
-                return "Fat"
-            elif s == 4:
-                return "Air"
+        return self._label("internalStructure", s)
 
     def Calcification(self, s: int):
         """Semantic interpretation of `calcification` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 7), "Calcification score out of bounds."
-            if s == 1:
-                return "Popcorn"
-            elif s == 2:
-                return "Laminated"
-            elif s == 3:
-                return "Solid"
-            elif s == 4:
-                return "Non-central"
-            elif s == 5:
-                return "Central"
-            elif s == 6:
-                return "Absent"
+        return self._label("calcification", s)
 
     def Sphericity(self, s: int):
         """Semantic interpretation of `sphericity` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 6), "Sphericity score out of bounds."
-            if s == 1:
-                return "Linear"
-            elif s == 2:
-                return "Ovoid/Linear"
-            elif s == 3:
-                return "Ovoid"
-            elif s == 4:
-                return "Ovoid/Round"
-            elif s == 5:
-                return "Round"
+        return self._label("sphericity", s)
 
     def Margin(self, s: int):
         """Semantic interpretation of `margin` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 6), "Margin score out of bounds."
-            if s == 1:
-                return "Poorly Defined"
-            elif s == 2:
-                return "Near Poorly Defined"
-            elif s == 3:
-                return "Medium Margin"
-            elif s == 4:
-                return "Near Sharp"
-            elif s == 5:
-                return "Sharp"
+        return self._label("margin", s)
 
     def Lobulation(self, s: int):
         """Semantic interpretation of `lobulation` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 6), "Lobulation score out of bounds."
-            if s == 1:
-                return "No Lobulation"
-            elif s == 2:
-                return "Nearly No Lobulation"
-            elif s == 3:
-                return "Medium Lobulation"
-            elif s == 4:
-                return "Near Marked Lobulation"
-            elif s == 5:
-                return "Marked Lobulation"
+        return self._label("lobulation", s)
 
     def Spiculation(self, s: int):
         """Semantic interpretation of `spiculation` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 6), "Spiculation score out of bounds."
-            if s == 1:
-                return "No Spiculation"
-            elif s == 2:
-                return "Nearly No Spiculation"
-            elif s == 3:
-                return "Medium Spiculation"
-            elif s == 4:
-                return "Near Marked Spiculation"
-            elif s == 5:
-                return "Marked Spiculation"
+        return self._label("spiculation", s)
 
     def Texture(self, s: int):
         """Semantic interpretation of `texture` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 6), "Texture score out of bounds."
-            if s == 1:
-                return "Non-Solid/GGO"
-            elif s == 2:
-                return "Non-Solid/Mixed"
-            elif s == 3:
-                return "Part Solid/Mixed"
-            elif s == 4:
-                return "Solid/Mixed"
-            elif s == 5:
-                return "Solid"
+        return self._label("texture", s)
 
     def Malignancy(self, s: int):
         """Semantic interpretation of `malignancy` value as string."""
-        if s == 0:
-            return "NA"
-        else:
-            assert s in range(1, 6), "Malignancy score out of bounds."
-            if s == 1:
-                return "Highly Unlikely"
-            elif s == 2:
-                return "Moderately Unlikely"
-            elif s == 3:
-                return "Indeterminate"
-            elif s == 4:
-                return "Moderately Suspicious"
-            elif s == 5:
-                return "Highly Suspicious"
+        return self._label("malignancy", s)
+
+    def _label(self, feature: str, s: int) -> str:
+        labels = SEMANTIC_LABELS[feature]
+        assert s in range(len(labels)), "{} score {} out of bounds.".format(feature, str(s))
+        return labels[int(s)]
+
+    def _validate(self, feature: str, scores) -> np.ndarray:
+        """Returns the scores as integer codes, raising if any score is out of bounds."""
+        values = pd.to_numeric(pd.Series(scores, copy=False), errors="coerce").to_numpy(
+            dtype=float, na_value=np.nan
+        )
+        codes = np.nan_to_num(values, nan=-1).astype(np.int64)
+        invalid = (codes != values) | (codes < 0) | (codes >= len(SEMANTIC_LABELS[feature]))
+        if invalid.any():
+            rows = np.flatnonzero(invalid)
+            raise ValueError(
+                "{} scores out of bounds at rows {}: {}".format(
+                    feature, rows.tolist(), np.asarray(scores, dtype=object)[rows].tolist()
+                )
+            )
+        return codes
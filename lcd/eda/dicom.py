@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /dicom.py                                                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:06:28 pm                                              #
+# Modified   : Saturday October 17th 2026 10:06:28 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import time
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+
+from lcd.utils.config import DataConfig
+from lcd.utils.imports import lazy_import
+
+# ------------------------------------------------------------------------------------------------ #
+pydicom = lazy_import("pydicom")
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+DICOM_INDEX_SCHEMA = pa.schema(
+    [
+        pa.field("filepath", pa.string()),
+        pa.field("patient_id", pa.string()),
+        pa.field("study_instance_uid", pa.string()),
+        pa.field("series_instance_uid", pa.string()),
+        pa.field("instance_number", pa.int64()),
+        pa.field("slice_location", pa.float64()),
+        pa.field("slice_thickness", pa.float64()),
+        pa.field("pixel_spacing", pa.float64()),
+        pa.field("file_size", pa.int64()),
+        pa.field("mtime_ns", pa.int64()),
+    ]
+)
+# Header tags read from each file. Reading stops before the pixel data.
+DICOM_TAGS = [
+    "PatientID",
+    "StudyInstanceUID",
+    "SeriesInstanceUID",
+    "InstanceNumber",
+    "ImagePositionPatient",
+    "SliceThickness",
+    "PixelSpacing",
+]
+
+
+# ------------------------------------------------------------------------------------------------ #
+class DicomIndex:
+    """Indexes the headers of the DICOM files under the raw LIDC-IDRI folder.
+
+    The index holds one row per file with its patient, study and series, instance number,
+    slice location (the z coordinate of ImagePositionPatient), slice thickness, pixel spacing,
+    size and modification time. It is stored as Parquet. Updates read the headers only of
+    files added or modified since the last update, in a thread pool and without pixel data.
+
+    Args:
+        folder (str): Folder searched for .dcm files. Defaults to the raw LIDC data folder.
+        index_filepath (str): Parquet file holding the index. Defaults to 'dicom_index.parquet'
+            in the interim data folder.
+        workers (int): Number of threads reading headers.
+    """
+
+    def __init__(self, folder: str = None, index_filepath: str = None, workers: int = 8) -> None:
+        config = DataConfig().settings
+        self._folder = folder or config.raw_lidc_data_folder
+        self._index_filepath = index_filepath or os.path.join(
+            config.interim_data_folder, "dicom_index.parquet"
+        )
+        self._workers = workers
+        self._index = None
+
+    @property
+    def index(self) -> pd.DataFrame:
+        """Returns the index, read from file on first access."""
+        if self._index is None:
+            self._index = self._read()
+        return self._index
+
+    def update(self) -> pd.DataFrame:
+        """Brings the index up to date with the files in the folder and saves it.
+
+        Returns:
+            The updated index.
+        """
+        start = time.perf_counter()
+        files = self._list_files()
+        existing = self._read()
+
+        # Headers are retained for files whose size and modification time are unchanged.
+        retained = existing.merge(
+            files, on=["filepath", "file_size", "mtime_ns"], how="inner", validate="1:1"
+        )
+        changed = files[~files["filepath"].isin(retained["filepath"])]
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            headers = list(executor.map(self._read_header, changed["filepath"]))
+        read = pd.concat(
+            [changed.reset_index(drop=True), pd.DataFrame(headers, columns=DICOM_TAGS)], axis=1
+        )
+        read = self._rename(read)
+
+        self._index = pd.concat([retained, read], ignore_index=True)[
+            DICOM_INDEX_SCHEMA.names
+        ].sort_values("filepath", ignore_index=True)
+        self._write(self._index)
+
+        logger.info(
+            "Indexed {} DICOM files: read {} headers, removed {} files, in {:.2f} seconds.".format(
+                len(self._index),
+                len(read),
+                len(existing) - len(retained),
+                time.perf_counter() - start,
+            )
+        )
+        return self._index
+
+    def series_files(self, series_instance_uid: str, study_instance_uid: str = None) -> list:
+        """Returns the filepaths of a series, ordered by slice location.
+
+        Files duplicating the slice location of another are dropped, keeping the file with the
+        lesser instance number, as in pl.Scan.load_all_dicom_images.
+
+        Args:
+            series_instance_uid (str): The series, e.g. pl.Scan.series_instance_uid.
+            study_instance_uid (str): Optionally, the study, e.g. pl.Scan.study_instance_uid.
+        """
+        index = self.index
+        mask = index["series_instance_uid"] == series_instance_uid
+        if study_instance_uid is not None:
+            mask &= index["study_instance_uid"] == study_instance_uid
+        files = (
+            index[mask]
+            .sort_values(["slice_location", "instance_number"])
+            .drop_duplicates("slice_location")
+        )
+        return files["filepath"].tolist()
+
+    def scan_files(self, scan) -> list:
+        """Returns the filepaths of a pl.Scan's images, ordered by slice location."""
+        return self.series_files(scan.series_instance_uid, scan.study_instance_uid)
+
+    def _list_files(self) -> pd.DataFrame:
+        """Lists the .dcm files in the folder, walking each subfolder in a thread."""
+        top = list(os.scandir(self._folder)) if os.path.isdir(self._folder) else []
+        folders = [entry.path for entry in top if entry.is_dir(follow_symlinks=False)]
+        rows = [self._file_row(entry) for entry in top if self._is_dicom(entry)]
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            for folder_rows in executor.map(self._walk, folders):
+                rows.extend(folder_rows)
+        return pd.DataFrame(rows, columns=["filepath", "file_size", "mtime_ns"])
+
+    def _walk(self, folder: str) -> list:
+        rows = []
+        pending = [folder]
+        while pending:
+            for entry in os.scandir(pending.pop()):
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif self._is_dicom(entry):
+                    rows.append(self._file_row(entry))
+        return rows
+
+    def _is_dicom(self, entry: os.DirEntry) -> bool:
+        return entry.name.endswith(".dcm") and not entry.name.startswith(".")
+
+    def _file_row(self, entry: os.DirEntry) -> tuple:
+        stat = entry.stat()
+        return entry.path, stat.st_size, stat.st_mtime_ns
+
+    def _read_header(self, filepath: str) -> tuple:
+        """Returns the values of DICOM_TAGS for a file. Tags absent from the file are None."""
+        try:
+            ds = pydicom.dcmread(filepath, stop_before_pixels=True, specific_tags=DICOM_TAGS)
+        except Exception as e:
+            logger.warning("Unable to read DICOM header of {}.\n{}".format(filepath, e))
+            return (None,) * len(DICOM_TAGS)
+        return tuple(ds.get(tag) for tag in DICOM_TAGS)
+
+    def _rename(self, read: pd.DataFrame) -> pd.DataFrame:
+        """Converts the header values to the columns and types of the index."""
+
+        def to_float(value):
+            return None if value is None else float(value)
+
+        return pd.DataFrame(
+            {
+                "filepath": read["filepath"],
+                "patient_id": read["PatientID"].map(lambda v: None if v is None else str(v)),
+                "study_instance_uid": read["StudyInstanceUID"].map(
+                    lambda v: None if v is None else str(v).strip()
+                ),
+                "series_instance_uid": read["SeriesInstanceUID"].map(
+                    lambda v: None if v is None else str(v).strip()
+                ),
+                "instance_number": read["InstanceNumber"].map(
+                    lambda v: None if v is None else int(v)
+                ),
+                "slice_location": read["ImagePositionPatient"].map(
+                    lambda v: None if v is None else float(v[-1])
+                ),
+                "slice_thickness": read["SliceThickness"].map(to_float),
+                "pixel_spacing": read["PixelSpacing"].map(
+                    lambda v: None if v is None else float(v[0])
+                ),
+                "file_size": read["file_size"],
+                "mtime_ns": read["mtime_ns"],
+            }
+        )
+
+    def _read(self) -> pd.DataFrame:
+        if not os.path.exists(self._index_filepath):
+            return pa.Table.from_pylist([], schema=DICOM_INDEX_SCHEMA).to_pandas()
+        return pq.read_table(self._index_filepath, memory_map=True).to_pandas()
+
+    def _write(self, index: pd.DataFrame) -> None:
+        os.makedirs(os.path.dirname(self._index_filepath) or ".", exist_ok=True)
+        table = pa.Table.from_pandas(index, schema=DICOM_INDEX_SCHEMA, preserve_index=False)
+        pq.write_table(table, self._index_filepath + ".tmp")
+        os.replace(self._index_filepath + ".tmp", self._index_filepath)
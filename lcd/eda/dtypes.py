@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /dtypes.py                                                                          #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:41 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:41 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import numpy as np
+import pandas as pd
+
+from lcd.eda import FEATURE_COLUMNS, SEMANTIC_FEATURE_COLUMNS
+
+# ------------------------------------------------------------------------------------------------ #
+# In-memory dtypes of the columns of the metadata tables. Labels and ids are categoricals, which
+# hold each distinct string once and a small integer code per row. Semantic feature labels are
+# categoricals ordered by score, as decoded by SemanticFeatures.categorical.
+CATEGORY = pd.CategoricalDtype()
+INT8 = np.dtype(np.int8)
+INT32 = np.dtype(np.int32)
+COLUMN_DTYPES = {
+    "patient_id": CATEGORY,
+    "scan_id": INT32,
+    "nodule_classification": CATEGORY,
+    "nodule_id": CATEGORY,
+    "annotation_no": INT8,
+    "annotation_id": INT32,
+    "n_readers": INT8,
+    **{column: INT8 for column in FEATURE_COLUMNS},
+    **{column: CATEGORY for column in SEMANTIC_FEATURE_COLUMNS},
+    "diagnosis": CATEGORY,
+}
+MEMORY_REPORT_COLUMNS = ["column", "dtype", "bytes", "compact_dtype", "compact_bytes", "saving"]
+
+
+def table_dtypes(columns: list) -> dict:
+    """Returns the in-memory dtypes of those of the columns that have one."""
+    return {column: COLUMN_DTYPES[column] for column in columns if column in COLUMN_DTYPES}
+
+
+def compact(data: pd.DataFrame) -> pd.DataFrame:
+    """Returns the table with its columns converted to their in-memory dtypes.
+
+    Columns already categorical are retained, with their categories. Columns without an
+    in-memory dtype, such as the '<3mm' diameters of small nodules, are unchanged.
+    """
+    current = dict(zip(data.columns, data.dtypes))
+    dtypes = {
+        column: dtype
+        for column, dtype in table_dtypes(data.columns).items()
+        if not (dtype is CATEGORY and isinstance(current[column], pd.CategoricalDtype))
+        and current[column] != dtype
+    }
+    return data.astype(dtypes) if dtypes else data
+
+
+def expand(data: pd.DataFrame) -> pd.DataFrame:
+    """Returns the table as pandas holds it by default, with strings and 64-bit integers."""
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            values = values.astype(np.int64)
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
+
+
+def memory_report(data: pd.DataFrame) -> pd.DataFrame:
+    """Reports the memory held by each column of a table, by default and in-memory dtypes.
+
+    Args:
+        data (pd.DataFrame): The table, in either representation.
+
+    Returns:
+        DataFrame with a row per column and a final 'Total' row giving the dtype and bytes of the
+        column as held by default, its in-memory dtype and bytes, and the bytes saved.
+    """
+    default, compacted = expand(data), compact(data)
+    report = pd.DataFrame(
+        {
+            "column": list(data.columns),
+            "dtype": [str(dtype) for dtype in default.dtypes],
+            "bytes": default.memory_usage(index=False, deep=True).to_numpy(),
+            "compact_dtype": [str(dtype) for dtype in compacted.dtypes],
+            "compact_bytes": compacted.memory_usage(index=False, deep=True).to_numpy(),
+        }
+    )
+    total = {"column": "Total", "dtype": "", "compact_dtype": ""}
+    total.update(bytes=report["bytes"].sum(), compact_bytes=report["compact_bytes"].sum())
+    report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+    report["saving"] = report["bytes"] - report["compact_bytes"]
+    return report[MEMORY_REPORT_COLUMNS]
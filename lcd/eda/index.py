@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /index.py                                                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:58:03 pm                                              #
+# Modified   : Saturday October 17th 2026 10:58:03 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------------------------------------ #
+# Columns of the metadata tables that are indexed when present.
+INDEX_COLUMNS = ["patient_id", "scan_id", "nodule_id"]
+
+
+def index_filepath(filepath: str) -> str:
+    """Returns the filepath of the index persisted alongside a table."""
+    stem, extension = os.path.splitext(filepath)
+    return stem + "_index" + extension
+
+
+# ------------------------------------------------------------------------------------------------ #
+class TableIndex:
+    """Sorted secondary indexes from key values to the positions of the rows of a table.
+
+    For each indexed column, the values are held in sorted order alongside the positions of
+    their rows, so the rows for a value are found by binary search in O(log n) rather than by
+    a boolean mask over the whole column. Rows need not be contiguous.
+
+    Args:
+        positions (dict): Mapping of column name to a pair of arrays, the sorted values and
+            the row position of each value.
+    """
+
+    def __init__(self, positions: dict) -> None:
+        self._positions = positions
+
+    @property
+    def columns(self) -> list:
+        return list(self._positions)
+
+    @classmethod
+    def build(cls, data: pd.DataFrame, columns: list = INDEX_COLUMNS) -> "TableIndex":
+        """Indexes the columns of the table that are present among the given columns."""
+        positions = {}
+        for column in columns:
+            if column in data.columns:
+                values = data[column].astype(str).to_numpy(dtype=str)
+                order = np.argsort(values, kind="stable")
+                positions[column] = (values[order], order.astype(np.int64))
+        return cls(positions)
+
+    def rows(self, column: str, value) -> np.ndarray:
+        """Returns the positions of the rows in which the column equals the value, in order.
+
+        Args:
+            column (str): An indexed column.
+            value: The key, compared as a string, e.g. 'LIDC-IDRI-0001' or 1.
+        """
+        values, rows = self._positions[column]
+        start = np.searchsorted(values, str(value), side="left")
+        stop = np.searchsorted(values, str(value), side="right")
+        return rows[start:stop]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the indexes as a long table of column, value and row, for persistence."""
+        frames = [
+            pd.DataFrame({"column": column, "value": values, "row": rows})
+            for column, (values, rows) in self._positions.items()
+        ]
+        if not frames:
+            return pd.DataFrame({"column": [], "value": [], "row": np.empty(0, dtype=np.int64)})
+        return pd.concat(frames, ignore_index=True)
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> "TableIndex":
+        """Restores the indexes from the table returned by to_frame."""
+        positions = {}
+        for column, group in data.groupby("column", sort=False, observed=True):
+            positions[str(column)] = (
+                group["value"].astype(str).to_numpy(dtype=str),
+                group["row"].to_numpy(dtype=np.int64),
+            )
+        return cls(positions)
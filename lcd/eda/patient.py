@@ -15,9 +15,20 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
-import pylidc as pl
+from __future__ import annotations
+
+import time
+import logging
+import numpy as np
 from typing import Union
 
+from lcd.eda.cluster import cluster_annotations
+from lcd.eda.volume import VolumeStore
+from lcd.utils.imports import lazy_import
+
+# ------------------------------------------------------------------------------------------------ #
+pl = lazy_import("pylidc")
+logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------------------------ #
 
 
@@ -26,17 +37,63 @@ class Patient:
 
     Args:
         id (str): String of an integer between 1 and 1012, the number of patients in the LIDC database.
+        scan (pl.Scan): The patient's scan, if already loaded. See load_many.
 
     """
 
-    def __init__(self, id: str) -> None:
+    def __init__(self, id: str, scan: pl.Scan = None) -> None:
         self._pid = self._format_patient_id(id)
-        self._scan = pl.query(pl.Scan).filter(pl.Scan.patient_id == self._pid).first()
+        self._scan = scan or pl.query(pl.Scan).filter(pl.Scan.patient_id == self._pid).first()
         self._annotations = {}
-        self._clustered_annotations = None
         self._annotation_count = None
         self._nodule_count = None
 
+    @classmethod
+    def load_many(cls, ids: list) -> dict:
+        """Loads a cohort of patients with their scans, annotations and contours prefetched.
+
+        The scans are fetched with a single IN query, and their annotations and contours with
+        one further IN query each, regardless of the size of the cohort. As with Patient(id),
+        each patient is assigned their first scan. Patients without a scan are omitted.
+
+        Args:
+            ids (list): Patient ids, each a string of an integer between 1 and 1012.
+
+        Returns:
+            Dictionary of Patient objects keyed by formatted patient id, in the order given.
+        """
+        from sqlalchemy.orm import selectinload
+
+        start = time.perf_counter()
+        pids = list(dict.fromkeys(cls._format_patient_id(id) for id in ids))
+        scans = (
+            pl.query(pl.Scan)
+            .filter(pl.Scan.patient_id.in_(pids))
+            .options(selectinload(pl.Scan.annotations).selectinload(pl.Annotation.contours))
+            .order_by(pl.Scan.id)
+            .all()
+        )
+        first_scans = {}
+        for scan in scans:
+            first_scans.setdefault(scan.patient_id, scan)
+
+        patients = {
+            pid: cls(pid[len("LIDC-IDRI-") :], scan=first_scans[pid])
+            for pid in pids
+            if pid in first_scans
+        }
+        missing = [pid for pid in pids if pid not in first_scans]
+        if missing:
+            logger.warning("No scans found for patients {}.".format(missing))
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            "Loaded {} patients in {:.3f} seconds ({:.2f} ms per patient).".format(
+                len(patients), elapsed, 1000 * elapsed / max(len(patients), 1)
+            )
+        )
+        return patients
+
     @property
     def pid(self) -> str:
         return self._pid
@@ -63,19 +120,29 @@ class Patient:
 
         """
         if not self._annotations:
-            for i, annotation in enumerate(self._scan.cluster_annotations()):
+            for i, annotation in enumerate(cluster_annotations(self._scan)):
                 self._annotations[i + 1] = annotation
         if not nodule:
             return self._annotations
         else:
             return self._annotations[nodule]
 
+    def volume(self, bbox: tuple = None) -> np.ndarray:
+        """Returns the scan volume in Hounsfield units, or the sub-volume within the bounding box.
+
+        The volume is read from the VolumeStore, which converts the scan on first access.
+
+        Args:
+            bbox (tuple): Optional tuple of slices, e.g. as returned by pl.Annotation.bbox.
+        """
+        volume = VolumeStore().get(self._scan)
+        return volume if bbox is None else volume[bbox]
+
     def visualize(self) -> None:
         """Returns the CT Scan for the patient."""
-        if not self._clustered_annotations:
-            self._clustered_annotations = self._scan.cluster_annotations()
-        self._scan.visualize(annotation_groups=self._clustered_annotations)
+        self._scan.visualize(annotation_groups=list(self.annotations().values()))
 
-    def _format_patient_id(self, id) -> str:
+    @staticmethod
+    def _format_patient_id(id) -> str:
         """Returns a patient id in form of "LIDC-IDRI-dddd'"""
         return "LIDC-IDRI-" + id.zfill(4)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /roi.py                                                                             #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 08:05:12 pm                                              #
+# Modified   : Saturday October 17th 2026 08:05:12 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+from __future__ import annotations
+
+import os
+import time
+import logging
+import pandas as pd
+import numpy as np
+from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lcd.utils.config import DataConfig, PylidcConfig, config_cache
+from lcd.eda.cluster import cluster_annotations
+from lcd.eda.consensus import ConsensusEngine
+from lcd.eda.volume import VolumeStore
+from lcd.eda.data import query_scans, init_worker, worker_session, CHUNKS_PER_WORKER
+from lcd.utils.imports import lazy_import
+from lcd.utils.log_config import queue_logging
+
+# ------------------------------------------------------------------------------------------------ #
+pl = lazy_import("pylidc")
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+ROI_STATS_COLUMNS = ["scan_id", "patient_id", "n_nodules", "n_voxels", "seconds"]
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ROIExtractor:
+    """Extracts the region of interest around each nodule into the final images and masks folders.
+
+    Nodules are the annotation clusters from which LIDCData builds the nodule data. For each
+    nodule, the consensus mask of its annotations is computed at the configured confidence
+    level over the padded bounding box of the annotations by the ConsensusEngine. The CT volume
+    cropped to the same box is read from the VolumeStore and saved in Hounsfield units as int16
+    to '<roi_id>.npy' in the images folder, and the bit-packed mask to '<roi_id>.npz' in the
+    masks folder. See roi_id, load_image and load_mask.
+
+    Args:
+        included_patients (list): A list of patient_ids to use.
+        excluded_patients (dict): Dictionary containing the excluded patients and reason for exclusion.
+        workers (int): Number of worker processes across which scans are distributed. Default 1
+            processes the scans serially in the calling process.
+        overwrite (bool): If True, nodules already extracted are extracted again. Otherwise
+            they are skipped, and scans whose nodules are all extracted are not loaded.
+        confidence_level (float): Consensus fraction of the annotations that must include a
+            voxel. Defaults to the value in the pylidc configuration.
+        padding (int): Padding of the bounding box in voxels. Defaults to the value in the
+            pylidc configuration.
+        images_folder (str): Output folder for images. Defaults to the configured final images.
+        masks_folder (str): Output folder for masks. Defaults to the configured final masks.
+    """
+
+    def __init__(
+        self,
+        included_patients: list = [],
+        excluded_patients: dict = {},
+        workers: int = 1,
+        overwrite: bool = False,
+        confidence_level: float = None,
+        padding: int = None,
+        images_folder: str = None,
+        masks_folder: str = None,
+    ) -> None:
+        self._included_patients = included_patients
+        self._excluded_patients = excluded_patients
+        self._workers = workers
+        self._overwrite = overwrite
+        pylidc_config = PylidcConfig().settings
+        data_config = DataConfig().settings
+        self._confidence_level = (
+            pylidc_config.confidence_level if confidence_level is None else confidence_level
+        )
+        self._padding = pylidc_config.padding if padding is None else padding
+        self._images_folder = images_folder or data_config.final_images_folder
+        self._masks_folder = masks_folder or data_config.final_masks_folder
+        self._volumes = VolumeStore()
+        self._consensus = ConsensusEngine(self._confidence_level, self._padding)
+
+    def extract(self) -> pd.DataFrame:
+        """Extracts the nodules for all scans.
+
+        Returns:
+            DataFrame with the number of nodules and voxels extracted from each scan, and the
+            time taken in seconds.
+        """
+        os.makedirs(self._images_folder, exist_ok=True)
+        os.makedirs(self._masks_folder, exist_ok=True)
+
+        scans = query_scans(self._included_patients, self._excluded_patients)
+        if self._workers > 1:
+            stats = self._extract_in_parallel(
+                [scan_id for scan_id, in scans.with_entities(pl.Scan.id)]
+            )
+        else:
+            stats = [self._extract_scan(scan) for scan in tqdm(scans, total=scans.count())]
+
+        stats = pd.DataFrame(stats, columns=ROI_STATS_COLUMNS)
+        seconds = stats["seconds"].sum()
+        logger.info(
+            "Extracted {} nodules from {} scans: {} voxels at {:.0f} voxels/s.".format(
+                stats["n_nodules"].sum(),
+                len(stats),
+                stats["n_voxels"].sum(),
+                stats["n_voxels"].sum() / seconds if seconds else 0,
+            )
+        )
+
+        return stats
+
+    def _extract_in_parallel(self, scan_ids: list) -> list:
+        """Distributes the scans across a process pool and returns the stats for each scan."""
+        n_chunks = min(len(scan_ids), self._workers * CHUNKS_PER_WORKER)
+        chunks = (
+            [[int(scan_id) for scan_id in chunk] for chunk in np.array_split(scan_ids, n_chunks)]
+            if n_chunks
+            else []
+        )
+
+        stats = []
+        with tqdm(total=len(scan_ids)) as pbar:
+            pbar.set_description("Extracting nodules with {} workers".format(self._workers))
+            with queue_logging() as log_queue, ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=init_worker,
+                initargs=(log_queue, config_cache(), logging.getLogger().getEffectiveLevel()),
+            ) as executor:
+                futures = [
+                    executor.submit(_extract_scan_chunk, chunk, self._settings())
+                    for chunk in chunks
+                ]
+                for future in as_completed(futures):
+                    chunk_stats = future.result()
+                    stats.extend(chunk_stats)
+                    pbar.update(len(chunk_stats))
+
+        # Report the scans in query order, independent of the order in which they completed.
+        order = {scan_id: i for i, scan_id in enumerate(scan_ids)}
+        return sorted(stats, key=lambda scan_stats: order[scan_stats["scan_id"]])
+
+    def _settings(self) -> dict:
+        """Returns the arguments from which a worker process constructs its extractor."""
+        return {
+            "overwrite": self._overwrite,
+            "confidence_level": self._confidence_level,
+            "padding": self._padding,
+            "images_folder": self._images_folder,
+            "masks_folder": self._masks_folder,
+        }
+
+    def _extract_scan(self, scan: pl.Scan) -> dict:
+        """Extracts the nodules of a scan that have not yet been extracted."""
+        nodules = cluster_annotations(scan)
+        pending = [
+            (roi_id(scan, nodule_no), annotations)
+            for nodule_no, annotations in enumerate(nodules, start=1)
+            if self._overwrite or not self._exists(roi_id(scan, nodule_no))
+        ]
+        stats = {"scan_id": scan.id, "patient_id": scan.patient_id, "n_nodules": 0}
+        stats.update({"n_voxels": 0, "seconds": 0.0})
+        if not pending:
+            return stats
+
+        start = time.perf_counter()
+        volume = self._load_volume(scan)
+        results = self._consensus.compute(
+            scan, [annotations for _, annotations in pending], shape=volume.shape
+        )
+        for (name, _), result in zip(pending, results):
+            image = volume[result.bbox].astype(np.int16)
+            self._save(name, image, result.mask)
+            stats["n_nodules"] += 1
+            stats["n_voxels"] += image.size
+        stats["seconds"] = time.perf_counter() - start
+
+        logger.debug(
+            "Extracted {} nodules from scan {} of patient {} at {:.0f} voxels/s.".format(
+                stats["n_nodules"],
+                scan.id,
+                scan.patient_id,
+                stats["n_voxels"] / stats["seconds"] if stats["seconds"] else 0,
+            )
+        )
+        return stats
+
+    def _load_volume(self, scan: pl.Scan) -> np.ndarray:
+        """Returns the scan volume in Hounsfield units, memory-mapped from the volume store."""
+        return self._volumes.get(scan)
+
+    def _image_filepath(self, name: str) -> str:
+        return os.path.join(self._images_folder, name + ".npy")
+
+    def _mask_filepath(self, name: str) -> str:
+        return os.path.join(self._masks_folder, name + ".npz")
+
+    def _exists(self, name: str) -> bool:
+        return os.path.exists(self._image_filepath(name)) and os.path.exists(
+            self._mask_filepath(name)
+        )
+
+    def _save(self, name: str, image: np.ndarray, mask: np.ndarray) -> None:
+        """Saves the mask, then the image, each through a temporary file and a rename.
+
+        The image is written last, so an interrupted extraction never leaves a nodule that
+        appears extracted without its mask.
+        """
+        mask_filepath = self._mask_filepath(name)
+        with open(mask_filepath + ".tmp", "wb") as f:
+            np.savez(f, packed=np.packbits(mask, axis=None), shape=np.array(mask.shape))
+        os.replace(mask_filepath + ".tmp", mask_filepath)
+
+        image_filepath = self._image_filepath(name)
+        with open(image_filepath + ".tmp", "wb") as f:
+            np.save(f, image)
+        os.replace(image_filepath + ".tmp", image_filepath)
+
+
+# ------------------------------------------------------------------------------------------------ #
+def roi_id(scan: pl.Scan, nodule_no: int) -> str:
+    """Returns the name of a nodule's extracted files, '<patient_id>_<scan_id>_<nodule_no>'.
+
+    The scan id is included as some patients have more than one scan, whose nodules are
+    numbered from 1 in each.
+    """
+    return "{}_{}_{}".format(scan.patient_id, scan.id, nodule_no)
+
+
+def load_image(filepath: str, mmap: bool = True) -> np.ndarray:
+    """Returns an extracted nodule image, memory-mapped read-only by default."""
+    return np.load(filepath, mmap_mode="r" if mmap else None)
+
+
+def load_mask(filepath: str) -> np.ndarray:
+    """Returns an extracted nodule mask as a boolean array."""
+    with np.load(filepath) as data:
+        shape = tuple(data["shape"])
+        return np.unpackbits(data["packed"], count=int(np.prod(shape))).reshape(shape).astype(bool)
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                   PARALLEL WORKERS                                               #
+# ------------------------------------------------------------------------------------------------ #
+def _extract_scan_chunk(scan_ids: list, settings: dict) -> list:
+    """Extracts the nodules for a chunk of scans in a worker process.
+
+    Args:
+        scan_ids (list): The ids of the scans to process.
+        settings (dict): Keyword arguments for the worker's ROIExtractor.
+
+    Returns:
+        List of the stats for each scan.
+    """
+    extractor = ROIExtractor(**settings)
+    return [
+        extractor._extract_scan(scan)
+        for scan in worker_session().query(pl.Scan).filter(pl.Scan.id.in_(scan_ids))
+    ]
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /storage.py                                                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 01:20:36 pm                                              #
+# Modified   : Saturday October 17th 2026 01:20:36 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+from abc import ABC, abstractmethod
+
+from lcd.eda import (
+    ANNOTATION_COLUMNS,
+    CASE_COLUMNS,
+    NODULE_COLUMNS,
+    SMALL_NODULE_COLUMNS,
+    FEATURE_COLUMNS,
+    SEMANTIC_FEATURE_COLUMNS,
+)
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+#                                       SCHEMAS                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Low cardinality label columns are dictionary encoded and read back as pandas categoricals.
+CATEGORY = pa.dictionary(pa.int8(), pa.string())
+
+COLUMN_TYPES = {
+    "patient_id": pa.string(),
+    "scan_id": pa.int64(),
+    "nodule_classification": CATEGORY,
+    "nodule_id": pa.string(),
+    "annotation_no": pa.int64(),
+    "annotation_id": pa.int64(),
+    "n_readers": pa.int64(),
+    **{column: pa.int64() for column in FEATURE_COLUMNS},
+    **{column: CATEGORY for column in SEMANTIC_FEATURE_COLUMNS},
+    "diameter": pa.float64(),
+    "volume": pa.float64(),
+    "surface_area": pa.float64(),
+    "diagnosis": CATEGORY,
+    "slice_thickness": pa.float64(),
+    "slice_spacing": pa.float64(),
+    "pixel_spacing": pa.float64(),
+    **{
+        column: pa.int64()
+        for column in [
+            "total_nodules",
+            "n_nodules_lt_3mm",
+            "n_nodules_ge_3mm",
+            "n_non_nodules_ge_3mm",
+            "n_nodules_benign",
+            "n_nodules_malignant",
+            "n_images",
+            "total_file_size",
+        ]
+    },
+    "filepath": pa.string(),
+}
+
+
+def table_schema(columns: list, overrides: dict = {}) -> pa.Schema:
+    """Returns the Arrow schema for a table with the given columns."""
+    types = {**COLUMN_TYPES, **overrides}
+    return pa.schema([pa.field(column, types[column]) for column in columns])
+
+
+ANNOTATION_SCHEMA = table_schema(ANNOTATION_COLUMNS)
+CASE_SCHEMA = table_schema(CASE_COLUMNS)
+NODULE_SCHEMA = table_schema(NODULE_COLUMNS)
+# Small nodules record their diameter as the label '<3mm'.
+SMALL_NODULE_SCHEMA = table_schema(SMALL_NODULE_COLUMNS, overrides={"diameter": CATEGORY})
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                   STORAGE FORMATS                                                #
+# ------------------------------------------------------------------------------------------------ #
+class Storage(ABC):
+    """Base class for the file formats in which the metadata tables are stored.
+
+    Reads take an optional column projection and optional filters. Filters are a list of
+    (column, op, value) tuples that must all hold, with op one of '==', '!=', '<', '<=', '>',
+    '>=', 'in' and 'not in', as in pyarrow.parquet.read_table.
+    """
+
+    extension = None
+
+    def filepath(self, filepath: str) -> str:
+        """Returns the filepath with the extension for this format."""
+        return os.path.splitext(filepath)[0] + self.extension
+
+    @abstractmethod
+    def read(self, filepath: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+        """Reads the table, or the columns and rows selected."""
+
+    @abstractmethod
+    def write(self, data: pd.DataFrame, filepath: str, schema: pa.Schema = None) -> None:
+        """Writes the table, cast to the schema if given."""
+
+    @abstractmethod
+    def writer(self, filepath: str, schema: pa.Schema = None) -> "BatchWriter":
+        """Returns a writer that appends DataFrames to a new file, one batch at a time."""
+
+
+class CSVStorage(Storage):
+    """Comma separated values. Types are inferred on read."""
+
+    extension = ".csv"
+
+    def read(self, filepath: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+        if not filters:
+            return pd.read_csv(filepath, engine="pyarrow", usecols=columns)
+
+        usecols = None if columns is None else _with_filter_columns(columns, filters)
+        data = pd.read_csv(filepath, engine="pyarrow", usecols=usecols)
+        mask = np.ones(len(data), dtype=bool)
+        for column, op, value in filters:
+            mask &= FILTER_OPERATORS[op](data[column], value).to_numpy()
+        data = data[mask].reset_index(drop=True)
+        return data if columns is None else data[columns]
+
+    def write(self, data: pd.DataFrame, filepath: str, schema: pa.Schema = None) -> None:
+        data.to_csv(filepath, header=True, index=False)
+
+    def writer(self, filepath: str, schema: pa.Schema = None) -> "BatchWriter":
+        return CSVBatchWriter(filepath)
+
+
+class ArrowStorage(Storage):
+    """Base class for the Arrow based formats, which store the tables with an explicit schema."""
+
+    def to_arrow(self, data: pd.DataFrame, schema: pa.Schema = None) -> pa.Table:
+        """Converts the DataFrame to an Arrow table, casting the columns present in the schema."""
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        if schema is not None:
+            target = pa.schema(
+                [
+                    schema.field(field.name) if field.name in schema.names else field
+                    for field in table.schema
+                ]
+            )
+            # The columns of an empty table are typed by pandas as float, which may not cast.
+            table = target.empty_table() if table.num_rows == 0 else table.cast(target)
+        return table
+
+
+class ParquetStorage(ArrowStorage):
+    """Compressed columnar Parquet files, read through a memory map."""
+
+    extension = ".parquet"
+
+    def read(self, filepath: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+        # Filters are pushed down to skip row groups and are applied while decoding.
+        return pq.read_table(
+            filepath, columns=columns, filters=filters or None, memory_map=True
+        ).to_pandas()
+
+    def write(self, data: pd.DataFrame, filepath: str, schema: pa.Schema = None) -> None:
+        pq.write_table(self.to_arrow(data, schema), filepath)
+
+    def writer(self, filepath: str, schema: pa.Schema = None) -> "BatchWriter":
+        # Each batch is written as a row group, with dictionaries encoded per row group.
+        return ArrowBatchWriter(self, schema, lambda schema: pq.ParquetWriter(filepath, schema))
+
+
+class FeatherStorage(ArrowStorage):
+    """Uncompressed Arrow IPC files. Numeric columns are read zero-copy from a memory map."""
+
+    extension = ".feather"
+
+    def read(self, filepath: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+        if not filters:
+            table = feather.read_table(filepath, columns=columns, memory_map=True)
+        else:
+            usecols = None if columns is None else _with_filter_columns(columns, filters)
+            table = feather.read_table(filepath, columns=usecols, memory_map=True)
+            table = table.filter(pq.filters_to_expression(filters))
+            if columns is not None:
+                table = table.select(columns)
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, data: pd.DataFrame, filepath: str, schema: pa.Schema = None) -> None:
+        feather.write_feather(self.to_arrow(data, schema), filepath, compression="uncompressed")
+
+    def writer(self, filepath: str, schema: pa.Schema = None) -> "BatchWriter":
+        # An Arrow IPC file holds a single dictionary per column, whereas each batch carries its
+        # own. Dictionary encoded columns are therefore streamed as their plain value type.
+        if schema is not None:
+            schema = pa.schema(
+                [
+                    (
+                        pa.field(field.name, field.type.value_type)
+                        if pa.types.is_dictionary(field.type)
+                        else field
+                    )
+                    for field in schema
+                ]
+            )
+        return ArrowBatchWriter(self, schema, lambda schema: pa.ipc.new_file(filepath, schema))
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                     BATCH WRITERS                                                #
+# ------------------------------------------------------------------------------------------------ #
+class BatchWriter(ABC):
+    """Appends DataFrames with the same columns to a file. The file is complete once closed."""
+
+    @abstractmethod
+    def write(self, data: pd.DataFrame) -> None:
+        """Appends the rows to the file."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Completes and closes the file."""
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class CSVBatchWriter(BatchWriter):
+    """Appends rows to a CSV file, writing the header with the first batch."""
+
+    def __init__(self, filepath: str) -> None:
+        self._file = open(filepath, "w", newline="")
+        self._header = True
+
+    def write(self, data: pd.DataFrame) -> None:
+        data.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ArrowBatchWriter(BatchWriter):
+    """Appends batches through an Arrow writer, opened with the schema of the first batch.
+
+    Args:
+        storage (ArrowStorage): Converts each batch to an Arrow table.
+        schema (pa.Schema): Schema to which the batches are cast. If None, the schema of the
+            first batch is used.
+        open_writer (callable): Returns the Arrow writer for a schema.
+    """
+
+    def __init__(self, storage: ArrowStorage, schema: pa.Schema, open_writer) -> None:
+        self._storage = storage
+        self._schema = schema
+        self._open_writer = open_writer
+        self._writer = None
+
+    def write(self, data: pd.DataFrame) -> None:
+        table = self._storage.to_arrow(data, self._schema)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_writer(self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+FILTER_OPERATORS = {
+    "==": lambda series, value: series == value,
+    "!=": lambda series, value: series != value,
+    "<": lambda series, value: series < value,
+    "<=": lambda series, value: series <= value,
+    ">": lambda series, value: series > value,
+    ">=": lambda series, value: series >= value,
+    "in": lambda series, value: series.isin(value),
+    "not in": lambda series, value: ~series.isin(value),
+}
+
+
+def _with_filter_columns(columns: list, filters: list) -> list:
+    """Returns the columns plus any columns referenced only by the filters."""
+    return list(columns) + [c for c in dict.fromkeys(f[0] for f in filters) if c not in columns]
+
+
+STORAGE_FORMATS = {"csv": CSVStorage, "parquet": ParquetStorage, "feather": FeatherStorage}
+
+
+def get_storage(storage_format: str = "parquet") -> Storage:
+    """Returns the storage for the format: 'parquet' (default), 'feather' or 'csv'."""
+    try:
+        return STORAGE_FORMATS[storage_format]()
+    except KeyError:
+        logger.error(
+            "Storage format {} is not supported. Use one of {}.".format(
+                storage_format, list(STORAGE_FORMATS)
+            )
+        )
+        raise
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /volume.py                                                                          #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 08:52:40 pm                                              #
+# Modified   : Saturday October 17th 2026 08:52:40 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+from __future__ import annotations
+
+import os
+import json
+import time
+import logging
+import pandas as pd
+import numpy as np
+
+from lcd.utils.config import DataConfig
+from lcd.utils.imports import lazy_import
+
+# ------------------------------------------------------------------------------------------------ #
+pl = lazy_import("pylidc")
+pydicom = lazy_import("pydicom")
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class VolumeStore:
+    """Stores each scan volume once, in Hounsfield units, as a memory-mapped int16 array.
+
+    A scan is converted from its DICOM images on first access. Its volume is stored as
+    'scan_<id>.npy' with the axes ordered as in pylidc, (row, column, slice), so that the
+    bounding boxes returned by pylidc index it directly. A JSON entry alongside records the
+    shape, pixel and slice spacing and the z position of each slice. The entry is written
+    last, so a scan is only listed once its volume is complete.
+
+    Volumes are returned as read-only memory maps. Indexing a sub-volume reads only the pages
+    it spans, without copying the rest of the volume or decoding any DICOM.
+
+    Args:
+        folder (str): Directory of the store. Defaults to 'volumes' in the interim data folder.
+        dicom_index (DicomIndex): If given, a scan's DICOM files are looked up in the index
+            rather than found by listing the scan's folder.
+    """
+
+    def __init__(self, folder: str = None, dicom_index=None) -> None:
+        self._folder = folder or os.path.join(DataConfig().interim_data_folder, "volumes")
+        self._dicom_index = dicom_index
+
+    def __contains__(self, scan_id: int) -> bool:
+        return os.path.exists(self._entry_filepath(scan_id))
+
+    def get(self, scan: pl.Scan) -> np.ndarray:
+        """Returns the scan volume, converting the scan from DICOM if it is not yet stored."""
+        if scan.id not in self:
+            self.convert(scan)
+        return self.read(scan.id)
+
+    def read(self, scan_id: int, bbox: tuple = None) -> np.ndarray:
+        """Returns a stored volume, or the sub-volume within the bounding box.
+
+        Args:
+            scan_id (int): The id of the scan.
+            bbox (tuple): Optional tuple of slices, e.g. as returned by pl.Annotation.bbox.
+        """
+        volume = np.load(self._volume_filepath(scan_id), mmap_mode="r")
+        return volume if bbox is None else volume[bbox]
+
+    def info(self, scan_id: int) -> dict:
+        """Returns the index entry of a stored scan."""
+        with open(self._entry_filepath(scan_id), "r") as f:
+            return json.load(f)
+
+    def index(self) -> pd.DataFrame:
+        """Returns the index entries of all stored scans, one row per scan."""
+        entries = []
+        if os.path.exists(self._folder):
+            for filename in sorted(os.listdir(self._folder)):
+                if filename.endswith(".json"):
+                    with open(os.path.join(self._folder, filename), "r") as f:
+                        entries.append(json.load(f))
+        return pd.DataFrame(entries)
+
+    def convert(self, scan: pl.Scan) -> None:
+        """Converts the scan's DICOM images to a stored volume, one slice at a time.
+
+        Each slice is rescaled to Hounsfield units as in pl.Scan.to_volume.
+        """
+        start = time.perf_counter()
+        os.makedirs(self._folder, exist_ok=True)
+        if self._dicom_index is None:
+            images = scan.load_all_dicom_images(verbose=False)
+        else:
+            images = [pydicom.dcmread(filepath) for filepath in self._dicom_index.scan_files(scan)]
+        shape = images[0].pixel_array.shape + (len(images),)
+
+        volume_filepath = self._volume_filepath(scan.id)
+        volume = np.lib.format.open_memmap(
+            volume_filepath + ".tmp", mode="w+", dtype=np.int16, shape=shape
+        )
+        for k, image in enumerate(images):
+            volume[:, :, k] = (
+                image.pixel_array * float(getattr(image, "RescaleSlope", 1))
+                + float(getattr(image, "RescaleIntercept", 0))
+            ).astype(np.int16)
+        volume.flush()
+        del volume
+        os.replace(volume_filepath + ".tmp", volume_filepath)
+
+        entry = {
+            "scan_id": scan.id,
+            "patient_id": scan.patient_id,
+            "shape": list(shape),
+            "pixel_spacing": scan.pixel_spacing,
+            "slice_thickness": scan.slice_thickness,
+            "slice_spacing": scan.slice_spacing,
+            "slice_zvals": [float(image.ImagePositionPatient[-1]) for image in images],
+        }
+        entry_filepath = self._entry_filepath(scan.id)
+        with open(entry_filepath + ".tmp", "w") as f:
+            json.dump(entry, f)
+        os.replace(entry_filepath + ".tmp", entry_filepath)
+
+        logger.debug(
+            "Stored volume of scan {} with shape {} in {:.2f} seconds.".format(
+                scan.id, shape, time.perf_counter() - start
+            )
+        )
+
+    def _volume_filepath(self, scan_id: int) -> str:
+        return os.path.join(self._folder, "scan_{}.npy".format(scan_id))
+
+    def _entry_filepath(self, scan_id: int) -> str:
+        return os.path.join(self._folder, "scan_{}.json".format(scan_id))
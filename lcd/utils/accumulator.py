@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /accumulator.py                                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:02:11 am                                              #
+# Modified   : Saturday October 17th 2026 09:02:11 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import pandas as pd
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+class ColumnAccumulator:
+    """Accumulates rows into per-column buffers and materializes a DataFrame once.
+
+    Appending to a list per column is amortized O(1), whereas concatenating one-row DataFrames
+    copies everything accumulated so far on each append.
+
+    Args:
+        columns (list): The column names in output order.
+        dtypes (dict): Optional mapping of column names to dtypes applied when the DataFrame
+            is materialized.
+    """
+
+    def __init__(self, columns: list, dtypes: dict = None) -> None:
+        self._columns = list(columns)
+        self._dtypes = dtypes or {}
+        self._buffers = {column: [] for column in self._columns}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> list:
+        return self._columns
+
+    def append(self, row: dict) -> None:
+        """Appends a row. Columns absent from the row are recorded as missing values.
+
+        Args:
+            row (dict): Mapping of column name to value.
+        """
+        unknown = set(row) - set(self._buffers)
+        if unknown:
+            raise ValueError("Columns {} are not in the accumulator.".format(sorted(unknown)))
+        for column, buffer in self._buffers.items():
+            buffer.append(row.get(column))
+        self._size += 1
+
+    def extend(self, other) -> None:
+        """Appends all rows from another accumulator or a dictionary of column lists.
+
+        Args:
+            other (Union[ColumnAccumulator, dict]): The rows to append. Columns must match.
+        """
+        buffers = other.to_dict() if isinstance(other, ColumnAccumulator) else other
+        if list(buffers) != self._columns:
+            raise ValueError("Cannot extend accumulator with mismatched columns.")
+        sizes = {len(values) for values in buffers.values()}
+        if len(sizes) > 1:
+            raise ValueError("Cannot extend accumulator with ragged columns.")
+        for column, values in buffers.items():
+            self._buffers[column].extend(values)
+        self._size += sizes.pop() if sizes else 0
+
+    def to_dict(self) -> dict:
+        """Returns the column buffers as a dictionary of lists."""
+        return {column: list(buffer) for column, buffer in self._buffers.items()}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materializes the accumulated rows as a DataFrame."""
+        df = pd.DataFrame(self._buffers, columns=self._columns)
+        if self._dtypes:
+            df = df.astype(self._dtypes)
+        return df
+
+    def clear(self) -> None:
+        """Empties the buffers."""
+        for buffer in self._buffers.values():
+            buffer.clear()
+        self._size = 0
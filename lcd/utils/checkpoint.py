@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /checkpoint.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:14:32 am                                              #
+# Modified   : Saturday October 17th 2026 10:14:32 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import json
+import pickle
+import hashlib
+import logging
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+MANIFEST_FILENAME = "manifest.json"
+# Completed keys are appended to this file, one per line, rather than rewriting the manifest.
+KEYS_FILENAME = "keys.txt"
+
+
+def fingerprint(*filepaths: str, version: str = "") -> str:
+    """Returns a SHA-256 digest over the contents of the files. Missing files hash as empty.
+
+    Args:
+        *filepaths (str): The files from whose contents results derive.
+        version (str): Optional version of the code or schema of the results, digested with
+            the files so that changing it invalidates results derived from the same files.
+    """
+    digest = hashlib.sha256()
+    digest.update(version.encode())
+    for filepath in filepaths:
+        digest.update(os.path.basename(filepath).encode())
+        if os.path.exists(filepath):
+            with open(filepath, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+# ------------------------------------------------------------------------------------------------ #
+class CheckpointStore:
+    """Persists partial results by key together with a manifest of the completed keys.
+
+    The manifest records the fingerprint of the inputs the results were derived from. If the
+    fingerprint no longer matches, the existing checkpoints are discarded. Each key is appended
+    to a log once its results are written, so a save writes only its own results.
+
+    Args:
+        folder (str): Directory in which the checkpoints and manifest are stored.
+        fingerprint (str): Digest of the inputs from which the checkpointed results derive.
+    """
+
+    def __init__(self, folder: str, fingerprint: str) -> None:
+        self._folder = folder
+        self._fingerprint = fingerprint
+        self._manifest_filepath = os.path.join(folder, MANIFEST_FILENAME)
+        self._keys_filepath = os.path.join(folder, KEYS_FILENAME)
+        self._keys = set()
+        self._open()
+
+    @property
+    def keys(self) -> set:
+        """Returns the keys of the completed checkpoints."""
+        return set(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def save(self, key: str, data) -> None:
+        """Persists the data for the key and appends the key to the completed keys."""
+        self._write_atomic(self._filepath(key), pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        if key not in self._keys:
+            with open(self._keys_filepath, "a") as f:
+                f.write(key + "\n")
+            self._keys.add(key)
+
+    def load(self, key: str):
+        """Returns the data checkpointed for the key."""
+        with open(self._filepath(key), "rb") as f:
+            return pickle.load(f)
+
+    def clear(self) -> None:
+        """Deletes all checkpoints and resets the manifest."""
+        for key in self._keys:
+            if os.path.exists(self._filepath(key)):
+                os.remove(self._filepath(key))
+        self._keys = set()
+        self._write_manifest()
+
+    def _open(self) -> None:
+        os.makedirs(self._folder, exist_ok=True)
+        if not os.path.exists(self._manifest_filepath):
+            self._write_manifest()
+            return
+
+        with open(self._manifest_filepath, "r") as f:
+            manifest = json.load(f)
+        self._keys = self._read_keys()
+        if manifest["fingerprint"] != self._fingerprint:
+            logger.info("Inputs changed since the last checkpoint. Discarding checkpoints.")
+            self.clear()
+
+    def _filepath(self, key: str) -> str:
+        return os.path.join(self._folder, key + ".pkl")
+
+    def _read_keys(self) -> set:
+        """Returns the keys logged, dropping a last line cut short by an interrupted append."""
+        if not os.path.exists(self._keys_filepath):
+            return set()
+        with open(self._keys_filepath, "r") as f:
+            lines = f.readlines()
+        keys = [line for line in lines if line.endswith("\n")]
+        if len(keys) < len(lines):
+            self._write_atomic(self._keys_filepath, "".join(keys).encode())
+        return {key[:-1] for key in keys}
+
+    def _write_manifest(self) -> None:
+        """Writes the fingerprint and empties the log of completed keys."""
+        self._write_atomic(self._keys_filepath, b"")
+        manifest = {"fingerprint": self._fingerprint}
+        self._write_atomic(self._manifest_filepath, json.dumps(manifest, indent=2).encode())
+
+    def _write_atomic(self, filepath: str, content: bytes) -> None:
+        """Writes to a temporary file and renames it so an interrupted write leaves no partial file."""
+        tmp_filepath = filepath + ".tmp"
+        with open(tmp_filepath, "wb") as f:
+            f.write(content)
+        os.replace(tmp_filepath, filepath)
@@ -15,89 +15,246 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+import os
 import configparser
+from dataclasses import dataclass, fields
 
 # ------------------------------------------------------------------------------------------------ #
 DATA_CONFIG = "config/data.conf"
 PYLIDC_CONFIG = "config/pylidc.conf"
+# Settings parsed from each configuration file, keyed by absolute filepath, with the file's
+# modification time when parsed. Shared with worker processes by config_cache.
+_settings_cache = {}
 
 
+# ------------------------------------------------------------------------------------------------ #
+@dataclass(frozen=True, slots=True)
+class DataSettings:
+    """Folders and filepaths parsed from the data configuration file."""
+
+    external_data_folder: str
+    raw_data_folder: str
+    raw_lidc_data_folder: str
+    interim_data_folder: str
+    final_data_folder: str
+    final_images_folder: str
+    final_masks_folder: str
+    metadata_filepath: str
+    non_nodule_cases_filepath: str
+    cases_filepath: str
+    annotations_filepath: str
+    nodules_filepath: str
+    small_nodules_filepath: str
+    non_nodules_filepath: str
+
+
+# Section and option of each DataSettings field in the data configuration file.
+DATA_OPTIONS = {
+    "external_data_folder": ("folders", "external"),
+    "raw_data_folder": ("folders", "raw"),
+    "raw_lidc_data_folder": ("folders", "raw_lidc"),
+    "interim_data_folder": ("folders", "interim"),
+    "final_data_folder": ("folders", "final"),
+    "final_images_folder": ("folders", "final_images"),
+    "final_masks_folder": ("folders", "final_masks"),
+    "metadata_filepath": ("filepaths", "metadata"),
+    "non_nodule_cases_filepath": ("filepaths", "non_nodule_cases"),
+    "cases_filepath": ("filepaths", "cases"),
+    "annotations_filepath": ("filepaths", "annotations"),
+    "nodules_filepath": ("filepaths", "nodules"),
+    "small_nodules_filepath": ("filepaths", "small_nodules"),
+    "non_nodules_filepath": ("filepaths", "non_nodules"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PylidcSettings:
+    """Consensus and bounding box settings parsed from the pylidc configuration file."""
+
+    confidence_level: float
+    padding: int
+
+
+# ------------------------------------------------------------------------------------------------ #
+def load_data_settings(config_filepath: str = DATA_CONFIG) -> DataSettings:
+    """Returns the data settings, parsed once per process and again only if the file changes.
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist.
+        ValueError: If an option is missing or empty.
+    """
+    return _load_settings(config_filepath, _parse_data_settings)
+
+
+def load_pylidc_settings(config_filepath: str = PYLIDC_CONFIG) -> PylidcSettings:
+    """Returns the pylidc settings, parsed once per process and again only if the file changes.
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist.
+        ValueError: If an option is missing, or the confidence level is not in (0, 1], or the
+            padding is not a non-negative integer.
+    """
+    return _load_settings(config_filepath, _parse_pylidc_settings)
+
+
+def config_cache() -> dict:
+    """Returns the parsed settings of this process, to be passed to worker processes."""
+    return dict(_settings_cache)
+
+
+def install_config_cache(cache: dict) -> None:
+    """Installs settings parsed by the parent process, so that a worker does not parse them.
+
+    Args:
+        cache (dict): The settings returned by config_cache in the parent process.
+    """
+    _settings_cache.update(cache)
+
+
+def _load_settings(config_filepath: str, parse):
+    key = os.path.abspath(config_filepath)
+    mtime_ns = os.stat(config_filepath).st_mtime_ns
+    cached = _settings_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    settings = parse(config_filepath)
+    _settings_cache[key] = (mtime_ns, settings)
+    return settings
+
+
+def _read_option(parser: configparser.ConfigParser, config_filepath: str, section: str, option):
+    value = parser.get(section, option, fallback="").strip()
+    if not value:
+        raise ValueError(
+            "Option '{}' of section [{}] is missing from {}.".format(
+                option, section, config_filepath
+            )
+        )
+    return value
+
+
+def _parse_data_settings(config_filepath: str) -> DataSettings:
+    parser = configparser.ConfigParser()
+    parser.read(config_filepath)
+    return DataSettings(
+        **{
+            field.name: _read_option(parser, config_filepath, *DATA_OPTIONS[field.name])
+            for field in fields(DataSettings)
+        }
+    )
+
+
+def _parse_pylidc_settings(config_filepath: str) -> PylidcSettings:
+    parser = configparser.ConfigParser()
+    parser.read(config_filepath)
+    confidence_level = _read_option(parser, config_filepath, "pylidc", "confidence_level")
+    padding = _read_option(parser, config_filepath, "pylidc", "padding")
+    try:
+        settings = PylidcSettings(confidence_level=float(confidence_level), padding=int(padding))
+    except ValueError as e:
+        raise ValueError("Invalid pylidc settings in {}.\n{}".format(config_filepath, e))
+    if not 0 < settings.confidence_level <= 1:
+        raise ValueError(
+            "The confidence level in {} must be in (0, 1], not {}.".format(
+                config_filepath, settings.confidence_level
+            )
+        )
+    if settings.padding < 0:
+        raise ValueError(
+            "The padding in {} must not be negative, not {}.".format(
+                config_filepath, settings.padding
+            )
+        )
+    return settings
+
+
+# ------------------------------------------------------------------------------------------------ #
 class DataConfig:
+    """Provides the data settings. See load_data_settings."""
+
     def __init__(self, config_filepath=DATA_CONFIG):
         self._config_filepath = config_filepath
-        self._parser = configparser.ConfigParser()
-        self._parser.read(config_filepath)
+        self._settings = load_data_settings(config_filepath)
+
+    @property
+    def settings(self) -> DataSettings:
+        return self._settings
 
     # Folders
     @property
     def external_data_folder(self) -> str:
-        return self._parser["folders"]["external"]
+        return self._settings.external_data_folder
 
     @property
     def raw_data_folder(self) -> str:
-        return self._parser["folders"]["raw"]
+        return self._settings.raw_data_folder
 
     @property
     def raw_lidc_data_folder(self) -> str:
-        return self._parser["folders"]["raw_lidc"]
+        return self._settings.raw_lidc_data_folder
 
     @property
     def interim_data_folder(self) -> str:
-        return self._parser["folders"]["interim"]
+        return self._settings.interim_data_folder
 
     @property
     def final_data_folder(self) -> str:
-        return self._parser["folders"]["final"]
+        return self._settings.final_data_folder
 
     @property
     def final_images_folder(self) -> str:
-        return self._parser["folders"]["final_images"]
+        return self._settings.final_images_folder
 
     @property
     def final_masks_folder(self) -> str:
-        return self._parser["folders"]["final_masks"]
+        return self._settings.final_masks_folder
 
     # Files
     @property
     def metadata_filepath(self) -> str:
-        return self._parser["filepaths"]["metadata"]
+        return self._settings.metadata_filepath
 
     @property
     def non_nodule_cases_filepath(self) -> str:
-        return self._parser["filepaths"]["non_nodule_cases"]
+        return self._settings.non_nodule_cases_filepath
 
     @property
     def cases_filepath(self) -> str:
-        return self._parser["filepaths"]["cases"]
+        return self._settings.cases_filepath
 
     @property
     def annotations_filepath(self) -> str:
-        return self._parser["filepaths"]["annotations"]
+        return self._settings.annotations_filepath
 
     @property
     def nodules_filepath(self) -> str:
-        return self._parser["filepaths"]["nodules"]
+        return self._settings.nodules_filepath
 
     @property
     def small_nodules_filepath(self) -> str:
-        return self._parser["filepaths"]["small_nodules"]
+        return self._settings.small_nodules_filepath
 
     @property
     def non_nodules_filepath(self) -> str:
-        return self._parser["filepaths"]["non_nodules"]
+        return self._settings.non_nodules_filepath
 
 
 # ------------------------------------------------------------------------------------------------ #
 class PylidcConfig:
+    """Provides the pylidc settings. See load_pylidc_settings."""
+
     def __init__(self, config_filepath=PYLIDC_CONFIG):
         self._config_filepath = config_filepath
-        self._parser = configparser.ConfigParser()
-        self._parser.read(config_filepath)
+        self._settings = load_pylidc_settings(config_filepath)
+
+    @property
+    def settings(self) -> PylidcSettings:
+        return self._settings
 
     @property
-    def confidence_level(self) -> str:
-        return float(self._parser["pylidc"]["confidence_level"])
+    def confidence_level(self) -> float:
+        return self._settings.confidence_level
 
     @property
-    def padding(self) -> str:
-        return int(self._parser["pylidc"]["padding"])
+    def padding(self) -> int:
+        return self._settings.padding
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /files.py                                                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:22:06 pm                                              #
+# Modified   : Saturday October 17th 2026 09:22:06 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import json
+import logging
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+DIRECTORY_STATS_COLUMNS = ["name", "n_files", "total_size"]
+
+
+class DirectoryStats:
+    """Counts the files and bytes beneath each subdirectory of a folder.
+
+    Subdirectories are walked concurrently by a thread pool with os.scandir. The counts are
+    cached together with the modification time of every directory walked. Adding, removing
+    or renaming a file changes the modification time of its directory, so a cached count is
+    reused for as long as none of its directories have changed. Validating the cache costs one
+    stat per directory rather than one per file.
+
+    Args:
+        folder (str): The folder whose subdirectories are counted.
+        cache_filepath (str): JSON file in which counts are cached. If None, nothing is cached.
+        extension (str): If given, only files with this extension are counted, e.g. '.dcm'.
+        workers (int): Number of threads walking subdirectories.
+    """
+
+    def __init__(
+        self, folder: str, cache_filepath: str = None, extension: str = None, workers: int = 8
+    ) -> None:
+        self._folder = folder
+        self._cache_filepath = cache_filepath
+        self._extension = extension
+        self._workers = workers
+
+    def compute(self, names: list = None) -> pd.DataFrame:
+        """Returns the number of files and their total size in bytes for each subdirectory.
+
+        Args:
+            names (list): Names of the subdirectories to count. Defaults to all of them.
+                Subdirectories that do not exist have no files.
+
+        Returns:
+            DataFrame with columns name, n_files and total_size, one row per subdirectory.
+        """
+        if names is None:
+            names = (
+                sorted(entry.name for entry in os.scandir(self._folder) if entry.is_dir())
+                if os.path.isdir(self._folder)
+                else []
+            )
+
+        cache = self._read_cache()
+        stale = [name for name in names if not self._is_current(cache.get(name))]
+        if stale:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                for name, stats in zip(stale, executor.map(self._walk, stale)):
+                    cache[name] = stats
+            self._write_cache(cache)
+        logger.debug(
+            "Counted files in {} directories, {} from cache.".format(
+                len(names), len(names) - len(stale)
+            )
+        )
+
+        return pd.DataFrame(
+            [(name, cache[name]["n_files"], cache[name]["total_size"]) for name in names],
+            columns=DIRECTORY_STATS_COLUMNS,
+        )
+
+    def _walk(self, name: str) -> dict:
+        """Counts the files beneath a subdirectory, recording the mtime of each directory."""
+        stats = {"n_files": 0, "total_size": 0, "mtimes": {}}
+        pending = [os.path.join(self._folder, name)]
+        while pending:
+            directory = pending.pop()
+            try:
+                stats["mtimes"][directory] = os.stat(directory).st_mtime_ns
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif self._extension is None or entry.name.endswith(self._extension):
+                    stats["n_files"] += 1
+                    stats["total_size"] += entry.stat().st_size
+        return stats
+
+    def _is_current(self, stats: dict) -> bool:
+        """Returns True if none of the directories counted have been modified since."""
+        if stats is None or not stats["mtimes"]:
+            return False
+        try:
+            return all(
+                os.stat(directory).st_mtime_ns == mtime
+                for directory, mtime in stats["mtimes"].items()
+            )
+        except FileNotFoundError:
+            return False
+
+    def _read_cache(self) -> dict:
+        if self._cache_filepath is None or not os.path.exists(self._cache_filepath):
+            return {}
+        with open(self._cache_filepath, "r") as f:
+            cache = json.load(f)
+        # Counts made with another folder or extension are not reused.
+        if cache.get("folder") != self._folder or cache.get("extension") != self._extension:
+            return {}
+        return cache["directories"]
+
+    def _write_cache(self, cache: dict) -> None:
+        if self._cache_filepath is None:
+            return
+        os.makedirs(os.path.dirname(self._cache_filepath) or ".", exist_ok=True)
+        content = {"folder": self._folder, "extension": self._extension, "directories": cache}
+        with open(self._cache_filepath + ".tmp", "w") as f:
+            json.dump(content, f)
+        os.replace(self._cache_filepath + ".tmp", self._cache_filepath)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /imports.py                                                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:14 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:14 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import sys
+import importlib.util
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+def lazy_import(name: str):
+    """Returns a module that is executed on first attribute access rather than on import.
+
+    Used for heavy dependencies, e.g. pylidc, which initializes SQLAlchemy and scipy when
+    executed, so that importing a module of this package does not pay for them until they are
+    used. Annotations naming the module's classes must not be evaluated at import, so modules
+    using it import annotations from __future__.
+
+    Args:
+        name (str): The absolute name of a top-level module or package, e.g. 'pylidc'.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError("No module named '{}'".format(name), name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -15,6 +15,14 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+import os
+import logging
+import logging.config
+import logging.handlers
+import multiprocessing
+from contextlib import contextmanager
+
+# ------------------------------------------------------------------------------------------------ #
 LOG_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -39,3 +47,82 @@ LOG_CONFIG = {
     },
     "loggers": {"root": {"handlers": ["console", "file"], "propagate": False, "level": "DEBUG"}},
 }
+
+
+# ------------------------------------------------------------------------------------------------ #
+def configure_logging(config: dict = LOG_CONFIG) -> None:
+    """Configures logging for the running script, notebook or test session.
+
+    Importing the package does not configure logging. Entry points call this once, before
+    logging, and the folders of any file handlers are created first.
+
+    Args:
+        config (dict): A logging configuration dictionary. Defaults to LOG_CONFIG.
+    """
+    for handler in config.get("handlers", {}).values():
+        if "filename" in handler:
+            os.makedirs(os.path.dirname(handler["filename"]) or ".", exist_ok=True)
+    logging.config.dictConfig(config)
+
+
+@contextmanager
+def queue_logging(formatter: str = "multiprocess"):
+    """Routes logging through a queue served by a single listener thread while in the context.
+
+    The handlers of the root logger are moved behind a QueueListener, and the root logger is
+    given a QueueHandler in their place. Logging then only enqueues the record, and the listener
+    alone writes to, and rotates, the log file. Worker processes pass the queue to
+    configure_worker_logging so that their records reach the same listener. The handlers are
+    restored when the context exits.
+
+    Args:
+        formatter (str): Name of the formatter in LOG_CONFIG given to file handlers while in the
+            context. The 'multiprocess' default records the process and thread of each record.
+
+    Yields:
+        The multiprocessing queue to be passed to worker processes.
+    """
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    formatters = [handler.formatter for handler in handlers]
+    file_formatter = logging.Formatter(LOG_CONFIG["formatters"][formatter]["format"])
+
+    queue = multiprocessing.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(queue)
+    for handler in handlers:
+        if isinstance(handler, logging.FileHandler):
+            handler.setFormatter(file_formatter)
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(queue, *handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        yield queue
+    finally:
+        listener.stop()
+        root.removeHandler(queue_handler)
+        for handler, handler_formatter in zip(handlers, formatters):
+            handler.setFormatter(handler_formatter)
+            root.addHandler(handler)
+        queue.close()
+        queue.join_thread()
+
+
+def configure_worker_logging(queue, level: int = logging.WARNING) -> None:
+    """Replaces the handlers of a worker process's root logger with one enqueuing its records.
+
+    Called by the initializer of worker processes. Handlers inherited from the parent process
+    are removed without being closed, so that the worker never writes to the log file itself.
+    Records below the level are dropped in the worker, rather than pickled and enqueued only
+    to be dropped by the parent.
+
+    Args:
+        queue: The queue yielded by queue_logging in the parent process.
+        level (int): Level of the worker's root logger, that of the parent's root logger as
+            given by logging.getLogger().getEffectiveLevel().
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(queue))
+    root.setLevel(level)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /timing.py                                                                          #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:41:19 pm                                              #
+# Modified   : Saturday October 17th 2026 11:41:19 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import time
+import functools
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------------------------------------ #
+TIMING_COLUMNS = ["stage", "count", "total_ms", "p50_ms", "p99_ms"]
+
+
+class StageTimer:
+    """Records the wall-clock duration of each call to a named stage.
+
+    Durations are measured with time.perf_counter_ns and appended to a list per stage, so that
+    timing a call costs two clock reads and an append. No call stack is inspected and nothing
+    is logged per call. When disabled, stages are entered and left without reading the clock.
+
+    Args:
+        enabled (bool): If False, nothing is recorded.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._durations = {}
+
+    def stage(self, name: str):
+        """Returns a context manager timing the statements within it as the named stage."""
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def record(self, name: str, duration_ns: int) -> None:
+        """Records a duration in nanoseconds for the named stage."""
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = self._durations[name] = []
+        durations.append(duration_ns)
+
+    def summary(self) -> pd.DataFrame:
+        """Returns the number of calls and the total, median and 99th percentile duration in
+        milliseconds for each stage, in the order in which the stages were first recorded."""
+        rows = []
+        for name, durations in self._durations.items():
+            ms = np.asarray(durations, dtype=np.float64) / 1e6
+            rows.append((name, len(ms), ms.sum(), np.percentile(ms, 50), np.percentile(ms, 99)))
+        return pd.DataFrame(rows, columns=TIMING_COLUMNS)
+
+    def reset(self) -> None:
+        """Discards all recorded durations."""
+        self._durations = {}
+
+
+class _Stage:
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer: StageTimer, name: str) -> None:
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._timer.record(self._name, time.perf_counter_ns() - self._start)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+# ------------------------------------------------------------------------------------------------ #
+def timed(stage: str = None):
+    """Decorates a method so that each call is timed by the instance's StageTimer.
+
+    The timer is read from the instance's '_timer' attribute. When it is disabled the method
+    is called directly.
+
+    Args:
+        stage (str): Name of the stage. Defaults to the qualified name of the method.
+    """
+
+    def decorator(method):
+        name = stage or method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = self._timer
+            if not timer.enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                timer.record(name, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    return decorator
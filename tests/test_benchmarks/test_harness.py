@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_harness.py                                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:58 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:58 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+
+import inspect
+import pytest
+import logging
+import logging.config
+
+# Enter imports for modules and classes being tested here
+from benchmarks.harness import (
+    append_history,
+    previous_results,
+    read_history,
+    regressions,
+    run_benchmarks,
+)
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.mark.harness
+class TestHarness:
+    def test_run_benchmarks(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        names = ["data.build_annotation_data", "data.save_data", "explorer.summaries"]
+        results = run_benchmarks(100, repeats=1, names=names)
+        assert list(results) == names
+        for result in results.values():
+            assert 0 < result["min"] <= result["median"]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_history(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = str(tmp_path / "history.json")
+        assert read_history(filepath) == []
+        append_history(filepath, {"scale": 100, "results": {"a": {"median": 1.0}}})
+        append_history(filepath, {"scale": 1000, "results": {"a": {"median": 5.0}}})
+        previous = previous_results(read_history(filepath), 100)
+        assert previous == {"a": {"median": 1.0}}
+        assert previous_results(read_history(filepath), 10) == {}
+
+        results = {"a": {"median": 1.3}, "b": {"median": 9.0}}
+        assert regressions(results, previous, threshold=0.2) == ["a"]
+        assert regressions(results, previous, threshold=0.5) == []
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
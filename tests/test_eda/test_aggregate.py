@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_aggregate.py                                                                  #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:52:20 am                                              #
+# Modified   : Saturday October 17th 2026 11:52:20 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import math
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+import pandas as pd
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.aggregate import group_ceil_median, group_mode
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.fixture(scope="module")
+def annotations():
+    """Small groups over small value domains so ties are frequent."""
+    rng = np.random.default_rng(42)
+    n = 5000
+    return pd.DataFrame(
+        {
+            "nodule_id": rng.integers(0, 1500, n),
+            "score": rng.integers(1, 7, n),
+            "diagnosis": rng.choice(["Benign", "Malignant"], n),
+        }
+    )
+
+
+# ================================================================================================ #
+#                                    TEST AGGREGATE                                                #
+# ================================================================================================ #
+
+
+@pytest.mark.aggregate
+class TestAggregate:
+    def test_group_ceil_median(self, annotations, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        groups = annotations.groupby("nodule_id")
+        expected = groups["score"].agg(lambda x: math.ceil(np.median(x))).to_numpy()
+        result = group_ceil_median(
+            groups.ngroup().to_numpy(), annotations["score"].to_numpy(), groups.ngroups
+        )
+        assert np.array_equal(result, expected)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_group_mode(self, annotations, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        groups = annotations.groupby("nodule_id")
+        codes = groups.ngroup().to_numpy()
+        for column in ["score", "diagnosis"]:
+            expected = groups[column].agg(lambda x: x.value_counts().index[0]).to_numpy()
+            result = group_mode(codes, annotations[column].to_numpy(), groups.ngroups)
+            assert np.array_equal(result, expected)
+
+        # Ties go to the value seen first in the group
+        codes = np.array([0, 0, 0, 0, 1, 1])
+        assert group_mode(codes, np.array([3, 1, 1, 3, 2, 5]), 2).tolist() == [3, 2]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_empty(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        empty = np.array([], dtype=np.int64)
+        assert len(group_ceil_median(empty, empty, 0)) == 0
+        assert len(group_mode(empty, empty, 0)) == 0
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
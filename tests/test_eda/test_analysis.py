@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_analysis.py                                                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 02:08:51 pm                                              #
+# Modified   : Saturday October 17th 2026 02:08:51 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+import pandas as pd
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.analysis import LIDCExplorer
+from lcd.eda.cube import cube_filepath, SKETCH_ACCURACY
+from lcd.eda.index import TableIndex, index_filepath
+from lcd.eda.storage import get_storage, ANNOTATION_SCHEMA, NODULE_SCHEMA
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.fixture
+def explorer(tmp_path):
+    """An explorer over synthetic annotation and nodule tables stored as Parquet."""
+    rng = np.random.default_rng(7)
+    n_readers = rng.integers(1, 5, 300)
+    nodules = pd.DataFrame(
+        {
+            "patient_id": ["LIDC-IDRI-{:04d}".format(i // 3) for i in range(300)],
+            "nodule_id": ["N{}".format(i) for i in range(300)],
+            "n_readers": n_readers,
+            "malignancy": rng.integers(1, 6, 300),
+            "calcification": rng.integers(1, 7, 300),
+            "diameter": rng.uniform(3, 40, 300),
+        }
+    )
+    nodules["diagnosis"] = np.where(nodules["malignancy"] > 3, "Malignant", "Benign")
+    annotations = nodules.loc[nodules.index.repeat(n_readers)].reset_index(drop=True)
+
+    storage = get_storage("parquet")
+    explorer = LIDCExplorer(storage_format="parquet")
+    explorer._annotation_filepath = str(tmp_path / "annotations.parquet")
+    explorer._nodule_filepath = str(tmp_path / "nodules.parquet")
+    storage.write(annotations, explorer._annotation_filepath, ANNOTATION_SCHEMA)
+    storage.write(nodules, explorer._nodule_filepath, NODULE_SCHEMA)
+    for data, filepath in [
+        (annotations, explorer._annotation_filepath),
+        (nodules, explorer._nodule_filepath),
+    ]:
+        storage.write(TableIndex.build(data).to_frame(), index_filepath(filepath))
+    explorer.expected = {"annotations": annotations, "nodules": nodules}
+    return explorer
+
+
+# ================================================================================================ #
+#                                    TEST EXPLORER                                                 #
+# ================================================================================================ #
+
+
+@pytest.mark.analysis
+class TestLIDCExplorer:
+    def test_lazy_projection(self, explorer, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Statistics are computed from the columns read rather than from the summary cube.
+        explorer._use_cube = False
+        assert explorer._loaded == {}
+        stats = explorer.diameter_stats()
+        assert stats["count"].iloc[0] == len(explorer.expected["annotations"])
+        assert list(explorer._loaded[explorer._annotation_filepath].columns) == ["diameter"]
+
+        explorer.diameter_stats_by_malignancy()
+        assert list(explorer._loaded[explorer._annotation_filepath].columns) == [
+            "diameter",
+            "malignancy",
+        ]
+        assert explorer._loaded[explorer._annotation_filepath]["malignancy"].dtype == np.int8
+        report = explorer.memory_report().loc["annotations"]
+        assert report.loc["malignancy", "compact_bytes"] < report.loc["malignancy", "bytes"]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_filters(self, explorer, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        expected = explorer.expected["nodules"]
+        expected = expected[(expected["n_readers"] >= 3) & (expected["diagnosis"] == "Malignant")]
+        nodules = explorer.nodules(["nodule_id"], min_readers=3, diagnosis="Malignant")
+        assert nodules["nodule_id"].tolist() == expected["nodule_id"].tolist()
+        assert explorer._loaded == {}
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_reader_agreement(self, explorer, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        nodules = explorer.expected["nodules"]
+        summary = explorer.nodule_summary()
+        malignancy = explorer.malignancy_summary()
+        assert summary.shape == (4, 3)
+        assert malignancy.shape == (4, 6)
+        for i in range(4):
+            subset = nodules[nodules["n_readers"] > i]
+            assert summary.iloc[i].tolist() == [i + 1, len(subset), round(len(subset) / 300, 2)]
+            expected = [(subset["malignancy"] == j).sum() for j in range(1, 6)]
+            assert malignancy.iloc[i, 1:].tolist() == expected
+
+        calcification = explorer.reader_agreement("calcification")
+        assert list(calcification.columns) == [
+            "Popcorn",
+            "Laminated",
+            "Solid",
+            "Non-central",
+            "Central",
+            "Absent",
+        ]
+        subset = nodules[nodules["n_readers"] >= 3]
+        expected = [(subset["calcification"] == j).sum() for j in range(1, 7)]
+        assert calcification.loc[3].tolist() == expected
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_lookup(self, explorer, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        annotations = explorer.expected["annotations"]
+        expected = annotations[annotations["patient_id"] == "LIDC-IDRI-0042"]
+        data = explorer.annotations(["nodule_id", "diameter"], patient_id="LIDC-IDRI-0042")
+        assert data["nodule_id"].tolist() == expected["nodule_id"].tolist()
+        assert data["diameter"].tolist() == expected["diameter"].tolist()
+
+        expected = expected[expected["n_readers"] >= 2]
+        data = explorer.annotations(["nodule_id"], min_readers=2, patient_id="LIDC-IDRI-0042")
+        assert data["nodule_id"].tolist() == expected["nodule_id"].tolist()
+
+        nodule = explorer.nodules(nodule_id="N127")
+        assert len(nodule) == 1
+        assert nodule["patient_id"].iloc[0] == "LIDC-IDRI-0042"
+        assert explorer.nodules(["nodule_id"], patient_id="LIDC-IDRI-9999").empty
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_summary_cube(self, explorer, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        rows = LIDCExplorer(use_cube=False)
+        rows._annotation_filepath = explorer._annotation_filepath
+        rows._nodule_filepath = explorer._nodule_filepath
+
+        assert explorer.nodule_summary().equals(rows.nodule_summary())
+        assert explorer.malignancy_summary().equals(rows.malignancy_summary())
+        assert explorer.reader_agreement("calcification").equals(
+            rows.reader_agreement("calcification")
+        )
+        for method, kwargs in [
+            ("diameter_stats", {"min_readers": 2}),
+            ("diameter_stats_by_malignancy", {"diagnosis": "Malignant"}),
+            ("diameter_stats_by_diagnosis", {"min_readers": 3}),
+        ]:
+            cube_stats = getattr(explorer, method)(**kwargs)
+            # The cube orders groups by value, whereas groupby orders categories as read.
+            row_stats = getattr(rows, method)(**kwargs)
+            assert cube_stats.shape == row_stats.shape
+            assert sorted(cube_stats.columns.astype(str)) == sorted(row_stats.columns.astype(str))
+            row_stats.columns = row_stats.columns.astype(str)
+            row_stats = row_stats[list(cube_stats.columns.astype(str))]
+            assert np.allclose(
+                cube_stats.to_numpy(float), row_stats.to_numpy(float), rtol=SKETCH_ACCURACY
+            )
+        # Statistics other than the quartiles are exact.
+        stats = explorer.diameter_stats_by_malignancy()
+        exact = rows.diameter_stats_by_malignancy().drop(
+            [("diameter", q) for q in ["25%", "50%", "75%"]]
+        )
+        assert np.allclose(stats.loc[exact.index].to_numpy(float), exact.to_numpy(float))
+        assert os.path.exists(cube_filepath(explorer._nodule_filepath))
+        assert os.path.exists(cube_filepath(explorer._annotation_filepath))
+
+        # The persisted cube is reused, and rebuilt once its table changes.
+        reopened = LIDCExplorer()
+        reopened._annotation_filepath = explorer._annotation_filepath
+        reopened._nodule_filepath = explorer._nodule_filepath
+        cube = reopened._cube(reopened._nodule_filepath)
+        assert cube.source_hash == explorer._cube(explorer._nodule_filepath).source_hash
+        assert reopened._cube(reopened._nodule_filepath) is cube
+
+        nodules = explorer.expected["nodules"]
+        get_storage("parquet").write(
+            nodules[nodules["n_readers"] >= 2], explorer._nodule_filepath, NODULE_SCHEMA
+        )
+        counts = reopened.reader_agreement()
+        assert counts["Nodules"].iloc[0] == (nodules["n_readers"] >= 2).sum()
+        assert reopened._cube(reopened._nodule_filepath).source_hash != cube.source_hash
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_cluster.py                                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:05:47 am                                              #
+# Modified   : Saturday October 17th 2026 11:05:47 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.cluster import ClusterCache
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class Annotation:
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+
+class Scan:
+    """Stands in for pl.Scan, counting the calls to cluster_annotations."""
+
+    def __init__(self, id: int, groups: list) -> None:
+        self.id = id
+        self.annotations = [Annotation(i) for group in groups for i in group]
+        self._groups = groups
+        self.calls = 0
+
+    def cluster_annotations(self, tol=None, verbose=True) -> list:
+        self.calls += 1
+        annotations = {annotation.id: annotation for annotation in self.annotations}
+        return [[annotations[i] for i in group] for group in self._groups]
+
+
+# ================================================================================================ #
+#                                    TEST CLUSTER CACHE                                            #
+# ================================================================================================ #
+
+
+@pytest.mark.cluster
+class TestClusterCache:
+    def test_memory_tier(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cache = ClusterCache(maxsize=1)
+        scan_1 = Scan(1, [[3, 1], [2]])
+        scan_2 = Scan(2, [])
+
+        first = cache.get(scan_1)
+        second = cache.get(scan_1)
+        assert [[a.id for a in nodule] for nodule in second] == [[3, 1], [2]]
+        assert second[0][0] is first[0][0]
+        assert scan_1.calls == 1
+        assert cache.hits == 1
+
+        assert cache.get(scan_2) == []
+        assert cache.get(scan_1)
+        assert scan_1.calls == 2  # Evicted by scan 2
+
+        cache.get(scan_1, tol=1.5)
+        assert scan_1.calls == 3  # Tolerance is part of the key
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_disk_tier(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        folder = str(tmp_path / "clusters")
+        scan = Scan(7, [[4], [5, 6]])
+        ClusterCache(folder=folder).get(scan)
+
+        cache = ClusterCache(folder=folder)
+        nodules = cache.get(scan)
+        assert [[a.id for a in nodule] for nodule in nodules] == [[4], [5, 6]]
+        assert scan.calls == 1
+
+        ClusterCache(folder=folder).get(scan, tol=1.5)
+        assert scan.calls == 2  # Tolerance is part of the key
+        filenames = sorted(os.listdir(folder))
+        assert [filename.split("_pylidc_")[0] for filename in filenames] == [
+            "scan_7_tol_1.5",
+            "scan_7_tol_auto",
+        ]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
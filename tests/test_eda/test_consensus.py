@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_consensus.py                                                                  #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:31 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:31 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+import pylidc as pl
+from pylidc.utils import consensus
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.consensus import ConsensusEngine, fill_polygons, CONSENSUS_VOLUME_COLUMNS
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+SHAPE = (64, 64, 20)
+
+
+class Contour:
+    """Stands in for pl.Contour, with its points given as (i, j) index coordinates."""
+
+    def __init__(self, points: list, z: float, inclusion: bool = True) -> None:
+        self.coords = "\n".join("{},{}".format(j, i) for i, j in points)
+        self.image_z_position = z
+        self.inclusion = inclusion
+
+
+class Annotation:
+    def __init__(self, id: int, contours: list) -> None:
+        self.id = id
+        self.contours = contours
+
+
+class Scan:
+    def __init__(self) -> None:
+        self.id = 7
+        self.patient_id = "LIDC-IDRI-0007"
+        # Slices are 2.5mm apart. Contour z positions are matched to the nearest slice.
+        self.slice_zvals = -100.0 + 2.5 * np.arange(SHAPE[2])
+        self.pixel_spacing = 0.5
+        self.slice_spacing = 2.5
+
+
+def square(i: int, j: int, size: int) -> list:
+    """Returns the points along the border of a square, clockwise from its corner at (i, j)."""
+    return (
+        [(i, j + n) for n in range(size - 1)]
+        + [(i + n, j + size - 1) for n in range(size - 1)]
+        + [(i + size - 1, j + size - 1 - n) for n in range(size - 1)]
+        + [(i + size - 1 - n, j) for n in range(size - 1)]
+    )
+
+
+def cube(id: int, corner: tuple, size: int, depth: int, scan: Scan) -> Annotation:
+    """Returns an annotation with a square contour on each of depth slices."""
+    i, j, k = corner
+    return Annotation(
+        id, [Contour(square(i, j, size), scan.slice_zvals[k + n] + 0.1) for n in range(depth)]
+    )
+
+
+# ================================================================================================ #
+#                                   TEST CONSENSUS ENGINE                                          #
+# ================================================================================================ #
+
+
+@pytest.mark.consensus
+class TestConsensusEngine:
+    def test_fill_polygons(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # A square given by its corners, open, and a closed triangle.
+        points = np.array([(1, 1), (1, 4), (4, 4), (4, 1), (0, 0), (0, 6), (6, 0), (0, 0)])
+        filled = fill_polygons(points, np.array([0, 0, 0, 0, 1, 1, 1, 1]), 2, (7, 8))
+        assert filled.shape == (2, 7, 8)
+        # Pixels on the border may be either filled or not, those within it are filled.
+        border = np.zeros((7, 8), dtype=bool)
+        border[1:5, 1:5] = True
+        assert filled[0][2:4, 2:4].all()
+        assert not (filled[0] & ~border).any()
+        # Pixels strictly within the triangle have i + j < 6.
+        ii, jj = np.indices((7, 8))
+        interior = (ii > 0) & (jj > 0) & (ii + jj < 6)
+        assert np.array_equal(filled[1] & interior, interior)
+        assert not (filled[1] & (ii + jj > 6)).any()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_compute(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        scan = Scan()
+        # Two of three readers agree on the 4x4x3 block enclosed by the contours at (20,20,4).
+        # The third reader's contours enclose a block shifted by two voxels along each axis.
+        nodule = [
+            cube(1, (20, 20, 4), 6, 3, scan),
+            cube(2, (20, 20, 4), 6, 3, scan),
+            cube(3, (22, 22, 6), 6, 3, scan),
+        ]
+        # A single reader outlines a ring at the corner of the scan: a square excluding its center.
+        ring = cube(4, (0, 0, 18), 9, 2, scan)
+        for contour in list(ring.contours):
+            ring.contours.append(
+                Contour(square(3, 3, 3), contour.image_z_position, inclusion=False)
+            )
+        engine = ConsensusEngine(confidence_level=0.5, padding=2)
+        first, second = engine.compute(scan, [nodule, [ring]], shape=SHAPE)
+
+        assert first.bbox == (slice(18, 30), slice(18, 30), slice(2, 11))
+        assert first.mask.shape == (12, 12, 9)
+        assert first.mask.sum() == 48
+        assert first.mask[3:7, 3:7, 2:5].all()
+        assert first.annotation_ids == (1, 2, 3)
+        voxel_volume = 0.5**2 * 2.5
+        assert np.allclose(first.mask_volumes, 48 * voxel_volume)
+        assert first.volume == pytest.approx(48 * voxel_volume)
+
+        # The bounding box is clipped to the scan.
+        assert second.bbox == (slice(0, 11), slice(0, 11), slice(16, 20))
+        expected = np.zeros((9, 9), dtype=bool)
+        expected[1:8, 1:8] = True
+        expected[3:6, 3:6] = False
+        assert np.array_equal(second.mask[:9, :9, 2], expected)
+        assert np.array_equal(second.mask[:9, :9, 3], expected)
+        assert second.mask.sum() == 2 * 40
+
+        # At full confidence, only the voxels enclosed by all three readers remain.
+        (strict,) = ConsensusEngine(confidence_level=1.0, padding=2).compute(scan, [nodule])
+        assert strict.mask.sum() == 2 * 2 * 1
+        assert strict.bbox == first.bbox
+
+        # Padding beyond the scan clips the bounding box to the scan, the mask unchanged within.
+        (padded,) = ConsensusEngine(confidence_level=0.5, padding=512).compute(
+            scan, [nodule], shape=SHAPE
+        )
+        assert padded.bbox == tuple(slice(0, n) for n in SHAPE)
+        assert np.array_equal(padded.mask[first.bbox], first.mask)
+        assert padded.mask.sum() == first.mask.sum()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_volumes(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        scan = Scan()
+        nodules = [[cube(1, (20, 20, 4), 6, 3, scan), cube(2, (20, 20, 4), 4, 3, scan)]]
+        engine = ConsensusEngine(confidence_level=0.5, padding=0)
+        volumes = engine.volumes(scan, nodules)
+        assert list(volumes.columns) == CONSENSUS_VOLUME_COLUMNS
+        assert volumes["nodule_id"].tolist() == ["LIDC-IDRI-0007_1"] * 2
+        assert volumes["annotation_id"].tolist() == [1, 2]
+        voxel_volume = 0.5**2 * 2.5
+        assert volumes["mask_volume"].tolist() == pytest.approx(
+            [48 * voxel_volume, 12 * voxel_volume]
+        )
+        # Half of the readers suffice, so the consensus is the larger of the two masks.
+        assert volumes["consensus_volume"].tolist() == pytest.approx([48 * voxel_volume] * 2)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_matches_pylidc(self, monkeypatch, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # pylidc rasterizes contours with np.int, an alias NumPy has since removed.
+        monkeypatch.setattr(np, "int", int, raising=False)
+        # The contours in the database bundled with pylidc are traced from the LIDC XML files.
+        scans = pl.query(pl.Scan).order_by(pl.Scan.id).limit(3).all()
+        clusters = [(scan, scan.cluster_annotations(verbose=False)) for scan in scans]
+        assert sum(len(nodules) for _, nodules in clusters) > 0
+        for confidence_level, padding in [(0.5, 0), (0.5, 10), (0.75, 2)]:
+            engine = ConsensusEngine(confidence_level=confidence_level, padding=padding)
+            for scan, nodules in clusters:
+                for result, annotations in zip(engine.compute(scan, nodules), nodules):
+                    mask, bbox, _ = consensus(annotations, clevel=confidence_level, pad=padding)
+                    assert result.bbox == bbox
+                    assert np.array_equal(result.mask, mask)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_cube.py                                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:54 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:54 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+
+# Enter imports for modules and classes being tested here
+from lcd.eda import FEATURE_COLUMNS
+from lcd.eda.aggregate import at_least_n_readers
+from lcd.eda.cube import SummaryCube, DESCRIBE_STATISTICS, SKETCH_ACCURACY, cube_filepath
+from lcd.utils.log_config import LOG_CONFIG
+from benchmarks.synthetic import make_annotation_data
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.fixture(scope="module")
+def annotations():
+    return make_annotation_data(2000, seed=5)
+
+
+# ================================================================================================ #
+#                                    TEST SUMMARY CUBE                                             #
+# ================================================================================================ #
+
+
+@pytest.mark.cube
+class TestSummaryCube:
+    def test_build(self, annotations, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cube = SummaryCube.build(annotations, source_hash="abc")
+        assert cube.biomarkers == FEATURE_COLUMNS
+        assert cube.source_hash == "abc"
+        # Each biomarker's cells tally every row once.
+        totals = cube.cells.groupby("biomarker")["count"].sum()
+        assert (totals == len(annotations)).all()
+        assert cube_filepath("/data/nodules.parquet") == "/data/nodules_cube.npz"
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_reader_counts(self, annotations, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cube = SummaryCube.build(annotations)
+        n_readers = annotations["n_readers"].to_numpy()
+        assert np.array_equal(cube.reader_counts(), at_least_n_readers(n_readers))
+        for biomarker in ["calcification", "malignancy"]:
+            expected = at_least_n_readers(n_readers, annotations[biomarker].to_numpy())
+            assert np.array_equal(cube.reader_counts(biomarker), expected)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_describe(self, annotations, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cube = SummaryCube.build(annotations)
+        selected = annotations[
+            (annotations["n_readers"] >= 2) & (annotations["diagnosis"] == "Malignant")
+        ]
+        expected = selected.groupby("malignancy")["diameter"].describe()
+        stats = cube.describe(by="malignancy", min_readers=2, diagnosis=["Malignant"])
+        assert list(stats.columns) == DESCRIBE_STATISTICS
+        assert list(stats.index) == list(expected.index)
+        exact = ["count", "mean", "std", "min", "max"]
+        assert np.allclose(stats[exact], expected[exact])
+        quartiles = ["25%", "50%", "75%"]
+        assert np.allclose(stats[quartiles], expected[quartiles], rtol=SKETCH_ACCURACY, atol=0)
+
+        overall = cube.describe()
+        assert overall.loc[0, "count"] == len(annotations)
+        assert np.isclose(overall.loc[0, "mean"], annotations["diameter"].mean())
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_save_load(self, annotations, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cube = SummaryCube.build(annotations, source_hash="abc")
+        filepath = str(tmp_path / "annotations_cube.npz")
+        cube.save(filepath)
+        loaded = SummaryCube.load(filepath)
+        assert loaded.source_hash == "abc"
+        assert loaded.cells.astype(str).equals(cube.cells.astype(str))
+        assert loaded.describe(by="diagnosis").equals(cube.describe(by="diagnosis"))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
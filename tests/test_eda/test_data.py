@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_data.py                                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 07:48:37 pm                                              #
+# Modified   : Saturday October 17th 2026 07:48:37 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import pandas as pd
+import pylidc as pl
+
+# Enter imports for modules and classes being tested here
+import lcd.eda.data
+from lcd.eda import CASE_COLUMNS
+from lcd.eda.data import LIDCData, query_scans
+from lcd.eda.dtypes import compact
+from lcd.utils.log_config import LOG_CONFIG
+from benchmarks.synthetic import make_database, make_scans
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.fixture
+def data(monkeypatch):
+    """LIDCData over synthetic scans, clustered without the database or the cluster cache."""
+    scans = make_scans(500, seed=3)
+    monkeypatch.setattr(lcd.eda.data, "cluster_annotations", lambda scan: scan.nodules)
+    data = LIDCData(use_checkpoints=False)
+    data._non_nodule_cases = frozenset()
+    data._iter_scans = lambda: iter(scans)
+    data.scans = scans
+    return data
+
+
+def cluster_by_nodule(scan: pl.Scan) -> list:
+    """Clusters the annotations of a scan from the synthetic database by their nodule."""
+    nodules = {}
+    for annotation in sorted(scan.annotations, key=lambda annotation: annotation.id):
+        nodules.setdefault(annotation._nodule_id, []).append(annotation)
+    return list(nodules.values())
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A synthetic pylidc database, from which LIDCData builds in this and worker processes.
+
+    The database holds no contours, so the measures pylidc derives from them are replaced by
+    functions of the annotation id. Worker processes are forked, so inherit the replacements.
+    """
+    filepath = str(tmp_path / "pylidc.sqlite")
+    session = make_database(filepath, make_scans(120, seed=5))
+    monkeypatch.setattr(pl, "_dbpath", filepath)
+    monkeypatch.setattr(lcd.eda.data, "cluster_annotations", cluster_by_nodule)
+    monkeypatch.setattr(pl.Annotation, "diameter", property(lambda a: 3.0 + a.id % 37))
+    monkeypatch.setattr(pl.Annotation, "volume", property(lambda a: 10.0 * a.id))
+    monkeypatch.setattr(pl.Annotation, "surface_area", property(lambda a: 5.0 * a.id))
+    monkeypatch.setattr(pl.Scan, "slice_spacing", property(lambda s: s.slice_thickness))
+    return session
+
+
+def build_from(session, tmp_path, **kwargs) -> LIDCData:
+    """Builds the annotation and nodule data from the synthetic database."""
+    data = LIDCData(timing=False, **kwargs)
+    data._non_nodule_cases = frozenset(["LIDC-IDRI-0002"])
+    data._checkpoint_folder = str(tmp_path / "checkpoints")
+    data._get_scans = lambda: query_scans(session=session)
+    data._build_annotation_data()
+    data._build_nodule_data()
+    return data
+
+
+# ================================================================================================ #
+#                                      TEST LIDC DATA                                              #
+# ================================================================================================ #
+
+
+@pytest.mark.data
+class TestLIDCData:
+    def test_iter_batches(self, data, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = str(tmp_path / "annotations.parquet")
+        batches = list(data.iter_batches(batch_size=100, filepath=filepath))
+        assert len(batches) > 1
+        assert all(len(batch) >= 100 for batch in batches[:-1])
+
+        data._annotation_records.clear()
+        for scan in data.scans:
+            data._create_nodule_annotations(scan, scan.nodules)
+        expected = data._decode_semantic_features(data._annotation_records.to_frame())
+
+        # Each batch holds the ids it contains as its categories, so the union is compacted again.
+        streamed = compact(pd.concat(batches, ignore_index=True))
+        assert streamed.equals(expected)
+        stored = pd.read_parquet(filepath)
+        assert stored.astype(str).equals(expected.astype(str))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_build_case_data(self, data, monkeypatch, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        class DirectoryStats:
+            def __init__(self, folder, **kwargs):
+                pass
+
+            def compute(self, names):
+                return pd.DataFrame(
+                    {"name": names, "n_files": [100] * len(names), "total_size": [5] * len(names)}
+                )
+
+        monkeypatch.setattr(lcd.eda.data, "DirectoryStats", DirectoryStats)
+        data._nodule_data = pd.DataFrame(
+            {
+                "patient_id": ["LIDC-IDRI-0001", "LIDC-IDRI-0001", "LIDC-IDRI-0002"],
+                "diagnosis": ["Benign", "Malignant", "Malignant"],
+            }
+        )
+        data._non_nodule_data = pd.DataFrame(
+            {"patient_id": ["LIDC-IDRI-0004"], "diagnosis": ["Benign"]}
+        )
+        data._small_nodule_data = pd.DataFrame(
+            {"patient_id": ["LIDC-IDRI-0003"], "diagnosis": ["Benign"]}
+        )
+        data._build_case_data()
+
+        cases = data._case_data.set_index("patient_id")
+        assert list(data._case_data.columns) == CASE_COLUMNS
+        assert list(cases.index) == [
+            "LIDC-IDRI-0001",
+            "LIDC-IDRI-0002",
+            "LIDC-IDRI-0003",
+            "LIDC-IDRI-0004",
+        ]
+        assert cases["total_nodules"].tolist() == [2, 1, 1, 0]
+        assert cases["n_nodules_lt_3mm"].tolist() == [0, 0, 1, 0]
+        assert cases["n_nodules_ge_3mm"].tolist() == [2, 1, 0, 0]
+        assert cases["n_non_nodules_ge_3mm"].tolist() == [0, 0, 0, 1]
+        assert cases["n_nodules_benign"].tolist() == [1, 0, 1, 0]
+        assert cases["n_nodules_malignant"].tolist() == [1, 1, 0, 0]
+        assert cases["n_images"].tolist() == [100] * 4
+
+        timings = data.timings.set_index("stage")
+        assert timings.loc["LIDCData._build_case_data", "count"] == 1
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_parallel_build(self, database, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        serial = build_from(database, tmp_path, workers=1, use_checkpoints=False)
+        parallel = build_from(database, tmp_path, workers=2, use_checkpoints=False)
+        assert len(serial._annotation_data) >= 120
+        assert (serial._annotation_data["nodule_classification"] == "non_nodule").any()
+        pd.testing.assert_frame_equal(parallel._annotation_data, serial._annotation_data)
+        pd.testing.assert_frame_equal(parallel._nodule_data, serial._nodule_data)
+        pd.testing.assert_frame_equal(parallel._non_nodule_data, serial._non_nodule_data)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_resume_from_checkpoints(self, database, tmp_path, monkeypatch, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        expected = build_from(database, tmp_path, use_checkpoints=False)
+
+        # The first build is interrupted while processing its sixth scan.
+        processed = []
+        process_scan = LIDCData._process_scan
+
+        def interrupted(self, scan):
+            if len(processed) == 5:
+                raise KeyboardInterrupt
+            processed.append(scan.id)
+            return process_scan(self, scan)
+
+        monkeypatch.setattr(LIDCData, "_process_scan", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            build_from(database, tmp_path)
+        completed = list(processed)
+        assert len(completed) == 5
+
+        # The resumed build processes only the scans of the patients not yet checkpointed.
+        processed.clear()
+
+        def counted(self, scan):
+            processed.append(scan.id)
+            return process_scan(self, scan)
+
+        monkeypatch.setattr(LIDCData, "_process_scan", counted)
+        resumed = build_from(database, tmp_path)
+        assert processed
+        assert not set(processed) & set(completed)
+        assert len(processed) + len(completed) == database.query(pl.Scan).count()
+        pd.testing.assert_frame_equal(resumed._annotation_data, expected._annotation_data)
+        pd.testing.assert_frame_equal(resumed._nodule_data, expected._nodule_data)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
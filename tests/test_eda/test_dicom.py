@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_dicom.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:31:48 pm                                              #
+# Modified   : Saturday October 17th 2026 10:31:48 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.dicom import DicomIndex
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+SERIES_UID = generate_uid()
+STUDY_UID = generate_uid()
+
+
+def write_dicom(filepath: str, instance_number: int, z: float) -> None:
+    ds = Dataset()
+    ds.file_meta = FileMetaDataset()
+    ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    ds.file_meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.2"
+    ds.file_meta.MediaStorageSOPInstanceUID = generate_uid()
+    ds.PatientID = "LIDC-IDRI-0001"
+    ds.StudyInstanceUID = STUDY_UID
+    ds.SeriesInstanceUID = SERIES_UID
+    ds.InstanceNumber = instance_number
+    ds.ImagePositionPatient = [-150.0, -150.0, z]
+    ds.SliceThickness = 2.5
+    ds.PixelSpacing = [0.7, 0.7]
+    ds.Rows = ds.Columns = 4
+    ds.BitsAllocated = ds.BitsStored = 16
+    ds.HighBit = 15
+    ds.PixelRepresentation = 0
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.PixelData = np.zeros((4, 4), dtype=np.uint16).tobytes()
+    ds.save_as(filepath, enforce_file_format=True)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    series = tmp_path / "raw" / "LIDC-IDRI-0001" / "study" / "series"
+    series.mkdir(parents=True)
+    # Instances 3 and 4 share a slice location. Instance 3 is kept.
+    for instance_number, z in [(1, -95.0), (2, -100.0), (3, -97.5), (4, -97.5)]:
+        write_dicom(str(series / "{}.dcm".format(instance_number)), instance_number, z)
+    (series / "annotations.xml").write_text("<xml/>")
+    return str(tmp_path / "raw")
+
+
+@pytest.mark.dicom
+class TestDicomIndex:
+    def test_update(self, folder, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        index_filepath = str(tmp_path / "dicom_index.parquet")
+        dicom_index = DicomIndex(folder=folder, index_filepath=index_filepath, workers=2)
+        index = dicom_index.update()
+        assert len(index) == 4
+        assert set(index["series_instance_uid"]) == {SERIES_UID}
+        assert index["pixel_spacing"].tolist() == [0.7] * 4
+
+        files = [os.path.basename(f) for f in dicom_index.series_files(SERIES_UID, STUDY_UID)]
+        assert files == ["2.dcm", "3.dcm", "1.dcm"]
+
+        # Only new or modified files are read again. Deleted files are removed.
+        series = os.path.join(folder, "LIDC-IDRI-0001", "study", "series")
+        os.remove(os.path.join(series, "4.dcm"))
+        write_dicom(os.path.join(series, "5.dcm"), 5, -92.5)
+        dicom_index = DicomIndex(folder=folder, index_filepath=index_filepath)
+        read = []
+        read_header = dicom_index._read_header
+        dicom_index._read_header = lambda filepath: read.append(filepath) or read_header(filepath)
+        index = dicom_index.update()
+        assert read == [os.path.join(series, "5.dcm")]
+        assert sorted(os.path.basename(f) for f in index["filepath"]) == [
+            "1.dcm",
+            "2.dcm",
+            "3.dcm",
+            "5.dcm",
+        ]
+        assert (
+            index.set_index("filepath").loc[os.path.join(series, "5.dcm"), "slice_location"]
+            == -92.5
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
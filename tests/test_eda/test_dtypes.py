@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_dtypes.py                                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:48 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:48 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+import pandas as pd
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.dtypes import compact, expand, memory_report, MEMORY_REPORT_COLUMNS
+from lcd.utils.log_config import LOG_CONFIG
+from benchmarks.synthetic import make_annotation_data
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+# ================================================================================================ #
+#                                       TEST DTYPES                                                #
+# ================================================================================================ #
+
+
+@pytest.mark.dtypes
+class TestDtypes:
+    def test_compact(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        data = make_annotation_data(500, seed=5)
+        assert isinstance(data["Malignancy"].dtype, pd.CategoricalDtype)
+        assert data["Malignancy"].cat.ordered
+        assert data["malignancy"].dtype == np.int8
+        assert data["annotation_id"].dtype == np.int32
+        assert isinstance(data["patient_id"].dtype, pd.CategoricalDtype)
+
+        default = expand(data)
+        assert default["malignancy"].dtype == np.int64
+        assert not isinstance(default["patient_id"].dtype, pd.CategoricalDtype)
+        compacted = compact(default)
+        assert compacted.astype(str).equals(data.astype(str))
+        assert list(compacted.dtypes.astype(str)) == list(data.dtypes.astype(str))
+        # Columns without a compact dtype are unchanged.
+        assert compacted["diameter"].dtype == np.float64
+        assert compact(data) is data
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_memory_report(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        data = make_annotation_data(500, seed=5)
+        report = memory_report(data).set_index("column")
+        assert list(report.reset_index().columns) == MEMORY_REPORT_COLUMNS
+        assert list(report.index) == list(data.columns) + ["Total"]
+        assert report.loc["malignancy", "dtype"] == "int64"
+        assert report.loc["malignancy", "compact_dtype"] == "int8"
+        assert report.loc["malignancy", "bytes"] == 8 * report.loc["malignancy", "compact_bytes"]
+        assert report.loc["diameter", "saving"] == 0
+        assert (report["saving"] >= 0).all()
+        assert (
+            report.loc["Total", "bytes"] == expand(data).memory_usage(index=False, deep=True).sum()
+        )
+        assert (
+            report.loc["Total", "compact_bytes"] == data.memory_usage(index=False, deep=True).sum()
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_index.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:24:40 pm                                              #
+# Modified   : Saturday October 17th 2026 11:24:40 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+import pandas as pd
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.index import TableIndex
+from lcd.eda.storage import get_storage
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.mark.index
+class TestTableIndex:
+    def test_rows(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Patient 2 has two scans whose rows are not contiguous.
+        data = pd.DataFrame(
+            {
+                "patient_id": ["P2", "P1", "P1", "P2", "P3"],
+                "scan_id": [20, 10, 10, 21, 30],
+                "diameter": [1.0, 2.0, 3.0, 4.0, 5.0],
+            }
+        )
+        index = TableIndex.build(data)
+        assert index.columns == ["patient_id", "scan_id"]
+        assert index.rows("patient_id", "P2").tolist() == [0, 3]
+        assert index.rows("scan_id", 10).tolist() == [1, 2]
+        assert index.rows("patient_id", "P9").tolist() == []
+
+        storage = get_storage("parquet")
+        filepath = str(tmp_path / "index.parquet")
+        storage.write(index.to_frame(), filepath)
+        restored = TableIndex.from_frame(storage.read(filepath))
+        for column in ["patient_id", "scan_id"]:
+            for value in data[column]:
+                assert np.array_equal(restored.rows(column, value), index.rows(column, value))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_patient.py                                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 07:21:04 pm                                              #
+# Modified   : Saturday October 17th 2026 07:21:04 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.patient import Patient
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+# ================================================================================================ #
+#                                       TEST PATIENT                                               #
+# ================================================================================================ #
+
+
+@pytest.mark.patient
+class TestPatient:
+    def test_load_many(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        ids = ["3", "1", "3", "2"]
+        patients = Patient.load_many(ids)
+        assert list(patients) == ["LIDC-IDRI-0003", "LIDC-IDRI-0001", "LIDC-IDRI-0002"]
+        for pid, patient in patients.items():
+            expected = Patient(pid[-4:])
+            assert patient.pid == expected.pid
+            assert patient.scan.id == expected.scan.id
+            assert "annotations" in patient.scan.__dict__
+            assert [a.id for a in patient.scan.annotations] == [
+                a.id for a in expected.scan.annotations
+            ]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
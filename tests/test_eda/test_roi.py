@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_roi.py                                                                        #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 08:31:19 pm                                              #
+# Modified   : Saturday October 17th 2026 08:31:19 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+
+# Enter imports for modules and classes being tested here
+import lcd.eda.roi
+from lcd.eda.roi import ROIExtractor, load_image, load_mask
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+SHAPE = (32, 32, 16)
+
+
+class Contour:
+    """Stands in for pl.Contour, with its points given as (i, j) index coordinates."""
+
+    def __init__(self, points: list, z: float, inclusion: bool = True) -> None:
+        self.coords = "\n".join("{},{}".format(j, i) for i, j in points)
+        self.image_z_position = z
+        self.inclusion = inclusion
+
+
+class Annotation:
+    """Stands in for pl.Annotation with a square contour on each of its slices."""
+
+    def __init__(self, id: int, corner: tuple, size: int) -> None:
+        i, j, k = corner
+        square = (
+            [(i, j + n) for n in range(size - 1)]
+            + [(i + n, j + size - 1) for n in range(size - 1)]
+            + [(i + size - 1, j + size - 1 - n) for n in range(size - 1)]
+            + [(i + size - 1 - n, j) for n in range(size - 1)]
+        )
+        self.id = id
+        self.contours = [Contour(square, z=2.0 * (k + n)) for n in range(size - 2)]
+
+
+class Scan:
+    def __init__(self, nodules: list, id: int = 1) -> None:
+        self.id = id
+        self.patient_id = "LIDC-IDRI-0001"
+        self.slice_zvals = 2.0 * np.arange(SHAPE[2])
+        self.pixel_spacing = 0.7
+        self.slice_spacing = 2.0
+        self.nodules = nodules
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.setattr(lcd.eda.roi, "cluster_annotations", lambda scan: scan.nodules)
+    extractor = ROIExtractor(
+        confidence_level=0.5,
+        padding=2,
+        images_folder=str(tmp_path / "images"),
+        masks_folder=str(tmp_path / "masks"),
+    )
+    volume = np.arange(np.prod(SHAPE), dtype=np.int32).reshape(SHAPE) - 1024
+    extractor.loads = 0
+
+    def load_volume(scan):
+        extractor.loads += 1
+        return volume
+
+    extractor._load_volume = load_volume
+    extractor.volume = volume
+    return extractor
+
+
+# ================================================================================================ #
+#                                   TEST ROI EXTRACTOR                                             #
+# ================================================================================================ #
+
+
+@pytest.mark.roi
+class TestROIExtractor:
+    def test_extract_scan(self, extractor, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        (tmp_path / "images").mkdir()
+        (tmp_path / "masks").mkdir()
+        # Two of three readers agree on the 4x4x4 cube enclosed by the contours at (10,10,5).
+        nodule = [
+            Annotation(1, (10, 10, 5), 6),
+            Annotation(2, (10, 10, 5), 6),
+            Annotation(3, (12, 12, 6), 6),
+        ]
+        scan = Scan([nodule, [Annotation(4, (24, 24, 10), 3)]])
+        stats = extractor._extract_scan(scan)
+        assert stats["n_nodules"] == 2
+        assert extractor.loads == 1
+
+        image = load_image(str(tmp_path / "images" / "LIDC-IDRI-0001_1_1.npy"))
+        mask = load_mask(str(tmp_path / "masks" / "LIDC-IDRI-0001_1_1.npz"))
+        assert image.dtype == np.int16
+        assert image.shape == mask.shape == (12, 12, 9)
+        assert np.array_equal(image, extractor.volume[8:20, 8:20, 3:12])
+        assert mask.sum() == 64
+        assert mask[3:7, 3:7, 2:6].all()
+        assert stats["n_voxels"] == image.size + 7 * 7 * 5
+
+        # Extracted nodules are skipped without loading the volume.
+        stats = extractor._extract_scan(scan)
+        assert stats["n_nodules"] == 0
+        assert extractor.loads == 1
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_scans_of_a_patient(self, extractor, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        (tmp_path / "images").mkdir()
+        (tmp_path / "masks").mkdir()
+        # Two scans of the same patient, each with a first nodule of a different size.
+        first = Scan([[Annotation(1, (10, 10, 5), 6)]], id=1)
+        second = Scan([[Annotation(2, (10, 10, 5), 4)]], id=2)
+        assert extractor._extract_scan(first)["n_nodules"] == 1
+        assert extractor._extract_scan(second)["n_nodules"] == 1
+        assert extractor.loads == 2
+
+        first_mask = load_mask(str(tmp_path / "masks" / "LIDC-IDRI-0001_1_1.npz"))
+        second_mask = load_mask(str(tmp_path / "masks" / "LIDC-IDRI-0001_2_1.npz"))
+        assert first_mask.sum() == 4 * 4 * 4
+        assert second_mask.sum() == 2 * 2 * 2
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
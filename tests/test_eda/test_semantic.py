@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_semantic.py                                                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 12:31:09 pm                                              #
+# Modified   : Saturday October 17th 2026 12:31:09 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+import pandas as pd
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.data import SemanticFeatures
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.mark.semantic
+class TestSemanticFeatures:
+    def test_scalar(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        features = SemanticFeatures()
+        assert features.Subtlety(0) == "NA"
+        assert features.Subtlety(5) == "Obvious"
+        assert features.InternalStructure(np.int64(4)) == "Air"
+        assert features.Calcification(6) == "Absent"
+        assert features.Malignancy(3) == "Indeterminate"
+        with pytest.raises(AssertionError):
+            features.InternalStructure(5)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_decode(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        features = SemanticFeatures()
+        scores = pd.Series([1, 5, 0, 3])
+        assert features.decode("texture", scores).tolist() == [features.Texture(s) for s in scores]
+        assert features.decode("malignancy", scores, with_score=True).tolist() == [
+            "1-Highly Unlikely",
+            "5-Highly Suspicious",
+            "0-NA",
+            "3-Indeterminate",
+        ]
+
+        categorical = features.categorical("sphericity", scores)
+        assert categorical.ordered
+        assert list(categorical.categories) == [
+            "NA",
+            "Linear",
+            "Ovoid/Linear",
+            "Ovoid",
+            "Ovoid/Round",
+            "Round",
+        ]
+        assert categorical.tolist() == ["Linear", "Round", "NA", "Ovoid"]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_out_of_bounds(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        features = SemanticFeatures()
+        with pytest.raises(ValueError) as e:
+            features.decode("internalStructure", [1, 7, 2, -1, 2.5, np.nan])
+        assert "rows [1, 3, 4, 5]" in str(e.value)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_storage.py                                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 01:20:36 pm                                              #
+# Modified   : Saturday October 17th 2026 01:20:36 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import pandas as pd
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.storage import get_storage, Storage, SMALL_NODULE_SCHEMA
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.fixture
+def small_nodules():
+    return pd.DataFrame(
+        {
+            "patient_id": ["LIDC-IDRI-0001", "LIDC-IDRI-0002"],
+            "scan_id": [1, 2],
+            "nodule_classification": ["small nodule", "small nodule"],
+            "nodule_id": ["LIDC-IDRI-0001-0", "LIDC-IDRI-0002-0"],
+            "malignancy": [1, 1],
+            "Malignancy": ["1-Highly Unlikely", "1-Highly Unlikely"],
+            "diameter": ["<3mm", "<3mm"],
+            "diagnosis": ["Benign", "Benign"],
+        }
+    )
+
+
+@pytest.mark.storage
+class TestStorage:
+    @pytest.mark.parametrize("storage_format", ["csv", "parquet", "feather"])
+    def test_round_trip(self, storage_format, small_nodules, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        storage = get_storage(storage_format)
+        filepath = storage.filepath(str(tmp_path / "small_nodules.csv"))
+        assert filepath.endswith("." + storage_format)
+
+        storage.write(small_nodules, filepath, SMALL_NODULE_SCHEMA)
+        data = storage.read(filepath)
+        assert data.astype(str).equals(small_nodules.astype(str))
+
+        data = storage.read(filepath, columns=["patient_id", "diagnosis"])
+        assert list(data.columns) == ["patient_id", "diagnosis"]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    @pytest.mark.parametrize("storage_format", ["parquet", "feather"])
+    def test_schema(self, storage_format, small_nodules, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        storage = get_storage(storage_format)
+        filepath = storage.filepath(str(tmp_path / "small_nodules"))
+        storage.write(small_nodules, filepath, SMALL_NODULE_SCHEMA)
+        data = storage.read(filepath)
+
+        assert data["scan_id"].dtype == "int64"
+        for column in ["nodule_classification", "Malignancy", "diameter", "diagnosis"]:
+            assert isinstance(data[column].dtype, pd.CategoricalDtype)
+
+        # The columns of an empty frame take the types of the schema.
+        empty = pd.DataFrame({column: [] for column in small_nodules.columns})
+        storage.write(empty, filepath, SMALL_NODULE_SCHEMA)
+        data = storage.read(filepath)
+        assert data.empty
+        assert data["scan_id"].dtype == "int64"
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    @pytest.mark.parametrize("storage_format", ["csv", "parquet", "feather"])
+    def test_writer(self, storage_format, small_nodules, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        storage = get_storage(storage_format)
+        filepath = storage.filepath(str(tmp_path / "small_nodules"))
+        with storage.writer(filepath, SMALL_NODULE_SCHEMA) as writer:
+            writer.write(small_nodules.iloc[:1])
+            writer.write(small_nodules.iloc[1:])
+
+        data = storage.read(filepath)
+        assert data.astype(str).equals(small_nodules.astype(str))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_unknown_format(self, caplog):
+        with pytest.raises(KeyError):
+            get_storage("xlsx")
+
+    def test_incomplete_storage(self, caplog):
+        class ReadOnlyStorage(Storage):
+            extension = ".txt"
+
+            def read(self, filepath, columns=None, filters=None):
+                return pd.DataFrame()
+
+        with pytest.raises(TypeError):
+            ReadOnlyStorage()
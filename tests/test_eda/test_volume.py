@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_volume.py                                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:04:55 pm                                              #
+# Modified   : Saturday October 17th 2026 09:04:55 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+
+# Enter imports for modules and classes being tested here
+from lcd.eda.volume import VolumeStore
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class Image:
+    """Stands in for a pydicom dataset."""
+
+    def __init__(self, pixel_array: np.ndarray, z: float) -> None:
+        self.pixel_array = pixel_array
+        self.RescaleSlope = 1.0
+        self.RescaleIntercept = -1024.0
+        self.ImagePositionPatient = [0.0, 0.0, z]
+
+
+class Scan:
+    """Stands in for pl.Scan, counting the calls to load_all_dicom_images."""
+
+    def __init__(self, n_slices: int) -> None:
+        self.id = 7
+        self.patient_id = "LIDC-IDRI-0007"
+        self.pixel_spacing = 0.7
+        self.slice_thickness = 2.5
+        self.slice_spacing = 2.5
+        rng = np.random.default_rng(0)
+        self.images = [
+            Image(rng.integers(0, 3000, (16, 16), dtype=np.uint16), -100 + 2.5 * k)
+            for k in range(n_slices)
+        ]
+        self.loads = 0
+
+    def load_all_dicom_images(self, verbose=True) -> list:
+        self.loads += 1
+        return self.images
+
+    def to_volume(self) -> np.ndarray:
+        return np.stack(
+            [x.pixel_array * x.RescaleSlope + x.RescaleIntercept for x in self.images], axis=-1
+        ).astype(np.int16)
+
+
+# ================================================================================================ #
+#                                     TEST VOLUME STORE                                            #
+# ================================================================================================ #
+
+
+@pytest.mark.volume
+class TestVolumeStore:
+    def test_get(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        store = VolumeStore(folder=str(tmp_path))
+        scan = Scan(n_slices=5)
+        assert scan.id not in store
+
+        volume = store.get(scan)
+        assert isinstance(volume, np.memmap)
+        assert volume.dtype == np.int16
+        assert np.array_equal(volume, scan.to_volume())
+
+        # Stored volumes are read without loading the DICOM images again.
+        volume = store.get(scan)
+        assert scan.loads == 1
+        bbox = (slice(2, 6), slice(3, 9), slice(1, 4))
+        assert np.array_equal(store.read(scan.id, bbox), scan.to_volume()[bbox])
+
+        info = store.info(scan.id)
+        assert info["shape"] == [16, 16, 5]
+        assert info["slice_zvals"] == [-100.0, -97.5, -95.0, -92.5, -90.0]
+        assert store.index()["scan_id"].tolist() == [7]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_prep_notebooks.py                                                             #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:58 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:58 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+import nbformat as nbf
+
+# Enter imports for modules and classes being tested here
+from jbook.prep_notebooks import prepare_notebooks
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+def write_notebook(path, sources: list) -> None:
+    ntbk = nbf.v4.new_notebook()
+    ntbk.cells = [nbf.v4.new_code_cell(source) for source in sources]
+    nbf.write(ntbk, str(path))
+
+
+def read_tags(path) -> list:
+    return [cell["metadata"].get("tags", []) for cell in nbf.read(str(path), nbf.NO_CONVERT).cells]
+
+
+@pytest.mark.prep_notebooks
+class TestPrepareNotebooks:
+    def test_prepare_notebooks(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        folder = tmp_path / "book"
+        os.makedirs(folder / "chapter")
+        manifest = str(tmp_path / "manifest.json")
+        tagged = folder / "chapter" / "tagged.ipynb"
+        untagged = folder / "untagged.ipynb"
+        write_notebook(
+            tagged, ["# HIDE-CELL\n# Imports\nimport os", "x = 1", "# GLUE # HIDE-INPUT"]
+        )
+        write_notebook(untagged, ["x = 1"])
+
+        written = prepare_notebooks(str(folder), workers=2, manifest_filepath=manifest)
+        assert written == [str(tagged)]
+        assert read_tags(tagged) == [["hide-cell"], [], ["remove-cell", "hide-input"]]
+        assert read_tags(untagged) == [[]]
+
+        # Unchanged notebooks are skipped; a changed notebook is tagged again.
+        mtime_ns = os.stat(tagged).st_mtime_ns
+        assert prepare_notebooks(str(folder), workers=2, manifest_filepath=manifest) == []
+        assert os.stat(tagged).st_mtime_ns == mtime_ns
+        write_notebook(untagged, ["# REMOVE-OUTPUT\nprint(1)"])
+        written = prepare_notebooks(str(folder), workers=1, manifest_filepath=manifest)
+        assert written == [str(untagged)]
+        assert read_tags(untagged) == [["remove-output"]]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
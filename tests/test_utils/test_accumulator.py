@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_accumulator.py                                                                #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:02:11 am                                              #
+# Modified   : Saturday October 17th 2026 09:02:11 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+import numpy as np
+
+# Enter imports for modules and classes being tested here
+from lcd.utils.accumulator import ColumnAccumulator
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.mark.accumulator
+class TestColumnAccumulator:
+    def test_append_to_frame(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        acc = ColumnAccumulator(["patient_id", "nodule_id", "diameter"])
+        acc.append({"patient_id": "LIDC-IDRI-0001", "nodule_id": "LIDC-IDRI-0001_1"})
+        acc.append({"patient_id": "LIDC-IDRI-0002", "diameter": 4.5})
+        df = acc.to_frame()
+
+        assert len(acc) == 2
+        assert list(df.columns) == ["patient_id", "nodule_id", "diameter"]
+        assert df["patient_id"].tolist() == ["LIDC-IDRI-0001", "LIDC-IDRI-0002"]
+        assert np.isnan(df["diameter"].iloc[0])
+        assert df["diameter"].iloc[1] == 4.5
+
+        with pytest.raises(ValueError):
+            acc.append({"unknown": 1})
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_extend_and_clear(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        a = ColumnAccumulator(["x", "y"], dtypes={"x": "int64"})
+        b = ColumnAccumulator(["x", "y"])
+        a.append({"x": 1, "y": "a"})
+        b.append({"x": 2, "y": "b"})
+        b.append({"x": 3, "y": "c"})
+        a.extend(b)
+        a.extend({"x": [4], "y": ["d"]})
+
+        df = a.to_frame()
+        assert df["x"].tolist() == [1, 2, 3, 4]
+        assert df["x"].dtype == "int64"
+        assert len(a) == 4
+
+        with pytest.raises(ValueError):
+            a.extend({"y": [1], "x": [1]})
+
+        a.clear()
+        assert len(a) == 0
+        assert a.to_frame().empty
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_checkpoint.py                                                                 #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:14:32 am                                              #
+# Modified   : Saturday October 17th 2026 10:14:32 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+
+# Enter imports for modules and classes being tested here
+from lcd.utils.checkpoint import CheckpointStore, fingerprint
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.mark.checkpoint
+class TestCheckpointStore:
+    def test_save_load_resume(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        folder = str(tmp_path / "checkpoints")
+        store = CheckpointStore(folder=folder, fingerprint="abc")
+        manifest = open(os.path.join(folder, "manifest.json")).read()
+        store.save("LIDC-IDRI-0001", {1: ({"x": [1]}, {"x": []})})
+        store.save("LIDC-IDRI-0002", {2: ({"x": [2]}, {"x": []})})
+        # Saves append their keys without rewriting the manifest.
+        assert open(os.path.join(folder, "manifest.json")).read() == manifest
+        # A key cut short by an interrupted append is not completed.
+        with open(os.path.join(folder, "keys.txt"), "a") as f:
+            f.write("LIDC-IDRI-00")
+
+        store = CheckpointStore(folder=folder, fingerprint="abc")
+        assert store.keys == {"LIDC-IDRI-0001", "LIDC-IDRI-0002"}
+        store.save("LIDC-IDRI-0003", {})
+        assert CheckpointStore(folder=folder, fingerprint="abc").keys == {
+            "LIDC-IDRI-0001",
+            "LIDC-IDRI-0002",
+            "LIDC-IDRI-0003",
+        }
+        assert "LIDC-IDRI-0001" in store
+        assert store.load("LIDC-IDRI-0002") == {2: ({"x": [2]}, {"x": []})}
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_fingerprint_invalidates(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        config = tmp_path / "pylidc.conf"
+        config.write_text("[pylidc]\nconfidence_level = 0.5\n")
+        before = fingerprint(str(config))
+        folder = str(tmp_path / "checkpoints")
+        CheckpointStore(folder=folder, fingerprint=before).save("LIDC-IDRI-0001", {})
+
+        config.write_text("[pylidc]\nconfidence_level = 0.75\n")
+        after = fingerprint(str(config))
+        assert before != after
+        assert fingerprint(str(config), version="2") != after
+
+        store = CheckpointStore(folder=folder, fingerprint=after)
+        assert store.keys == set()
+        assert not os.path.exists(os.path.join(folder, "LIDC-IDRI-0001.pkl"))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
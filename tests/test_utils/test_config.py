@@ -15,13 +15,22 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+import os
 import inspect
 import pytest
 import logging
 import logging.config
+import dataclasses
 
 # Enter imports for modules and classes being tested here
-from lcd.utils.config import DataConfig, PylidcConfig
+import lcd.utils.config
+from lcd.utils.config import (
+    DataConfig,
+    PylidcConfig,
+    config_cache,
+    install_config_cache,
+    load_pylidc_settings,
+)
 from lcd.utils.log_config import LOG_CONFIG
 
 # ------------------------------------------------------------------------------------------------ #
@@ -87,3 +96,51 @@ class TestConfig:
         assert padding == config.padding
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_settings_cache(self, tmp_path, monkeypatch, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = tmp_path / "pylidc.conf"
+        filepath.write_text("[pylidc]\nconfidence_level = 0.5\npadding = 10\n")
+        settings = load_pylidc_settings(str(filepath))
+        assert load_pylidc_settings(str(filepath)) is settings
+        assert PylidcConfig(str(filepath)).settings is settings
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.padding = 20
+
+        # A worker installs the settings parsed by the parent, and does not parse them again.
+        cache = config_cache()
+        monkeypatch.setattr(lcd.utils.config, "_settings_cache", {})
+        install_config_cache(cache)
+        assert load_pylidc_settings(str(filepath)) is settings
+
+        # Modifying the file invalidates the cached settings.
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        filepath.write_text("[pylidc]\nconfidence_level = 0.25\npadding = 20\n")
+        os.utime(filepath, ns=(mtime_ns, mtime_ns + 1000))
+        settings = load_pylidc_settings(str(filepath))
+        assert settings.confidence_level == 0.25
+        assert settings.padding == 20
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "[pylidc]\nconfidence_level = 0.5\n",
+            "[pylidc]\nconfidence_level = high\npadding = 10\n",
+            "[pylidc]\nconfidence_level = 1.5\npadding = 10\n",
+            "[pylidc]\nconfidence_level = 0.5\npadding = -1\n",
+        ],
+    )
+    def test_settings_validation(self, tmp_path, content, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = tmp_path / "pylidc.conf"
+        filepath.write_text(content)
+        with pytest.raises(ValueError):
+            load_pylidc_settings(str(filepath))
+        with pytest.raises(FileNotFoundError):
+            load_pylidc_settings(str(tmp_path / "missing.conf"))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
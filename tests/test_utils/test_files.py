@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_files.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:47:13 pm                                              #
+# Modified   : Saturday October 17th 2026 09:47:13 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+
+# Enter imports for modules and classes being tested here
+from lcd.utils.files import DirectoryStats
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+@pytest.fixture
+def folder(tmp_path):
+    """Two patients, each with one study and series of DICOM files and an XML file."""
+    for patient, n_files in [("LIDC-IDRI-0001", 3), ("LIDC-IDRI-0002", 2)]:
+        series = tmp_path / "raw" / patient / "study" / "series"
+        series.mkdir(parents=True)
+        for i in range(n_files):
+            (series / "{}.dcm".format(i)).write_bytes(b"x" * 10)
+        (series / "annotations.xml").write_bytes(b"x" * 99)
+    return str(tmp_path / "raw")
+
+
+@pytest.mark.files
+class TestDirectoryStats:
+    def test_compute(self, folder, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cache_filepath = str(tmp_path / "cache.json")
+        stats = DirectoryStats(folder, cache_filepath=cache_filepath, extension=".dcm")
+        walked = []
+        walk = stats._walk
+        stats._walk = lambda name: walked.append(name) or walk(name)
+
+        data = stats.compute(["LIDC-IDRI-0001", "LIDC-IDRI-0002", "LIDC-IDRI-0003"])
+        assert data["n_files"].tolist() == [3, 2, 0]
+        assert data["total_size"].tolist() == [30, 20, 0]
+
+        # Unchanged directories are served from the cache.
+        walked.clear()
+        assert stats.compute(["LIDC-IDRI-0001", "LIDC-IDRI-0002"])["n_files"].tolist() == [3, 2]
+        assert walked == []
+
+        # Adding a file invalidates only the directories above it.
+        series = os.path.join(folder, "LIDC-IDRI-0002", "study", "series")
+        with open(os.path.join(series, "2.dcm"), "wb") as f:
+            f.write(b"x" * 10)
+        os.utime(series, ns=(0, os.stat(series).st_mtime_ns + 1))
+        data = stats.compute()
+        assert walked == ["LIDC-IDRI-0002"]
+        assert data["n_files"].tolist() == [3, 3]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
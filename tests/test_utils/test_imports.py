@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_imports.py                                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:59:52 pm                                              #
+# Modified   : Saturday October 17th 2026 11:59:52 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import sys
+import inspect
+import pytest
+import logging
+import logging.config
+import subprocess
+
+# Enter imports for modules and classes being tested here
+from lcd.utils.imports import lazy_import
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+# Modules executed only when used. The lazily imported packages are checked by a submodule.
+HEAVY_MODULES = ["pylidc.Scan", "pydicom.dataset", "sqlalchemy", "matplotlib", "seaborn", "scipy"]
+
+
+@pytest.mark.imports
+class TestImports:
+    def test_lazy_import(self, tmp_path, monkeypatch, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        marker = tmp_path / "executed"
+        (tmp_path / "lazy_module.py").write_text(
+            "open({!r}, 'w').close()\nVALUE = 1\n".format(str(marker))
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_module", raising=False)
+
+        module = lazy_import("lazy_module")
+        assert not marker.exists()
+        assert module.VALUE == 1
+        assert marker.exists()
+        assert lazy_import("lazy_module") is module
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("no_such_module")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_import_is_light(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Heavy dependencies are not executed, and logging is not configured, on import.
+        code = (
+            "import sys, logging\n"
+            "import lcd.eda.analysis, lcd.eda.data, lcd.eda.patient, lcd.eda.roi\n"
+            "print([module for module in {!r} if module in sys.modules])\n"
+            "print(logging.getLogger().handlers)\n"
+        ).format(HEAVY_MODULES)
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert completed.stdout.splitlines() == ["[]", "[]"]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_log_config.py                                                                 #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:58:37 pm                                              #
+# Modified   : Saturday October 17th 2026 11:58:37 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+from concurrent.futures import ProcessPoolExecutor
+
+# Enter imports for modules and classes being tested here
+from lcd.utils.log_config import LOG_CONFIG, configure_worker_logging, queue_logging
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+def log_from_worker(n: int) -> int:
+    logging.getLogger("worker").debug("Worker message {}".format(n))
+    return os.getpid()
+
+
+def log_level_of_worker(n: int) -> int:
+    return logging.getLogger().level
+
+
+@pytest.mark.log_config
+class TestQueueLogging:
+    def test_queue_logging(self, tmp_path, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        root = logging.getLogger()
+        filepath = str(tmp_path / "test.log")
+        file_handler = logging.FileHandler(filepath)
+        file_handler.setLevel(logging.DEBUG)
+        formatter = logging.Formatter("%(message)s")
+        file_handler.setFormatter(formatter)
+        root.addHandler(file_handler)
+        handlers = list(root.handlers)
+        try:
+            with queue_logging() as log_queue:
+                assert [type(handler) for handler in root.handlers] == [
+                    logging.handlers.QueueHandler
+                ]
+                with ProcessPoolExecutor(
+                    max_workers=2,
+                    initializer=configure_worker_logging,
+                    initargs=(log_queue, logging.DEBUG),
+                ) as executor:
+                    pids = set(executor.map(log_from_worker, range(4)))
+                # Workers take the parent's level, and drop records below it before enqueuing.
+                with ProcessPoolExecutor(
+                    max_workers=2,
+                    initializer=configure_worker_logging,
+                    initargs=(log_queue, logging.INFO),
+                ) as executor:
+                    assert set(executor.map(log_level_of_worker, range(2))) == {logging.INFO}
+                    list(executor.map(log_from_worker, range(4, 8)))
+                logging.getLogger("parent").debug("Parent message")
+        finally:
+            root.removeHandler(file_handler)
+            file_handler.close()
+
+        # The handlers and their formatters are restored once the listener has stopped.
+        assert root.handlers == [handler for handler in handlers if handler is not file_handler]
+        assert file_handler.formatter is formatter
+
+        with open(filepath, "r") as f:
+            lines = f.read().splitlines()
+        worker_lines = [line for line in lines if "Worker message" in line]
+        assert len(worker_lines) == 4
+        assert {int(line.split(" | ")[3]) for line in worker_lines} == pids
+        assert any("Parent message" in line for line in lines)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : Lung Cancer Detection                                                               #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_timing.py                                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/LungCancerDetection                                #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:47:52 pm                                              #
+# Modified   : Saturday October 17th 2026 11:47:52 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+
+# Enter imports for modules and classes being tested here
+from lcd.utils.timing import StageTimer, TIMING_COLUMNS, timed
+from lcd.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class Pipeline:
+    def __init__(self, enabled: bool) -> None:
+        self._timer = StageTimer(enabled=enabled)
+
+    @timed()
+    def step(self, x: int) -> int:
+        return x + 1
+
+    @timed("fail")
+    def fail(self) -> None:
+        raise ValueError()
+
+
+@pytest.mark.timing
+class TestStageTimer:
+    def test_summary(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        timer = StageTimer()
+        for duration in range(1, 101):
+            timer.record("scan", duration * 1000000)
+        with timer.stage("build"):
+            pass
+
+        summary = timer.summary().set_index("stage")
+        assert list(timer.summary().columns) == TIMING_COLUMNS
+        assert list(summary.index) == ["scan", "build"]
+        assert summary.loc["scan", "count"] == 100
+        assert summary.loc["scan", "total_ms"] == pytest.approx(5050)
+        assert summary.loc["scan", "p50_ms"] == pytest.approx(50.5)
+        assert summary.loc["scan", "p99_ms"] == pytest.approx(99.01)
+        assert summary.loc["build", "count"] == 1
+
+        timer.reset()
+        assert timer.summary().empty
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_timed(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        pipeline = Pipeline(enabled=True)
+        assert [pipeline.step(x) for x in range(3)] == [1, 2, 3]
+        with pytest.raises(ValueError):
+            pipeline.fail()
+        summary = pipeline._timer.summary().set_index("stage")
+        assert summary.loc["Pipeline.step", "count"] == 3
+        assert summary.loc["fail", "count"] == 1
+
+        pipeline = Pipeline(enabled=False)
+        assert pipeline.step(1) == 2
+        with pipeline._timer.stage("build"):
+            pass
+        assert pipeline._timer.summary().empty
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))